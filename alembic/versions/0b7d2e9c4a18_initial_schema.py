@@ -0,0 +1,66 @@
+"""initial schema
+
+Revision ID: 0b7d2e9c4a18
+Revises: 
+Create Date: 2026-10-19 10:05:12.204517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7d2e9c4a18'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('users',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('is_bot', sa.Boolean(), nullable=False),
+                    sa.Column('username', sa.String(), nullable=False),
+                    sa.Column('first_name', sa.String(), nullable=False),
+                    sa.Column('last_name', sa.String(), nullable=False),
+                    sa.Column('language_code', sa.String(), nullable=False),
+                    sa.Column('joined_at', sa.DateTime(timezone=True), nullable=False),
+                    sa.PrimaryKeyConstraint('id'))
+    op.create_table('words',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('translation_code', sa.String(), nullable=False),
+                    sa.Column('original', sa.String(), nullable=False),
+                    sa.Column('profile', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+                    sa.Column('audio_id', sa.String(), nullable=True),
+                    sa.Column('added_at', sa.DateTime(timezone=True), nullable=False),
+                    sa.PrimaryKeyConstraint('id'))
+    op.create_index('words_idx_translation_code_original', 'words', ['translation_code', 'original'], unique=True)
+    op.create_table('user_langs',
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('translation_code', sa.String(), nullable=False),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('user_id', 'translation_code'))
+    op.create_table('user_words',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('translation_code', sa.String(), nullable=False),
+                    sa.Column('word_id', sa.Integer(), nullable=False),
+                    sa.Column('added_at', sa.DateTime(timezone=True), nullable=False),
+                    sa.Column('remembered_at', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('next_show_original', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('next_show_translation', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('n_shown_original', sa.Integer(), nullable=False),
+                    sa.Column('n_shown_translation', sa.Integer(), nullable=False),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['word_id'], ['words.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('user_id', 'word_id'))
+
+
+def downgrade():
+    op.drop_table('user_words')
+    op.drop_table('user_langs')
+    op.drop_index('words_idx_translation_code_original', table_name='words')
+    op.drop_table('words')
+    op.drop_table('users')
@@ -0,0 +1,26 @@
+"""words profile blob
+
+Revision ID: 3f1c2a9d7b10
+Revises: 0b7d2e9c4a18
+Create Date: 2026-10-19 10:12:41.519310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = '0b7d2e9c4a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('words', sa.Column('profile_blob', sa.LargeBinary(), nullable=True))
+    op.alter_column('words', 'profile', nullable=True)
+
+
+def downgrade():
+    op.alter_column('words', 'profile', nullable=False)
+    op.drop_column('words', 'profile_blob')
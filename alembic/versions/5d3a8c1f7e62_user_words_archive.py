@@ -0,0 +1,52 @@
+"""user words archive
+
+Revision ID: 5d3a8c1f7e62
+Revises: e7b1c5a93d04
+Create Date: 2026-10-19 22:41:05.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d3a8c1f7e62'
+down_revision = 'e7b1c5a93d04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_words_archive',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('translation_code', sa.String(), nullable=False),
+                    sa.Column('word_id', sa.Integer(), nullable=False),
+                    sa.Column('added_at', sa.DateTime(timezone=True), nullable=False),
+                    sa.Column('remembered_at', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('next_show_original', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('next_show_translation', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('n_shown_original', sa.Integer(), nullable=False),
+                    sa.Column('n_shown_translation', sa.Integer(), nullable=False),
+                    sa.Column('ease_original', sa.Float(), nullable=False),
+                    sa.Column('ease_translation', sa.Float(), nullable=False),
+                    sa.Column('stability_original', sa.Float(), nullable=False),
+                    sa.Column('stability_translation', sa.Float(), nullable=False),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['word_id'], ['words.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('user_id', 'word_id'))
+    op.execute('CREATE INDEX user_words_archive_idx_due ON user_words_archive '
+               '(least(next_show_original, next_show_translation))')
+
+
+def downgrade():
+    # archived words are moved back first
+    op.execute('INSERT INTO user_words (id, user_id, translation_code, word_id, added_at, remembered_at, '
+               'next_show_original, next_show_translation, n_shown_original, n_shown_translation, '
+               'ease_original, ease_translation, stability_original, stability_translation) '
+               'SELECT id, user_id, translation_code, word_id, added_at, remembered_at, '
+               'next_show_original, next_show_translation, n_shown_original, n_shown_translation, '
+               'ease_original, ease_translation, stability_original, stability_translation '
+               'FROM user_words_archive ON CONFLICT DO NOTHING')
+    op.drop_index('user_words_archive_idx_due', table_name='user_words_archive')
+    op.drop_table('user_words_archive')
@@ -0,0 +1,30 @@
+"""user_words review state
+
+Revision ID: 8b2e4f6a1c3d
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-19 19:05:12.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4f6a1c3d'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user_words', sa.Column('ease_original', sa.Float(), server_default='2.5', nullable=False))
+    op.add_column('user_words', sa.Column('ease_translation', sa.Float(), server_default='2.5', nullable=False))
+    op.add_column('user_words', sa.Column('stability_original', sa.Float(), server_default='1.0', nullable=False))
+    op.add_column('user_words', sa.Column('stability_translation', sa.Float(), server_default='1.0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('user_words', 'stability_translation')
+    op.drop_column('user_words', 'stability_original')
+    op.drop_column('user_words', 'ease_translation')
+    op.drop_column('user_words', 'ease_original')
@@ -0,0 +1,23 @@
+"""words original prefix
+
+Revision ID: a91f4d2b6c35
+Revises: 5d3a8c1f7e62
+Create Date: 2026-10-19 23:52:17.604128
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a91f4d2b6c35'
+down_revision = '5d3a8c1f7e62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE INDEX words_idx_translation_code_original_c ON words (translation_code, original COLLATE "C")')
+
+
+def downgrade():
+    op.execute('DROP INDEX words_idx_translation_code_original_c')
@@ -0,0 +1,34 @@
+"""review events
+
+Revision ID: c4e9a7d21f58
+Revises: 8b2e4f6a1c3d
+Create Date: 2026-10-19 20:14:37.861042
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e9a7d21f58'
+down_revision = '8b2e4f6a1c3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_events',
+                    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('word_id', sa.Integer(), nullable=False),
+                    sa.Column('direction', sa.String(), nullable=False),
+                    sa.Column('outcome', sa.String(), nullable=False),
+                    sa.Column('latency', sa.Float(), nullable=True),
+                    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+                    sa.PrimaryKeyConstraint('id'))
+    op.create_index('review_events_idx_user_id_created_at', 'review_events', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('review_events_idx_user_id_created_at', table_name='review_events')
+    op.drop_table('review_events')
@@ -0,0 +1,52 @@
+"""partition user_words by user_id
+
+Revision ID: e7b1c5a93d04
+Revises: c4e9a7d21f58
+Create Date: 2026-10-19 21:02:18.473915
+
+The table stays in use during the upgrade: new rows and changes are mirrored by a trigger
+while existing rows are copied in batches, each committed separately, see OnlineRewrite.
+Only the final swap locks user_words.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.partitioning import OnlineRewrite
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b1c5a93d04'
+down_revision = 'c4e9a7d21f58'
+branch_labels = None
+depends_on = None
+
+N_PARTITIONS = 16
+CONSTRAINTS = [
+    'UNIQUE (user_id, word_id)',
+    'FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE',
+    'FOREIGN KEY (word_id) REFERENCES words (id) ON DELETE CASCADE',
+]
+
+
+def rewrite(migration: OnlineRewrite):
+    for query in migration.prepare():
+        op.execute(query)
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_id = 0
+        while 1:
+            last_id = connection.execute(sa.text(migration.copy_batch(last_id))).scalar()
+            if last_id is None:
+                break
+    for query in migration.swap():
+        op.execute(query)
+
+
+def upgrade():
+    rewrite(OnlineRewrite('user_words', 'user_id', ['PRIMARY KEY (user_id, id)'] + CONSTRAINTS,
+                          partition_by='HASH (user_id)', n_partitions=N_PARTITIONS))
+
+
+def downgrade():
+    rewrite(OnlineRewrite('user_words', 'user_id', ['PRIMARY KEY (id)'] + CONSTRAINTS))
@@ -1,15 +1,45 @@
+import inspect
 import typing
+from functools import wraps
+from typing import Optional
+
+from app.metrics import accessor_seconds
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
 
+def timed(accessor: str, func):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        with accessor_seconds.time(accessor=accessor, method=func.__name__):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
 class BaseAccessor:
+    # accessors which have to be connected before this one and disconnected after it
+    dependencies: tuple[type["BaseAccessor"], ...] = ()
+    # seconds, None means CommonConfig.connect_timeout / disconnect_timeout
+    connect_timeout: Optional[float] = None
+    disconnect_timeout: Optional[float] = None
+    # public coroutine methods are timed into words_accessor_seconds
+    instrumented = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not cls.instrumented:
+            return
+        for name, value in list(vars(cls).items()):
+            if name.startswith("_") or name in ("connect", "disconnect"):
+                continue
+            if inspect.iscoroutinefunction(value):
+                setattr(cls, name, timed(cls.__name__, value))
 
     def __init__(self, app: "Application"):
         self.app = app
-        self.app.on_connect.append(self.connect)
-        self.app.on_disconnect.insert(0, self.disconnect)
+        self.app.accessors.append(self)
 
     async def connect(self) -> None:
         pass
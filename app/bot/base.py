@@ -1,12 +1,17 @@
+import time
 import typing
 
 from aiogram import Bot, Dispatcher
 
 from app.bot.managers import CoroutinesManager, TasksManager
 from app.bot.messenger import Messenger
+from app.bot.reminders import ReminderSender
+from app.bot.sessions import SessionAccessor
 from app.bot.states import StateAccessor
+from app.metrics import bot_api_seconds
 
 if typing.TYPE_CHECKING:
+    from app.metrics.loop import LoopMonitor
     from app.web.app import Application
     from app.web.config import Config
     from app.store.store import Store
@@ -16,19 +21,35 @@ store: "Store"
 states: StateAccessor
 messenger: Messenger
 coroutines: CoroutinesManager
+monitor: "LoopMonitor"
 tasks: TasksManager
+reminders: ReminderSender
+sessions: SessionAccessor
 dp: Dispatcher
 bot: Bot
 
 
+class MeteredBot(Bot):
+
+    async def request(self, method, data=None, files=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().request(method, data, files, **kwargs)
+        finally:
+            bot_api_seconds.observe(time.perf_counter() - start, method=method)
+
+
 def register_handlers(app: "Application", dispatcher: Dispatcher):
-    global config, store, states, messenger, coroutines, tasks, dp, bot
+    global config, store, states, messenger, coroutines, monitor, tasks, reminders, sessions, dp, bot
     config = app.config
     store = app.store
+    monitor = app.monitor
     states = StateAccessor(app)
     messenger = Messenger(app, dispatcher.bot, states)
     coroutines = CoroutinesManager(app)
     tasks = TasksManager(app)
+    reminders = ReminderSender(app, messenger, coroutines)
+    sessions = SessionAccessor(app, states)
     dp = dispatcher
     bot = dp.bot
 
@@ -106,6 +106,16 @@ class RecallWordsAnswer(RememberWordsAnswer):
     loc: str = "recwa"
 
 
+@dataclass
+class AddWord(BaseCallbackData):
+    w: str  # original
+    loc: str = "addw"
+
+    def validate(self):
+        if len(orjson.dumps(self.__dict__)) > 64:  # the limit of Telegram
+            raise AssertionError
+
+
 @dataclass
 class AboutBot(BaseCallbackData):
     loc: str = "about"
@@ -1,20 +1,29 @@
+import io
+import logging
 import re
+import time
 from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
 from functools import wraps
-from random import shuffle
 from typing import Union
 
 from aiogram import types
 
 from app.bot import callback_data as cb, payload
 from app.bot import keyboards
-from app.bot.base import config, store, states, messenger, coroutines, bot, dp
+from app.bot.base import config, store, states, messenger, coroutines, monitor, sessions, bot, dp
 from app.bot.payload import Emoji, Notifications
+from app.bot.sessions import SessionKind
 from app.bot.states import WordsNavigationState
-from app.logger import logger
+from app.database.replicas import current_user
+from app.logger import logger, sampled
+from app.metrics import handler_seconds, handler_errors, queue_wait_seconds, cache_requests
+from app.store.users.events import ReviewDirection, ReviewOutcome
 from app.store.users.models import UserLangDC, UserWordDC, UserDC
+from app.store.words.importer import MIN_WORD_LENGTH, MAX_WORD_LENGTH, FORBIDDEN_CHARS
+from app.store.words.importer import is_valid_word, read_words, split_words
 from app.utils import now, MediaGenerator
+from app.web.translation import TranslationError
 
 TRANSLATION_CODE = "en-ru"
 
@@ -32,17 +41,33 @@ async def when_throttled(msg: Union[types.Message, types.CallbackQuery], *args,
     await msg.answer("Too many requests.")
 
 
+async def measured(name: str, coro: Awaitable, queued_at: float, user_id: int):
+    queue_wait_seconds.observe(time.perf_counter() - queued_at, handler=name)
+    token = current_user.set(user_id)  # for read-your-writes routing of database reads
+    try:
+        with handler_seconds.time(handler=name):
+            await coro
+    except Exception:
+        handler_errors.inc(handler=name)
+        raise
+    finally:
+        current_user.reset(token)
+
+
 def queue_message(func: Callable[..., Awaitable]):
     @dp.throttled(when_throttled)
     @wraps(func)
     async def wrapper(msg: types.Message, *args, **kwargs):
         chat = msg.chat
         user = msg.from_user
-        if chat.id == user.id:
-            logger.debug(f"{func.__name__} | {user.username} ({user.id}): {[msg.text]}")
-        else:
-            logger.debug(f"{func.__name__} | {chat.title} ({chat.id}): {user.username} ({user.id}): {[msg.text]}")
-        await coroutines.add(user.id, func(msg, *args, **kwargs))
+        if logger.isEnabledFor(logging.DEBUG) and sampled():
+            if chat.id == user.id:
+                logger.debug("%s | %s (%s): %r", func.__name__, user.username, user.id, msg.text)
+            else:
+                logger.debug("%s | %s (%s): %s (%s): %r",
+                             func.__name__, chat.title, chat.id, user.username, user.id, msg.text)
+        await coroutines.add(user.id, measured(func.__name__, func(msg, *args, **kwargs),
+                                                time.perf_counter(), user.id))
 
     return wrapper
 
@@ -53,11 +78,13 @@ def queue_query(func: Callable[..., Awaitable]):
     async def wrapper(msg: types.CallbackQuery, *args, **kwargs):
         chat = msg.message.chat
         user = msg.from_user
-        if chat.id == user.id:
-            logger.debug(f"{func.__name__} | {user.username} ({user.id})")
-        else:
-            logger.debug(f"{func.__name__} | {chat.title} ({chat.id}): {user.username} ({user.id})")
-        await coroutines.add(user.id, func(msg, *args, **kwargs))
+        if logger.isEnabledFor(logging.DEBUG) and sampled():
+            if chat.id == user.id:
+                logger.debug("%s | %s (%s)", func.__name__, user.username, user.id)
+            else:
+                logger.debug("%s | %s (%s): %s (%s)", func.__name__, chat.title, chat.id, user.username, user.id)
+        await coroutines.add(user.id, measured(func.__name__, func(msg, *args, **kwargs),
+                                                time.perf_counter(), user.id))
 
     return wrapper
 
@@ -96,6 +123,45 @@ async def start(msg: types.Message):
         await main_menu_message(msg)
 
 
+@dp.message_handler(commands=["profile"], user_id=config.bot.admin_id)
+@queue_message
+async def profile(msg: types.Message):
+    command = msg.get_args()
+    if command == "start":
+        if not monitor.start_profiler():
+            return await msg.answer("Профилирование уже запущено.")
+        await msg.answer("Профилирование запущено.")
+    elif command == "stop":
+        filename = monitor.stop_profiler()
+        if filename is None:
+            return await msg.answer("Профилирование не запущено.")
+        await msg.answer_document(types.InputFile(filename), caption="Стеки в формате flamegraph (folded).")
+    else:
+        await msg.answer("/profile start | stop")
+
+
+@dp.message_handler(content_types=types.ContentType.DOCUMENT)
+@queue_message
+async def import_file(msg: types.Message):
+    if msg.document.file_size > config.importer.max_file_size:
+        return await msg.answer("Слишком большой файл.")
+
+    content = await msg.document.download(destination_file=io.BytesIO())
+    lines = content.getvalue().decode("utf-8-sig", errors="replace").splitlines()
+    originals = read_words(lines, limit=config.importer.max_words)
+    if not originals:
+        return await msg.answer("В файле не найдено слов.")
+
+    await msg.answer(f"Импортирую слов: {len(originals)}...")
+    # not in the queue of the user, who can use the bot until the import is done
+    tasks.schedule_task(import_file_words(msg, originals))
+
+
+async def import_file_words(msg: types.Message, originals: list[str]):
+    result = await store.importer.import_words(TRANSLATION_CODE, originals, user_id=msg.from_user.id)
+    await msg.answer(payload.import_result_text(result))
+
+
 async def init_language_selection(msg: types.Message):
     keyboard = keyboards.InlineKeyboard()
     for language in config.langs.languages:
@@ -149,23 +215,52 @@ async def add_new_word(msg: types.Message):
         if not sub:
             return await msg.answer("Неправильный запрос.")
         original = sub[0]
+    else:
+        originals = split_words(original)
+        if len(originals) > 1:
+            return await add_new_words(msg, originals)
+        if len(originals) == 1:  # e.g. "apple,"
+            original = originals[0]
 
-    if len(original) < 2:
+    if len(original) < MIN_WORD_LENGTH:
         return await msg.answer("Слишком короткое слово.")
-    if len(original) > 20:
+    if len(original) > MAX_WORD_LENGTH:
         return await msg.answer("Слишком длинное слово.")
-    if any(i in "[]()<>/?,.|\\~`!@#$%^&*_+=:;1234567890" for i in original):
+    if any(i in FORBIDDEN_CHARS for i in original):
         return await msg.answer("В слове присутствуют запрещенные символы.")
 
+    await add_word(msg, user_id, original, check_spelling=True)
+
+
+async def add_word(msg: types.Message, user_id: int, original: str, check_spelling: bool):
+    """
+    An unknown word close to known ones is not translated at once,
+    the user chooses between them and the word as it is (add_suggested_word).
+    """
     word = await store.words.get_word(TRANSLATION_CODE, original)
+    cache_requests.inc(cache="words", result="miss" if word is None else "hit")
+    if word is None and check_spelling:
+        suggestions = store.word_index.suggest(TRANSLATION_CODE, original)
+        cache_requests.inc(cache="spelling", result="hit" if suggestions else "miss")
+        if suggestions:
+            keyboard = keyboards.InlineKeyboard([[(i, cb.AddWord(w=i))] for i in suggestions])
+            keyboard.add([(f"Перевести «{original}»", cb.AddWord(w=original))])
+            return await msg.answer("Слово не найдено в словаре. Возможно, вы имели в виду:",
+                                    reply_markup=keyboard.dump())
     if word is None:
-        word = await store.translator.translate(TRANSLATION_CODE, original)
-        if not word.translations:
-            return await msg.answer("Перевод слова не найден.")
+        try:
+            word = await store.translator.translate(TRANSLATION_CODE, original)
+        except TranslationError as e:
+            logger.warning(e)
+            return await msg.answer("Сервис перевода недоступен, попробуйте позже.")
 
+    if not word.translations:
+        return await msg.answer("Перевод слова не найден.")
+
+    if word.audio_id is None:  # new words and words added by the importer
         async with MediaGenerator.generate_audio(
                 config.langs.get_foreign_language_code(TRANSLATION_CODE),
-                original,
+                word.original,
         ) as filename:
             audio = types.input_file.InputFile(filename, filename="_.mp3")
             audio_msg = await bot.send_audio(config.bot.temp_chat_id, audio)
@@ -173,9 +268,6 @@ async def add_new_word(msg: types.Message):
         word.audio_id = audio_id
         word = await store.words.add_word(word)
 
-    if not word.translations:
-        return await msg.answer("Перевод слова не найден.")
-
     current_time = now()
     user_word = await store.users.add_user_word(UserWordDC(user_id=user_id,
                                                            translation_code=word.translation_code,
@@ -188,6 +280,59 @@ async def add_new_word(msg: types.Message):
     await msg.answer(f"{text}\n\n" + payload.full_word_text(word), reply_markup=keyboard.dump())
 
 
+async def add_new_words(msg: types.Message, originals: list[str]):
+    """
+    A message with several words is added in one batch, without audio.
+    """
+    if len(originals) > config.importer.max_message_words:
+        return await msg.answer(f"Слишком много слов, не больше {config.importer.max_message_words} за раз.")
+
+    valid = [i for i in originals if is_valid_word(i)]
+    skipped = [i for i in originals if not is_valid_word(i)]
+    result = await store.importer.import_words(TRANSLATION_CODE, valid,
+                                               user_id=msg.from_user.id,
+                                               concurrency=config.importer.user_concurrency)
+    keyboard = keyboards.InlineKeyboard([
+        [("Удалить сообщение", cb.Delete())],
+    ])
+    await msg.answer(payload.import_result_text(result, title="Слова добавлены.", skipped=skipped),
+                     reply_markup=keyboard.dump())
+
+
+@dp.inline_handler()
+async def inline_word(query: types.InlineQuery):
+    """
+    Not queued like the other updates: they come on every keystroke
+    and are answered from WordIndex, see WordIndex.complete.
+    """
+    await measured("inline_word", answer_inline_word(query), time.perf_counter(), query.from_user.id)
+
+
+async def answer_inline_word(query: types.InlineQuery):
+    prefix = query.query.lower().strip()
+    cards = await store.word_index.complete(TRANSLATION_CODE, prefix) if prefix else []
+    results = [
+        types.InlineQueryResultArticle(
+            id=str(card.id),
+            title=card.original + (f"  [{', '.join(card.transcription)}]" if card.transcription else ""),
+            description=", ".join(card.translations[:3]),
+            input_message_content=types.InputTextMessageContent(payload.full_word_text(card),
+                                                                parse_mode=types.ParseMode.HTML),
+        )
+        for card in cards
+    ]
+    await query.answer(results, cache_time=300)
+
+
+@dp.callback_query_handler(cb.AddWord.filter())
+@queue_query
+async def add_suggested_word(msg: types.CallbackQuery, callback_data: dict):
+    callback_data = cb.AddWord(**callback_data)
+    await msg.answer()
+    await messenger.delete(msg.from_user.id, msg.message.message_id)
+    await add_word(msg.message, msg.from_user.id, callback_data.w, check_spelling=False)
+
+
 @dp.callback_query_handler(cb.Delete().filter())
 @queue_query
 async def delete_msg(msg: types.CallbackQuery):
@@ -262,25 +407,34 @@ async def remember_words_question(msg: types.CallbackQuery, callback_data: dict)
     settings = await states.get_words_remember_state(user_id)
 
     if callback_data.i == 0:
-        idx = await store.users.get_ids_words_to_remember(user_id, TRANSLATION_CODE)
-        if settings.random:
-            shuffle(idx)
-        await states.set_words_remember_order(user_id, idx)
+        session = await sessions.start(user_id, SessionKind.remember, TRANSLATION_CODE, shuffle=settings.random)
     else:
-        idx = await states.get_words_remember_order(user_id)
-
-    if callback_data.mem:
-        await msg.answer("Запомнили.")
-        await store.users.set_remembered(user_id, idx[callback_data.i - 1])
-    if callback_data.rm:
-        await msg.answer("Удалено.")
-        await store.users.delete_word(user_id, idx[callback_data.i - 1])
-
-    if callback_data.i == len(idx):
+        session = await sessions.get(user_id, SessionKind.remember)
+
+    if callback_data.i:
+        previous_id, _ = await sessions.get_item(user_id, SessionKind.remember, session, callback_data.i - 1)
+        direction = ReviewDirection.translation if settings.swap else ReviewDirection.original
+        if callback_data.mem:
+            outcome = ReviewOutcome.remembered
+        elif callback_data.rm:
+            outcome = ReviewOutcome.deleted
+        else:
+            outcome = ReviewOutcome.skipped
+        store.review_log.add(user_id, previous_id, direction, outcome)
+
+        if callback_data.mem:
+            await msg.answer("Запомнили.")
+            await store.users.set_remembered(user_id, previous_id)
+        if callback_data.rm:
+            await msg.answer("Удалено.")
+            await store.users.delete_word(user_id, previous_id)
+
+    item = await sessions.get_item(user_id, SessionKind.remember, session, callback_data.i)
+    if item is None:
         await msg.answer("Закончились слова.")
         return await main_menu(msg, cb.MainMenu().as_dict())
 
-    word = await store.words.get_word_by_id(idx[callback_data.i])
+    word = await store.words.get_word_by_id(item[0])
 
     if settings.swap:
         text = f"❓❓❓\n\n"
@@ -297,6 +451,7 @@ async def remember_words_question(msg: types.CallbackQuery, callback_data: dict)
         ("Ответ", cb.RememberWordsAnswer(i=callback_data.i)),
     ])
 
+    store.review_log.show(user_id)
     await msg.answer()
     await messenger.edit(msg.from_user.id, text, audio_id=word.audio_id, keyboard=keyboard.dump())
 
@@ -307,8 +462,9 @@ async def remember_words_answer(msg: types.CallbackQuery, callback_data: dict):
     callback_data = cb.RememberWordsAnswer(**callback_data)
     user_id = msg.from_user.id
 
-    idx = await states.get_words_remember_order(user_id)
-    word = await store.words.get_word_by_id(idx[callback_data.i])
+    session = await sessions.get(user_id, SessionKind.remember)
+    word_id, _ = await sessions.get_item(user_id, SessionKind.remember, session, callback_data.i)
+    word = await store.words.get_word_by_id(word_id)
 
     keyboard = keyboards.InlineKeyboard()
 
@@ -360,36 +516,38 @@ async def recall_words_question(msg: types.CallbackQuery, callback_data: dict):
     user_id = msg.from_user.id
 
     if callback_data.i == 0:
-        original_ids = await store.users.get_ids_original_words_to_recall(user_id, TRANSLATION_CODE)
-        translation_ids = await store.users.get_ids_translation_words_to_recall(user_id, TRANSLATION_CODE)
-        ids = [(i, False) for i in original_ids] + [(i, True) for i in translation_ids]
-        shuffle(ids)
-        await states.set_words_recall_order(user_id, ids)
+        session = await sessions.start(user_id, SessionKind.recall, TRANSLATION_CODE)
     else:
-        ids = await states.get_words_recall_order(user_id)
-
-    if callback_data.mem:
-        await msg.answer("Запомнили.")
-        word_id, swap = ids[callback_data.i - 1]
-        if swap:
-            await store.users.set_shown_translation(user_id, word_id)
+        session = await sessions.get(user_id, SessionKind.recall)
+
+    if callback_data.i:
+        word_id, swap = await sessions.get_item(user_id, SessionKind.recall, session, callback_data.i - 1)
+        direction = ReviewDirection.translation if swap else ReviewDirection.original
+        if callback_data.mem:
+            outcome = ReviewOutcome.recalled
+        elif callback_data.rm:
+            outcome = ReviewOutcome.deleted
         else:
-            await store.users.set_shown_original(user_id, word_id)
-    if callback_data.rm:
-        await msg.answer("Удалено.")
-        word_id, swap = ids[callback_data.i - 1]
-        await store.users.delete_word(user_id, word_id)
-
-        n_deleted = len([i for i in ids if i[0] == word_id])
-        ids = [i for i in ids if i[0] != word_id]
-        callback_data.i -= n_deleted
-        await states.set_words_recall_order(user_id, ids)
-
-    if callback_data.i == len(ids):
+            outcome = ReviewOutcome.forgotten
+        store.review_log.add(user_id, word_id, direction, outcome)
+
+        if callback_data.mem:
+            await msg.answer("Запомнили.")
+            if swap:
+                await store.users.set_shown_translation(user_id, word_id)
+            else:
+                await store.users.set_shown_original(user_id, word_id)
+        if callback_data.rm:
+            await msg.answer("Удалено.")
+            await store.users.delete_word(user_id, word_id)
+            callback_data.i = await sessions.remove_word(user_id, SessionKind.recall, session, word_id, callback_data.i)
+
+    item = await sessions.get_item(user_id, SessionKind.recall, session, callback_data.i)
+    if item is None:
         await msg.answer("Закончились слова.")
         return await main_menu(msg, cb.MainMenu().as_dict())
 
-    word_id, swap = ids[callback_data.i]
+    word_id, swap = item
     word = await store.words.get_word_by_id(word_id)
 
     if swap:
@@ -410,6 +568,7 @@ async def recall_words_question(msg: types.CallbackQuery, callback_data: dict):
             ("Ответ", cb.RecallWordsAnswer(i=callback_data.i)),
         ]
     ])
+    store.review_log.show(user_id)
     await msg.answer()
     await messenger.edit(msg.from_user.id, text, audio_id=word.audio_id, keyboard=keyboard.dump())
 
@@ -420,8 +579,8 @@ async def recall_words_answer(msg: types.CallbackQuery, callback_data: dict):
     callback_data = cb.RecallWordsAnswer(**callback_data)
     user_id = msg.from_user.id
 
-    ids = await states.get_words_recall_order(user_id)
-    word_id, swap = ids[callback_data.i]
+    session = await sessions.get(user_id, SessionKind.recall)
+    word_id, swap = await sessions.get_item(user_id, SessionKind.recall, session, callback_data.i)
     word = await store.words.get_word_by_id(word_id)
 
     keyboard = keyboards.InlineKeyboard()
@@ -484,11 +643,13 @@ async def notify_function(msg: types.CallbackQuery, callback_data: dict):
 async def about_bot(msg: types.CallbackQuery):
     text = "Бот предназначен для изучения иностранных слов. " \
            "В данный момент - слов на английском языке.\n\n" \
-           "Есть 2 способа добавления слов для изучения:\n" \
+           "Есть 3 способа добавления слов для изучения:\n" \
            "1. Отправить слово в чат с ботом.\n" \
-           "2. Переслать слово из другого приложения, например, из браузера Chrome.\n\n" \
+           "2. Переслать слово из другого приложения, например, из браузера Chrome.\n" \
+           "3. Отправить файл со списком слов: текст, CSV или экспорт из Anki.\n\n" \
            "После того как Вы запомнили слово, через определенные промежутки времени " \
-           "бот будет предлагать повторить это слово (через 1, 3, 7, 30 и 90 дней)."
+           "бот будет предлагать повторить это слово (через 1, 3, 7, 30 и 90 дней) " \
+           "и напомнит, когда придет время."
     keyboard = keyboards.InlineKeyboard([
         [("В главное меню", cb.MainMenu())],
     ])
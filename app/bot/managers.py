@@ -5,14 +5,21 @@ from collections.abc import Awaitable
 from aiogram.utils.exceptions import InvalidQueryID
 
 from app.base.accessor import BaseAccessor
+from app.bot.states import StateAccessor
+from app.database.database import Database
 from app.logger import logger
+from app.metrics import queue_size, queues
 from app.utils import generate_uuid
+from app.web.translator import Translator
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
 
 class CoroutinesManager(BaseAccessor):
+    # queued handlers use all of them, so they are stopped first
+    dependencies = (Database, StateAccessor, Translator)
+    instrumented = False
 
     def __init__(self, app: "Application"):
         super().__init__(app)
@@ -47,15 +54,20 @@ class CoroutinesManager(BaseAccessor):
         if queue is None:
             queue = asyncio.Queue()
             self.queues[user_id] = queue
+            queues.set(len(self.queues))
             qw_task = asyncio.create_task(self.queue_worker(queue))
             self.qw_tasks.append(qw_task)
         return queue
 
     async def add(self, user_id: int, coro: Awaitable) -> None:
-        await self.get_queue(user_id).put(coro)
+        queue = self.get_queue(user_id)
+        queue_size.observe(queue.qsize())
+        await queue.put(coro)
 
 
 class TasksManager(BaseAccessor):
+    dependencies = (Database, StateAccessor, Translator)
+    instrumented = False
     gc_task: asyncio.Task
 
     def __init__(self, app: "Application"):
@@ -74,8 +86,8 @@ class TasksManager(BaseAccessor):
             if task.done() or task.cancelled():
                 continue
             await task
-        if not self.gc_task.done():
-            await self.gc_task
+        # nothing to wait for, the collector only sleeps between passes
+        self.gc_task.cancel()
 
     async def garbage_collector(self):
         seconds = self.app.config.common.tasks_gc_sleep
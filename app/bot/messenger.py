@@ -6,6 +6,7 @@ from aiogram.utils.exceptions import MessageNotModified, MessageToDeleteNotFound
 
 from app.bot.states import StateAccessor, PreviousMessageInfo
 from app.logger import logger
+from app.metrics import cache_requests
 from app.utils import now
 
 if typing.TYPE_CHECKING:
@@ -31,7 +32,10 @@ class Messenger:
     async def get_previous_msg_info(self, user_id: int) -> Optional[PreviousMessageInfo]:
         result = self._previous_msg_info_cache.get(user_id)
         if result is None:
+            cache_requests.inc(cache="previous_msg", result="miss")
             result = await self.states.get_previous_msg_info(user_id)
+        else:
+            cache_requests.inc(cache="previous_msg", result="hit")
         return result
 
     async def delete_previous(self, user_id: int):
@@ -67,7 +71,18 @@ class Messenger:
             else:
                 msg = await self.bot.send_message(user_id, text, reply_markup=keyboard)
             await self.set_previous_msg_info(user_id, msg.message_id, audio_id=audio_id)
-            logger.debug(f"sent msg to {user_id}")
+            logger.debug("sent msg to %s", user_id)
+        except Exception as e:
+            logger.info(text)
+            logger.exception(e)
+
+    async def notify(self, user_id: int, text: str, keyboard: Optional[types.InlineKeyboardMarkup] = None):
+        """
+        A message besides the current card of the user: it is not deleted or edited by the next one.
+        """
+        try:
+            await self.bot.send_message(user_id, text[:1024], reply_markup=keyboard)
+            logger.debug("notified %s", user_id)
         except Exception as e:
             logger.info(text)
             logger.exception(e)
@@ -87,7 +102,7 @@ class Messenger:
                 await self.bot.edit_message_caption(user_id, info.message_id, caption=text, reply_markup=keyboard)
             else:
                 await self.bot.edit_message_text(text, user_id, info.message_id, reply_markup=keyboard)
-            logger.debug(f"edited msg to {user_id}")
+            logger.debug("edited msg to %s", user_id)
         except MessageNotModified:
             logger.warning("Message is not modified")
         except Exception as e:
@@ -1,5 +1,9 @@
+import html
 import re
+from typing import Union
 
+from app.store.words.autocomplete import WordCard
+from app.store.words.importer import ImportResult
 from app.store.words.models import WordDC
 
 EXAMPLES_PER_PAGE = 4
@@ -35,7 +39,7 @@ def drop_symbols(text: str):
     return text
 
 
-def full_word_text(word: WordDC) -> str:
+def full_word_text(word: Union[WordDC, WordCard]) -> str:
     original = drop_symbols(word.original)
     text = f"📗 <b>{original}</b>"
     if word.transcription:
@@ -92,3 +96,17 @@ def has_more_examples(word: WordDC, current_page: int) -> bool:
 
 def has_more_idioms(word: WordDC, current_page: int) -> bool:
     return len(word.idioms) - (IDIOMS_PER_PAGE * (current_page + 1)) > 0
+
+
+def import_result_text(result: ImportResult, title: str = "Импорт завершен.", skipped: list[str] = ()) -> str:
+    text = f"{title}\n\n" \
+           f"Добавлено слов: {result.n_added}\n" \
+           f"Добавлено ранее: {result.n_existed}\n"
+    if result.not_found:
+        text += f"Перевод не найден ({len(result.not_found)}): " + ", ".join(result.not_found[:50])
+        if len(result.not_found) > 50:
+            text += ", ..."
+        text += "\n"
+    if skipped:
+        text += f"Пропущено ({len(skipped)}): " + html.escape(", ".join(skipped[:50]))
+    return text
@@ -0,0 +1,92 @@
+import asyncio
+import typing
+from contextlib import suppress
+from datetime import timedelta
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.bot import callback_data as cb
+from app.bot import keyboards
+from app.bot.managers import CoroutinesManager
+from app.bot.messenger import Messenger
+from app.bot.states import StateAccessor
+from app.database.database import Database
+from app.logger import logger
+from app.store.users.accessor import Reminders
+from app.utils import now
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class ReminderSender(BaseAccessor):
+    """
+    Tells users that words are due to recall. Users are taken from the sorted set
+    of due times (see UserAccessor.schedule_reminder) instead of scanning user_words.
+    Reminders go through the queue of the user, like handlers, so they do not race with them.
+    """
+    dependencies = (Database, StateAccessor, CoroutinesManager)
+    instrumented = False
+    task: Optional[asyncio.Task] = None
+
+    def __init__(self, app: "Application", messenger: Messenger, coroutines: CoroutinesManager):
+        super().__init__(app)
+        self.messenger = messenger
+        self.coroutines = coroutines
+
+    async def connect(self) -> None:
+        if not self.app.config.reminders.enabled:
+            # due times are not scheduled while disabled, they are rebuilt when enabled again
+            await self.app.store.database.redis.delete(Reminders.due)
+            return
+        if not await self.app.store.database.redis.exists(Reminders.due):
+            n_users = await self.app.store.users.rebuild_reminders()
+            logger.info("reminders of %s users are rebuilt", n_users)
+        self.task = asyncio.create_task(self.run())
+
+    async def disconnect(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+
+    async def run(self) -> None:
+        while 1:
+            try:
+                await self.send_due()
+            except Exception as e:
+                logger.exception(e)
+            await asyncio.sleep(self.app.config.reminders.interval)
+
+    async def send_due(self) -> int:
+        config = self.app.config.reminders
+        user_ids = await self.app.store.users.get_due_reminders(now(), limit=config.batch_size)
+        for user_id in user_ids:
+            if await self.remind(user_id):
+                await asyncio.sleep(1.0 / config.messages_per_second)
+        return len(user_ids)
+
+    async def remind(self, user_id: int) -> bool:
+        """
+        The due time in Redis may be outdated (words were recalled or deleted),
+        so the database is checked before sending and the next time is set from it.
+        """
+        users = self.app.store.users
+        current_time = now()
+        n_to_recall = 0
+        for user_lang in await users.get_user_langs(user_id):
+            n_to_recall += await users.count_to_recall_user_words(user_id, user_lang.translation_code)
+        next_due = await users.get_next_due(user_id, current_time)
+
+        if n_to_recall:
+            keyboard = keyboards.InlineKeyboard([
+                [("Повторить", cb.RecallWordsQuestion())],
+                [("В главное меню", cb.MainMenu())],
+            ])
+            await self.coroutines.add(user_id, self.messenger.notify(user_id, f"🔔 Пора повторить слова: {n_to_recall}.",
+                                                                     keyboard=keyboard.dump()))
+            repeat_at = current_time + timedelta(hours=self.app.config.reminders.repeat_after)
+            next_due = repeat_at if next_due is None else max(next_due, repeat_at)
+        await users.set_reminder(user_id, next_due)
+        return n_to_recall > 0
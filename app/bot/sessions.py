@@ -0,0 +1,86 @@
+import random
+import typing
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.bot.states import StateAccessor, WordsSession
+from app.database.database import Database
+from app.utils import now
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class SessionKind:
+    remember = "mem"
+    recall = "rec"
+
+
+class SessionAccessor(BaseAccessor):
+    """
+    Remember and recall sessions are read lazily: the order is random in SQL
+    (see queries.SESSION_TO_REMEMBER), only the current chunk of sessions.chunk_size
+    words is kept in Redis and the next one is fetched by the keyset cursor
+    when the user gets to it. So the first question does not depend on the number of words.
+    """
+    dependencies = (Database, StateAccessor)
+
+    def __init__(self, app: "Application", states: StateAccessor):
+        super().__init__(app)
+        self.states = states
+
+    async def start(self, user_id: int, kind: str, translation_code: str, shuffle: bool = True) -> WordsSession:
+        session = WordsSession(translation_code=translation_code,
+                               seed=random.getrandbits(63) if shuffle else None,
+                               until=now().timestamp() if kind == SessionKind.recall else None)
+        await self.get_item(user_id, kind, session, 0)
+        return session
+
+    async def get(self, user_id: int, kind: str) -> WordsSession:
+        return await self.states.get_words_session(user_id, kind)
+
+    async def get_item(self, user_id: int, kind: str, session: WordsSession, i: int) -> Optional[tuple[int, bool]]:
+        """
+        (word_id, swap) of the i-th question, None when the session is over.
+        The next chunk is fetched when i is right after the current one.
+        """
+        config = self.app.config.sessions
+        if i >= config.max_words:
+            return None
+        j = i - session.offset
+        if 0 <= j < len(session.items):
+            word_id, swap = session.items[j]
+            return word_id, swap
+        if j != len(session.items) or session.exhausted:
+            return None
+
+        chunk = await self.fetch_chunk(user_id, kind, session, config.chunk_size)
+        if len(chunk) < config.chunk_size:
+            session.exhausted = True
+        if chunk:
+            session.cursor = list(chunk[-1])
+        # the previous question is kept for the answer to it
+        kept = session.items[-1:]
+        session.offset = i - len(kept)
+        session.items = kept + [list(k) for k in chunk]
+        await self.states.set_words_session(user_id, kind, session)
+        return chunk[0] if chunk else None
+
+    async def fetch_chunk(self, user_id: int, kind: str, session: WordsSession, limit: int) -> list[tuple[int, bool]]:
+        users = self.app.store.users
+        after = tuple(session.cursor) if session.cursor else None
+        if kind == SessionKind.remember:
+            return await users.get_session_to_remember(user_id, session.translation_code, session.seed, after, limit)
+        until = datetime.fromtimestamp(session.until, tz=timezone.utc)
+        return await users.get_session_to_recall(user_id, session.translation_code, session.seed, after, limit, until)
+
+    async def remove_word(self, user_id: int, kind: str, session: WordsSession, word_id: int, i: int) -> int:
+        """
+        Removes a deleted word from the fetched questions. Returns the new index of the i-th question.
+        """
+        n_before = len([j for j, item in enumerate(session.items)
+                        if item[0] == word_id and session.offset + j < i])
+        session.items = [k for k in session.items if k[0] != word_id]
+        await self.states.set_words_session(user_id, kind, session)
+        return i - n_before
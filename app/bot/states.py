@@ -1,4 +1,4 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from typing import Optional
 
@@ -6,6 +6,7 @@ import orjson
 from aioredis import Redis
 
 from app.base.accessor import BaseAccessor
+from app.database.database import Database
 
 
 @dataclass
@@ -22,14 +23,25 @@ class WordsNavigationState:
     random: bool
 
 
+@dataclass
+class WordsSession:
+    translation_code: str
+    seed: Optional[int]  # of the random order, None - in the order of adding
+    until: Optional[float] = None  # unix time, recall the words due before the start of the session
+    offset: int = 0  # index of items[0] in the session
+    items: list[list] = field(default_factory=list)  # [word_id, swap] of the current chunk
+    cursor: Optional[list] = None  # the last fetched item
+    exhausted: bool = False  # no more words after the cursor
+
+
 class States:
     previous_msg = "words_pmi"
     words_navigation = "words_nav"
-    words_remember_idx = "words_mem_idx"
-    words_recall_idx = "words_rec_idx"
+    words_session = "words_ses_"
 
 
 class StateAccessor(BaseAccessor):
+    dependencies = (Database,)
     redis: Redis
 
     async def connect(self) -> None:
@@ -54,16 +66,9 @@ class StateAccessor(BaseAccessor):
         data = await self.redis.get(States.words_navigation + str(user_id))
         return WordsNavigationState(**orjson.loads(data))
 
-    async def set_words_remember_order(self, user_id: int, idx: list[int]):
-        await self.redis.set(States.words_remember_idx + str(user_id), orjson.dumps(idx))
-
-    async def get_words_remember_order(self, user_id: int) -> list[int]:
-        data = await self.redis.get(States.words_remember_idx + str(user_id))
-        return orjson.loads(data)
-
-    async def set_words_recall_order(self, user_id: int, idx: list[tuple[int, bool]]):
-        await self.redis.set(States.words_recall_idx + str(user_id), orjson.dumps(idx))
+    async def set_words_session(self, user_id: int, kind: str, data: WordsSession):
+        await self.redis.set(States.words_session + kind + str(user_id), orjson.dumps(asdict(data)))
 
-    async def get_words_recall_order(self, user_id: int) -> list[tuple[int, bool]]:
-        data = await self.redis.get(States.words_recall_idx + str(user_id))
-        return orjson.loads(data)
+    async def get_words_session(self, user_id: int, kind: str) -> WordsSession:
+        data = await self.redis.get(States.words_session + kind + str(user_id))
+        return WordsSession(**orjson.loads(data))
@@ -0,0 +1,161 @@
+import asyncio
+import pathlib
+import re
+import time
+import typing
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Optional
+
+import orjson
+from aiogram import Bot, types
+from aiogram.utils.exceptions import RetryAfter
+
+from app.logger import logger
+from app.store.words.importer import is_valid_word
+from app.store.words.models import WordDC
+from app.utils import MediaGenerator
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+FREQUENCY_SEPARATOR = re.compile(r"[\s,;]")
+
+
+def read_frequency_list(lines: Iterable[str], top: Optional[int] = None) -> list[str]:
+    """
+    Reads a list sorted by frequency, the word is the first column:
+    "the 23135851162", "the,23135851162" or just "the".
+    """
+    result = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        original = FREQUENCY_SEPARATOR.split(line, 1)[0].lower()
+        if not is_valid_word(original):
+            continue
+        result[original] = None
+        if top is not None and len(result) >= top:
+            break
+    return list(result)
+
+
+class Checkpoint:
+    """
+    Number of processed words of the list per translation code, kept in a JSON file.
+    """
+
+    def __init__(self, filename: Optional[pathlib.Path]):
+        self.filename = filename
+        self.positions: dict[str, int] = {}
+        if filename is not None and filename.exists():
+            self.positions = orjson.loads(filename.read_bytes())
+
+    def get(self, translation_code: str) -> int:
+        return self.positions.get(translation_code, 0)
+
+    def set(self, translation_code: str, position: int) -> None:
+        self.positions[translation_code] = position
+        if self.filename is None:
+            return
+        temp = self.filename.with_suffix(".tmp")
+        temp.write_bytes(orjson.dumps(self.positions))
+        temp.replace(self.filename)
+
+
+@dataclass
+class WarmerStats:
+    n_skipped: int = 0  # already in the dictionary
+    n_translated: int = 0
+    n_not_found: int = 0
+    n_failed: int = 0
+    n_audio: int = 0
+
+
+class DictionaryWarmer:
+    """
+    Fills the words table (with audio) from a frequency list, so that common words
+    are cache hits for users. Translator requests and audio uploads are spaced by
+    the given intervals: the temp chat is a group, where Telegram allows 20 messages a minute.
+    """
+
+    def __init__(self,
+                 app: "Application",
+                 bot: Bot,
+                 translate_interval: float = 1.0,
+                 upload_interval: float = 3.0,
+                 with_audio: bool = True):
+        self.app = app
+        self.bot = bot
+        self.intervals = {"translate": translate_interval, "upload": upload_interval}
+        self.with_audio = with_audio
+        self.last_request: dict[str, float] = {}
+        self.stats = WarmerStats()
+
+    async def throttle(self, upstream: str) -> None:
+        last = self.last_request.get(upstream)
+        if last is not None:
+            await asyncio.sleep(max(0.0, last + self.intervals[upstream] - time.monotonic()))
+        self.last_request[upstream] = time.monotonic()
+
+    async def upload_audio(self, translation_code: str, original: str) -> str:
+        async with MediaGenerator.generate_audio(
+                self.app.config.langs.get_foreign_language_code(translation_code),
+                original,
+        ) as filename:
+            while 1:
+                await self.throttle("upload")
+                try:
+                    audio = types.input_file.InputFile(filename, filename="_.mp3")
+                    audio_msg = await self.bot.send_audio(self.app.config.bot.temp_chat_id, audio)
+                    return audio_msg.audio.file_id
+                except RetryAfter as e:
+                    logger.warning("upload is throttled for %ss", e.timeout)
+                    await asyncio.sleep(e.timeout)
+
+    async def warm_word(self, translation_code: str, original: str, word: Optional[WordDC]) -> None:
+        if word is None:
+            await self.throttle("translate")
+            try:
+                word = await self.app.store.translator.translate(translation_code, original)
+            except Exception as e:
+                logger.warning("failed to translate %r: %r", original, e)
+                self.stats.n_failed += 1
+                return
+            if not word.translations:
+                self.stats.n_not_found += 1
+                return
+            self.stats.n_translated += 1
+
+        if self.with_audio and not word.audio_id:
+            word.audio_id = await self.upload_audio(translation_code, word.original)
+            self.stats.n_audio += 1
+        await self.app.store.words.add_word(word)
+
+    async def warm(self,
+                   translation_code: str,
+                   originals: list[str],
+                   checkpoint: Checkpoint,
+                   deadline: Optional[float] = None,
+                   batch_size: int = 100) -> WarmerStats:
+        """
+        Continues from the checkpoint and stops at the deadline (time.monotonic()),
+        so it can be run in off-peak hours until the list is done.
+        """
+        start = checkpoint.get(translation_code)
+        for i in range(start, len(originals), batch_size):
+            batch = originals[i:i + batch_size]
+            known = {w.original: w for w in await self.app.store.words.get_words(translation_code, batch)}
+            for j, original in enumerate(batch, start=i):
+                if deadline is not None and time.monotonic() > deadline:
+                    logger.info("(%s) stopped at %s of %s words", translation_code, j, len(originals))
+                    return self.stats
+                word = known.get(original)
+                if word is not None and (word.audio_id or not self.with_audio):
+                    self.stats.n_skipped += 1
+                else:
+                    await self.warm_word(translation_code, original, word)
+                checkpoint.set(translation_code, j + 1)
+            logger.info("(%s) warmed %s of %s words: %s", translation_code, i + len(batch), len(originals), self.stats)
+        return self.stats
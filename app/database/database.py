@@ -1,15 +1,43 @@
+import asyncio
+import itertools
+import pathlib
+import time
 import typing
+from typing import Optional
 
 from aioredis import Redis
-from gino import Gino
+from asyncpg import Record
+from gino import create_engine
+from gino.engine import GinoEngine
 from sqlalchemy.engine.url import URL
 
 from app.base.accessor import BaseAccessor
+from app.database.partitioning import create_partitions_sql
+from app.database.pool import MeteredPool, PoolStats
+from app.database.replicas import REPLICATION_LAG, Replica, RoutedGino, current_user, reading
+from app.logger import logger
+from app.metrics import db_replica_lag_seconds
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
-db = Gino()
+db = RoutedGino()
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parent.parent.parent
+
+
+class StartupMode:
+    create_all = "create_all"
+    check_migrations = "check_migrations"
+
+
+def get_head_revision() -> str:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(ROOT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    return ScriptDirectory.from_config(config).get_current_head()
 
 
 def register_models() -> None:
@@ -21,13 +49,26 @@ def register_models() -> None:
 
 class Database(BaseAccessor):
     redis: Redis
+    pool: MeteredPool
+    replicas_task: Optional[asyncio.Task] = None
 
     def __init__(self, app: "Application"):
         super().__init__(app)
         self.db = db
+        self.db.router = self
+        self.replicas: list[Replica] = []
+        self.replica_counter = itertools.count()
+        self.last_writes: dict[int, float] = {}  # user_id -> time.monotonic() of the last write
         register_models()
 
     async def connect(self) -> None:
+        self.redis = Redis(host=self.app.config.redis.host,
+                           port=self.app.config.redis.port,
+                           db=self.app.config.redis.db)
+        await asyncio.gather(self.connect_postgres(), self.redis.ping())
+        await self.connect_replicas()
+
+    async def connect_postgres(self) -> None:
         config = self.app.config.database
         url = URL(drivername=config.driver,
                   username=config.username,
@@ -35,13 +76,158 @@ class Database(BaseAccessor):
                   host=config.host,
                   port=config.port,
                   database=config.database)
-        await self.db.set_bind(url)
-        await self.db.gino.create_all()
-
-        self.redis = Redis(host=self.app.config.redis.host,
-                           port=self.app.config.redis.port,
-                           db=self.app.config.redis.db)
+        await self.db.set_bind(url,
+                               min_size=config.min_pool_size,
+                               max_size=config.max_pool_size,
+                               statement_cache_size=config.statement_cache_size,
+                               command_timeout=config.command_timeout,
+                               max_inactive_connection_lifetime=config.max_inactive_connection_lifetime,
+                               pool_class=self._create_pool)
+        if config.startup_mode == StartupMode.check_migrations:
+            await self.check_migrations()
+        else:
+            await self.db.gino.create_all()
+            await self.create_partitions()
 
     async def disconnect(self) -> None:
+        await self.disconnect_replicas()
         await self.db.pop_bind().close()
         await self.redis.close()
+
+    async def connect_replicas(self) -> None:
+        self.replicas = [Replica(url) for url in self.app.config.database.replicas]
+        if not self.replicas:
+            return
+        await self.check_replicas()
+        self.replicas_task = asyncio.create_task(self.watch_replicas())
+
+    async def disconnect_replicas(self) -> None:
+        if self.replicas_task is not None:
+            self.replicas_task.cancel()
+            self.replicas_task = None
+        for replica in self.replicas:
+            if replica.engine is not None:
+                await replica.engine.close()
+        self.replicas = []
+
+    async def watch_replicas(self) -> None:
+        config = self.app.config.database
+        while 1:
+            await asyncio.sleep(config.replica_check_interval)
+            await self.check_replicas()
+            expired = time.monotonic() - config.read_your_writes
+            self.last_writes = {k: v for k, v in self.last_writes.items() if v > expired}
+
+    async def check_replicas(self) -> None:
+        await asyncio.gather(*[self.check_replica(i) for i in self.replicas])
+
+    async def check_replica(self, replica: Replica) -> None:
+        """
+        A replica is used while it answers and lags behind the primary less than replica_max_lag.
+        An unavailable replica is connected again by the next check.
+        """
+        config = self.app.config.database
+        i = self.replicas.index(replica)
+        try:
+            if replica.engine is None:
+                replica.engine = await asyncio.wait_for(
+                    create_engine(replica.url,
+                                  min_size=config.min_pool_size,
+                                  max_size=config.max_pool_size,
+                                  statement_cache_size=config.statement_cache_size,
+                                  command_timeout=config.command_timeout,
+                                  max_inactive_connection_lifetime=config.max_inactive_connection_lifetime),
+                    timeout=config.replica_check_interval)
+            async with replica.engine.acquire() as conn:
+                lag = await conn.raw_connection.fetchval(REPLICATION_LAG, timeout=config.replica_check_interval)
+        except Exception as e:
+            if repr(e) != replica.error:
+                logger.warning("replica %d is unavailable: %r", i, e)
+            replica.healthy, replica.lag, replica.error = False, None, repr(e)
+            db_replica_lag_seconds.set(-1, replica=str(i))
+            return
+        replica.lag, replica.error = float(lag or 0), None
+        healthy = replica.lag <= config.replica_max_lag
+        if healthy != replica.healthy:
+            logger.info("replica %d is %s, lag %.1f s", i, "healthy" if healthy else "lagging", replica.lag)
+        replica.healthy = healthy
+        db_replica_lag_seconds.set(replica.lag, replica=str(i))
+
+    def wrote(self, user_id: int) -> None:
+        if self.replicas:
+            self.last_writes[user_id] = time.monotonic()
+
+    def reader(self) -> Optional[GinoEngine]:
+        """
+        A healthy replica for a query of a @reads method, None means the primary.
+        """
+        if not self.replicas or not reading.get():
+            return None
+        user_id = current_user.get()
+        if user_id is not None and user_id in self.last_writes:
+            if time.monotonic() - self.last_writes[user_id] < self.app.config.database.read_your_writes:
+                return None
+        healthy = [i for i in self.replicas if i.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self.replica_counter) % len(healthy)].engine
+
+    async def check_migrations(self) -> None:
+        """
+        Fast alternative to create_all: the schema is managed by alembic,
+        so we only make sure that the database is at the head revision.
+        """
+        head = get_head_revision()
+        exists = await self.fetchval("SELECT to_regclass('alembic_version') IS NOT NULL")
+        current = await self.fetchval("SELECT version_num FROM alembic_version") if exists else None
+        if current is None and await self.fetchval("SELECT to_regclass('words') IS NOT NULL"):
+            raise RuntimeError("the database is not managed by alembic. If it was created by create_all "
+                               "at the head revision, run `alembic stamp head`.")
+        if current != head:
+            raise RuntimeError(f"database revision is {current}, expected {head}. "
+                               f"Run `alembic upgrade head`.")
+
+    async def create_partitions(self) -> None:
+        """
+        Partitions of tables which are declared partitioned and created so by create_all.
+        """
+        for table in self.db.sorted_tables:
+            n_partitions = table.info.get("partitions")
+            if not n_partitions:
+                continue
+            kind = await self.fetchval("SELECT relkind::text FROM pg_class WHERE oid = to_regclass($1)", table.name)
+            if kind != "p":
+                continue
+            for query in create_partitions_sql(table.name, n_partitions):
+                await self.fetchval(query)
+
+    def _create_pool(self, url, loop, **kwargs) -> MeteredPool:
+        self.pool = MeteredPool(url, loop, wait_warning=self.app.config.database.pool_wait_warning, **kwargs)
+        return self.pool
+
+    def pool_stats(self) -> PoolStats:
+        return self.pool.stats()
+
+    async def fetch(self, query: str, *args) -> list[Record]:
+        """
+        GINO prepares every statement anew, while plain asyncpg queries go through
+        the statement cache of the connection. So hot queries are kept as constant
+        SQL and prepared only once per connection.
+        """
+        async with self.db.acquire(reuse=True) as conn:
+            return await conn.raw_connection.fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args) -> typing.Optional[Record]:
+        async with self.db.acquire(reuse=True) as conn:
+            return await conn.raw_connection.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args) -> typing.Any:
+        async with self.db.acquire(reuse=True) as conn:
+            return await conn.raw_connection.fetchval(query, *args)
+
+    async def copy_records(self, table: str, records: list[tuple], columns: list[str]) -> None:
+        """
+        COPY is the fastest way to insert many rows, e.g. buffered logs.
+        """
+        async with self.db.acquire(reuse=True) as conn:
+            await conn.raw_connection.copy_records_to_table(table, records=records, columns=columns)
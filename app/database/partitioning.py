@@ -0,0 +1,113 @@
+"""
+Hash partitioning of big tables. A model declares it in __table_args__:
+
+    __table_args__ = dict(postgresql_partition_by="HASH (user_id)", info=dict(partitions=16))
+
+create_all creates the parent table, partitions are created by Database.create_partitions.
+Existing tables are moved to another layout with OnlineRewrite from an alembic revision.
+"""
+from typing import Optional
+
+
+def partition_name(table: str, remainder: int) -> str:
+    return f"{table}_p{remainder}"
+
+
+def create_partitions_sql(table: str, n_partitions: int) -> list[str]:
+    return [f"CREATE TABLE IF NOT EXISTS {partition_name(table, i)} PARTITION OF {table} "
+            f"FOR VALUES WITH (MODULUS {n_partitions}, REMAINDER {i})"
+            for i in range(n_partitions)]
+
+
+class OnlineRewrite:
+    """
+    Moves a table with a serial id to a new layout while it is in use:
+
+    1. prepare() creates the new table and a trigger, which mirrors every change of the old one;
+    2. copy_batch() copies existing rows in batches by id, each batch in its own transaction;
+    3. swap() replaces the old table with the new one under a short lock.
+
+    Copied rows are locked FOR SHARE, so a concurrent update or delete waits for the batch
+    and is mirrored after it. Constraints are given as in CREATE TABLE, e.g. "PRIMARY KEY (user_id, id)",
+    their names get the prefix of the table after the swap.
+    """
+
+    def __init__(self,
+                 table: str,
+                 key: str,
+                 constraints: list[str],
+                 partition_by: Optional[str] = None,
+                 n_partitions: int = 0,
+                 batch_size: int = 10_000):
+        self.table = table
+        self.key = key  # the partition key, or any column which is never updated
+        self.constraints = constraints
+        self.partition_by = partition_by
+        self.n_partitions = n_partitions
+        self.batch_size = batch_size
+        self.new = f"{table}_new"
+        self.mirror = f"{table}_mirror"
+
+    def prepare(self) -> list[str]:
+        columns = ", ".join([f"LIKE {self.table} INCLUDING DEFAULTS"] + self.constraints)
+        partition_by = f" PARTITION BY {self.partition_by}" if self.partition_by else ""
+        result = [f"CREATE TABLE {self.new} ({columns}){partition_by}"]
+        if self.partition_by:
+            result.extend(create_partitions_sql(self.new, self.n_partitions))
+        result.append(f"""
+CREATE FUNCTION {self.mirror}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        DELETE FROM {self.new} WHERE {self.key} = OLD.{self.key} AND id = OLD.id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO {self.new} SELECT NEW.*;
+    END IF;
+    RETURN NULL;
+END $$
+""")
+        result.append(f"CREATE TRIGGER {self.mirror} AFTER INSERT OR UPDATE OR DELETE ON {self.table} "
+                      f"FOR EACH ROW EXECUTE FUNCTION {self.mirror}()")
+        return result
+
+    def copy_batch(self, after_id: int) -> str:
+        """
+        Returns the last copied id, NULL when everything is copied.
+        """
+        return f"""
+WITH batch AS (
+    SELECT * FROM {self.table} WHERE id > {int(after_id)} ORDER BY id LIMIT {int(self.batch_size)} FOR SHARE
+), copied AS (
+    INSERT INTO {self.new} SELECT * FROM batch ON CONFLICT DO NOTHING
+)
+SELECT max(id) FROM batch
+"""
+
+    def swap(self) -> list[str]:
+        result = [
+            f"LOCK TABLE {self.table} IN ACCESS EXCLUSIVE MODE",
+            f"DROP TRIGGER {self.mirror} ON {self.table}",
+            f"DROP FUNCTION {self.mirror}()",
+            f"""
+DO $$ BEGIN
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY {self.new}.id', pg_get_serial_sequence('{self.table}', 'id'));
+END $$
+""",
+            f"DROP TABLE {self.table}",
+            f"ALTER TABLE {self.new} RENAME TO {self.table}",
+        ]
+        if self.partition_by:
+            result.extend(f"ALTER TABLE {partition_name(self.new, i)} RENAME TO {partition_name(self.table, i)}"
+                          for i in range(self.n_partitions))
+        result.append(f"""
+DO $$
+DECLARE c record;
+BEGIN
+    FOR c IN SELECT conrelid::regclass AS relation, conname FROM pg_constraint
+             WHERE left(conname, length('{self.new}')) = '{self.new}' LOOP
+        EXECUTE format('ALTER TABLE %s RENAME CONSTRAINT %I TO %I', c.relation, c.conname,
+                       '{self.table}' || substr(c.conname, length('{self.new}') + 1));
+    END LOOP;
+END $$
+""")
+        return result
@@ -0,0 +1,67 @@
+import time
+from dataclasses import dataclass
+
+from gino.dialects.asyncpg import Pool
+
+from app.logger import logger
+from app.metrics import db_pool_wait_seconds
+
+
+@dataclass
+class PoolStats:
+    size: int
+    idle: int
+    acquired: int
+    waiting: int
+    n_acquisitions: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class MeteredPool(Pool):
+    """
+    asyncpg pool which counts acquired connections and time spent waiting for them.
+    """
+
+    def __init__(self, url, loop, wait_warning: float = 0.1, **kwargs):
+        super().__init__(url, loop, **kwargs)
+        self.wait_warning = wait_warning
+        self.acquired = 0
+        self.waiting = 0
+        self.n_acquisitions = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    async def acquire(self, *, timeout=None):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            conn = await super().acquire(timeout=timeout)
+        finally:
+            self.waiting -= 1
+        wait_time = time.perf_counter() - start
+
+        self.acquired += 1
+        self.n_acquisitions += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        db_pool_wait_seconds.observe(wait_time)
+        if wait_time > self.wait_warning:
+            logger.warning(f"waited {wait_time:.3f}s for db connection, "
+                           f"acquired={self.acquired}, waiting={self.waiting}")
+        return conn
+
+    async def release(self, conn):
+        try:
+            await super().release(conn)
+        finally:
+            self.acquired -= 1
+
+    def stats(self) -> PoolStats:
+        return PoolStats(size=self.raw_pool.get_size(),
+                         idle=self.raw_pool.get_idle_size(),
+                         acquired=self.acquired,
+                         waiting=self.waiting,
+                         n_acquisitions=self.n_acquisitions,
+                         wait_time_total=self.wait_time_total,
+                         wait_time_max=self.wait_time_max)
@@ -0,0 +1,83 @@
+"""
+Routing of reads to replicas. Accessor methods which only read are marked with @reads,
+their queries go to a healthy replica (round-robin). Methods which change data of users
+are marked with @writes: for database.read_your_writes seconds after a write, reads of the same
+user go to the primary, so the user does not miss their own changes because of the replication lag.
+The user is taken from current_user, which the bot sets for every update.
+
+Queries inside a transaction or an acquired connection of the primary stay on it.
+"""
+import typing
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Optional
+
+from gino import Gino
+from gino.engine import GinoEngine
+
+if typing.TYPE_CHECKING:
+    from app.database.database import Database
+
+current_user: ContextVar[Optional[int]] = ContextVar("current_user", default=None)
+reading: ContextVar[bool] = ContextVar("reading", default=False)
+
+# NULL on a primary, 0 when everything received is replayed
+REPLICATION_LAG = """
+SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END
+"""
+
+
+@dataclass
+class Replica:
+    url: str
+    engine: Optional[GinoEngine] = None
+    healthy: bool = False
+    lag: Optional[float] = None  # seconds
+    error: Optional[str] = None  # of the last check
+
+
+def reads(func):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = reading.set(True)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            reading.reset(token)
+
+    return wrapper
+
+
+def writes(func):
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        result = await func(self, *args, **kwargs)
+        user_id = current_user.get()
+        if user_id is not None:
+            self.app.store.database.wrote(user_id)
+        return result
+
+    return wrapper
+
+
+class RoutedGino(Gino):
+    """
+    Gino whose bind is a replica inside @reads methods, so both GINO queries
+    and Database.fetch* are routed without changes in accessors.
+    """
+    router: Optional["Database"] = None
+
+    @property
+    def bind(self):
+        bind = super().bind
+        if self.router is None or not reading.get() or not isinstance(bind, GinoEngine):
+            return bind
+        if bind.current_connection is not None:
+            return bind
+        return self.router.reader() or bind
+
+    @bind.setter
+    def bind(self, bind):
+        Gino.bind.fset(self, bind)
@@ -1,5 +1,12 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import typing
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+if typing.TYPE_CHECKING:
+    from app.web.config import LoggingConfig
 
 logger = logging.getLogger("words")
 logger.setLevel(logging.DEBUG)
@@ -14,5 +21,62 @@ fh = RotatingFileHandler("log.log", maxBytes=1024 ** 2, backupCount=1, encoding=
 fh.setFormatter(formatter)
 fh.setLevel(logging.DEBUG)
 
-logger.addHandler(sh)
-logger.addHandler(fh)
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler formats records in the calling thread, i.e. in the event loop.
+    The queue is consumed by a thread of the same process, so records are passed as is
+    and formatted by the listener. Arguments of log calls must not be mutated afterwards.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    All modules share one logger, so levels per module are checked by record.module.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.levels: dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        level = self.levels.get(record.module)
+        return level is None or record.levelno >= level
+
+
+log_queue = queue.SimpleQueue()
+listener = QueueListener(log_queue, sh, fh, respect_handler_level=True)
+module_filter = ModuleLevelFilter()
+
+qh = LazyQueueHandler(log_queue)
+qh.addFilter(module_filter)
+logger.addHandler(qh)
+
+listener.start()
+atexit.register(listener.stop)
+
+update_sample_rate = 1.0
+
+
+def get_level(name: str) -> int:
+    level = logging.getLevelName(str(name).upper())
+    if not isinstance(level, int):
+        raise ValueError(f"unknown logging level: {name!r}")
+    return level
+
+
+def setup_logging(config: "LoggingConfig") -> None:
+    global update_sample_rate
+    logger.setLevel(get_level(config.level))
+    module_filter.levels = {module: get_level(level) for module, level in config.modules.items()}
+    update_sample_rate = config.update_sample_rate
+
+
+def sampled() -> bool:
+    """
+    For per-update debug lines, only the given share of updates is logged.
+    """
+    return update_sample_rate >= 1.0 or random.random() < update_sample_rate
@@ -0,0 +1,191 @@
+"""
+Minimal Prometheus-compatible metrics: counters, gauges and histograms with labels,
+rendered in the text exposition format by MetricsServer.
+"""
+import bisect
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import Iterator
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if labels.keys() != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[i]) for i in self.label_names)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.type}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_number(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, value: float = 1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + value
+
+    def get(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+
+    def samples(self):
+        for key, value in self.values.items():
+            yield self.name, _labels_text(self.label_names, key), value
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        self.values[self._key(labels)] = value
+
+    def dec(self, value: float = 1, **labels):
+        self.inc(-value, **labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per labels: [count per bucket (not cumulative) + overflow, sum]
+        self.values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        data = self.values.get(key)
+        if data is None:
+            data = self.values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        data[0][bisect.bisect_left(self.buckets, value)] += 1
+        data[1][0] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        data = self.values.get(self._key(labels))
+        return sum(data[0]) if data else 0
+
+    def samples(self):
+        names = self.label_names + ("le",)
+        for key, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", _labels_text(names, key + (_number(bound),)), cumulative
+            yield f"{self.name}_sum", _labels_text(self.label_names, key), total[0]
+            yield f"{self.name}_count", _labels_text(self.label_names, key), cumulative
+
+
+class Registry:
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, func: Callable[[], None]):
+        """
+        Collectors are called before exposition to refresh gauges, e.g. pool stats.
+        """
+        self.collectors.append(func)
+
+    def remove_collector(self, func: Callable[[], None]):
+        self.collectors.remove(func)
+
+    def expose(self) -> str:
+        for func in self.collectors:
+            func()
+        return "\n".join(i.expose() for i in self.metrics.values()) + "\n"
+
+
+registry = Registry()
+
+handler_seconds = registry.histogram(
+    "words_handler_seconds", "Time spent in bot handlers.", ("handler",))
+handler_errors = registry.counter(
+    "words_handler_errors_total", "Handlers finished with an exception.", ("handler",))
+queue_wait_seconds = registry.histogram(
+    "words_queue_wait_seconds", "Time between receiving an update and starting its handler.", ("handler",))
+queue_size = registry.histogram(
+    "words_queue_size", "Size of the user queue when an update is added.",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50))
+queues = registry.gauge(
+    "words_queues", "Number of user queues.")
+accessor_seconds = registry.histogram(
+    "words_accessor_seconds", "Time spent in accessor methods (database, redis, translator).",
+    ("accessor", "method"))
+bot_api_seconds = registry.histogram(
+    "words_bot_api_seconds", "Telegram Bot API call time.", ("method",))
+translator_requests = registry.counter(
+    "words_translator_requests_total", "Requests to translation backends by result.", ("backend", "result"))
+audio_seconds = registry.histogram(
+    "words_audio_seconds", "gTTS audio generation time.",
+    buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0))
+cache_requests = registry.counter(
+    "words_cache_requests_total", "Cache lookups by result (hit or miss).", ("cache", "result"))
+db_pool_wait_seconds = registry.histogram(
+    "words_db_pool_wait_seconds", "Time spent waiting for a database connection.")
+db_pool_connections = registry.gauge(
+    "words_db_pool_connections", "Database connections by state.", ("state",))
+db_replica_lag_seconds = registry.gauge(
+    "words_db_replica_lag_seconds", "Replication lag of read replicas, -1 if unavailable.", ("replica",))
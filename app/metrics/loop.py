@@ -0,0 +1,155 @@
+import asyncio
+import pathlib
+import sys
+import threading
+import time
+import traceback
+import typing
+from collections import Counter
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.logger import logger
+from app.metrics import registry
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+loop_lag_seconds = registry.histogram(
+    "words_loop_lag_seconds", "Delay of event loop wakeups.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+slow_callbacks = registry.counter(
+    "words_slow_callbacks_total", "Event loop steps blocking longer than monitoring.slow_callback.")
+
+
+def folded_stack(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({pathlib.Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class StackProfiler:
+    """
+    Samples stacks of one thread and counts them in the folded format
+    ("root;child;leaf count" per line), which is the input of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.is_running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.is_running = True
+        self.thread = threading.Thread(target=self.run, name="stack-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.is_running = False
+        self.thread.join()
+
+    def run(self):
+        while self.is_running:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[folded_stack(frame)] += 1
+            time.sleep(self.interval)
+
+    def dump(self, filename: pathlib.Path):
+        filename.parent.mkdir(exist_ok=True, parents=True)
+        with open(filename, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class LoopMonitor(BaseAccessor):
+    """
+    A task wakes up every lag_interval and records how late it is.
+    A watchdog thread logs the stack of the event loop thread when the task
+    has not woken up for longer than slow_callback, i.e. something blocks the loop.
+    """
+    instrumented = False
+
+    def __init__(self, app: "Application"):
+        super().__init__(app)
+        self.is_running = False
+        self.heartbeat = time.monotonic()
+        self.loop_thread_id = threading.get_ident()
+        self.lag_task: Optional[asyncio.Task] = None
+        self.watchdog: Optional[threading.Thread] = None
+        self.profiler: Optional[StackProfiler] = None
+
+    async def connect(self) -> None:
+        config = self.app.config.monitoring
+        if not config.enabled:
+            return
+        self.is_running = True
+        self.heartbeat = time.monotonic()
+        self.loop_thread_id = threading.get_ident()
+        self.lag_task = asyncio.create_task(self.sample_lag())
+        self.watchdog = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        self.watchdog.start()
+        if config.profiler:
+            self.start_profiler()
+
+    async def disconnect(self) -> None:
+        if self.profiler is not None:
+            self.stop_profiler()
+        if not self.is_running:
+            return
+        self.is_running = False
+        self.lag_task.cancel()
+        self.watchdog.join()
+
+    async def sample_lag(self):
+        interval = self.app.config.monitoring.lag_interval
+        while 1:
+            start = time.monotonic()
+            await asyncio.sleep(interval)
+            self.heartbeat = time.monotonic()
+            loop_lag_seconds.observe(max(0.0, self.heartbeat - start - interval))
+
+    def watch(self):
+        config = self.app.config.monitoring
+        threshold = config.lag_interval + config.slow_callback
+        reported = None
+        while self.is_running:
+            time.sleep(config.slow_callback / 2)
+            heartbeat = self.heartbeat
+            if time.monotonic() - heartbeat <= threshold or heartbeat == reported:
+                continue
+            reported = heartbeat
+            slow_callbacks.inc()
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            logger.warning("event loop is blocked for more than %.3fs:\n%s", config.slow_callback, stack)
+
+    def start_profiler(self) -> bool:
+        if self.profiler is not None:
+            return False
+        self.profiler = StackProfiler(self.loop_thread_id, self.app.config.monitoring.profiler_interval)
+        self.profiler.start()
+        logger.info("profiler started")
+        return True
+
+    def stop_profiler(self) -> Optional[pathlib.Path]:
+        """
+        Returns the file with folded stacks.
+        """
+        if self.profiler is None:
+            return None
+        self.profiler.stop()
+        filename = pathlib.Path(self.app.config.monitoring.profile_dir) / f"{time.strftime('%Y%m%d-%H%M%S')}.folded"
+        self.profiler.dump(filename)
+        self.profiler = None
+        logger.info("profiler stopped, stacks saved to %s", filename)
+        return filename
+
+
+def setup_monitor(app: "Application") -> None:
+    app.monitor = LoopMonitor(app)
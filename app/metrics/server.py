@@ -0,0 +1,51 @@
+import typing
+
+from aiohttp import web
+
+from app.base.accessor import BaseAccessor
+from app.database.database import Database
+from app.metrics import registry, db_pool_connections
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class MetricsServer(BaseAccessor):
+    """
+    Serves GET /metrics in the Prometheus text format.
+    """
+    dependencies = (Database,)
+    instrumented = False
+    runner: typing.Optional[web.AppRunner] = None
+
+    async def connect(self) -> None:
+        config = self.app.config.metrics
+        if not config.enabled:
+            return
+        registry.add_collector(self.collect_pool_stats)
+
+        web_app = web.Application()
+        web_app.router.add_get("/metrics", self.handle)
+        self.runner = web.AppRunner(web_app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, config.host, config.port).start()
+
+    async def disconnect(self) -> None:
+        if self.runner is None:
+            return
+        await self.runner.cleanup()
+        registry.remove_collector(self.collect_pool_stats)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(text=registry.expose(), content_type="text/plain")
+
+    def collect_pool_stats(self) -> None:
+        stats = self.app.store.database.pool_stats()
+        db_pool_connections.set(stats.size, state="open")
+        db_pool_connections.set(stats.idle, state="idle")
+        db_pool_connections.set(stats.acquired, state="acquired")
+        db_pool_connections.set(stats.waiting, state="waiting")
+
+
+def setup_metrics(app: "Application") -> None:
+    app.metrics = MetricsServer(app)
@@ -3,8 +3,12 @@ from dataclasses import dataclass
 
 from app.database.database import Database
 from app.store.users.accessor import UserAccessor
+from app.store.users.archive import UserWordArchiver
+from app.store.users.events import ReviewLog
 from app.store.words.accessor import WordAccessor
-from app.web.parser import YandexTranslator
+from app.store.words.importer import WordImporter
+from app.store.words.index import WordIndex
+from app.web.translator import Translator, create_translator
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
@@ -15,7 +19,11 @@ class Store:
     database: Database
     users: UserAccessor
     words: WordAccessor
-    translator: YandexTranslator
+    word_index: WordIndex
+    translator: Translator
+    importer: WordImporter
+    review_log: ReviewLog
+    archiver: UserWordArchiver
 
 
 def setup_store(app: "Application") -> None:
@@ -23,5 +31,9 @@ def setup_store(app: "Application") -> None:
         database=Database(app),
         users=UserAccessor(app),
         words=WordAccessor(app),
-        translator=YandexTranslator(app),
+        word_index=WordIndex(app),
+        translator=create_translator(app),
+        importer=WordImporter(app),
+        review_log=ReviewLog(app),
+        archiver=UserWordArchiver(app),
     )
@@ -1,23 +1,32 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Optional
 
+from asyncpg import Record
 from sqlalchemy import and_, or_
 from sqlalchemy.dialects.postgresql import insert
 
 from app.base.accessor import BaseAccessor
+from app.database.database import Database
+from app.database.replicas import reads, writes
+from app.store.users import queries
 from app.store.users.models import UserDC, UserWordDC, UserModel, UserWordModel, UserLangDC, UserLangModel
+from app.store.users.scheduler import DAY, ReviewState, Scheduler, create_scheduler, replan_batch
 from app.utils import now
 
-recall_delay = {
-    0: timedelta(days=1),
-    1: timedelta(days=3),
-    2: timedelta(days=7),
-    3: timedelta(days=30),
-    4: timedelta(days=90),
-}
+
+class Reminders:
+    # sorted set of user ids by the time of the earliest word to recall
+    due = "reminders_due"
 
 
 class UserAccessor(BaseAccessor):
+    dependencies = (Database,)
+    scheduler: Scheduler
+
+    async def connect(self) -> None:
+        self.scheduler = create_scheduler(self.app.config.scheduler)
 
+    @writes
     async def add_user(self, user: UserDC) -> UserDC:
         stmt = insert(UserModel).values(**user.as_dict())
         model: UserModel = await stmt.on_conflict_do_update(
@@ -34,6 +43,7 @@ class UserAccessor(BaseAccessor):
         users: list[UserModel] = await UserModel.query.gino.all()
         return [i.as_dataclass() for i in users]
 
+    @writes
     async def add_user_lang(self, user_lang: UserLangDC) -> UserLangDC:
         stmt = insert(UserLangModel).values(**user_lang.as_dict())
         model: UserLangModel = await stmt.on_conflict_do_update(
@@ -42,13 +52,22 @@ class UserAccessor(BaseAccessor):
         ).returning(*UserLangModel).gino.model(UserLangModel).first()
         return model.as_dataclass()
 
+    @reads
     async def get_user_langs(self, user_id: int) -> list[UserLangDC]:
         models: list[UserLangModel] = await UserLangModel.query \
             .where(UserLangModel.user_id == user_id) \
             .gino.all()
         return [i.as_dataclass() for i in models]
 
+    @writes
     async def add_user_word(self, user_word: UserWordDC) -> UserWordDC:
+        """
+        An archived word is restored with its progress.
+        """
+        restored_due = await self.app.store.database.fetchval(queries.RESTORE_USER_WORDS,
+                                                              user_word.user_id, [user_word.word_id])
+        if restored_due is not None:
+            await self.schedule_reminder(user_word.user_id, restored_due)
         stmt = insert(UserWordModel).values(**user_word.as_dict())
         model: UserWordModel = await stmt.on_conflict_do_update(
             index_elements=[UserWordModel.user_id, UserWordModel.word_id],
@@ -56,37 +75,38 @@ class UserAccessor(BaseAccessor):
         ).returning(*UserWordModel).gino.model(UserWordModel).first()
         return model.as_dataclass()
 
+    @writes
+    async def add_user_words(self, user_words: list[UserWordDC]) -> list[int]:
+        """
+        Returns word ids which were not added before, archived words are restored.
+        """
+        if not user_words:
+            return []
+        database = self.app.store.database
+        for user_id in {i.user_id for i in user_words}:
+            word_ids = [i.word_id for i in user_words if i.user_id == user_id]
+            restored_due = await database.fetchval(queries.RESTORE_USER_WORDS, user_id, word_ids)
+            if restored_due is not None:
+                await self.schedule_reminder(user_id, restored_due)
+        stmt = insert(UserWordModel).values([i.as_dict() for i in user_words])
+        rows = await stmt.on_conflict_do_nothing(
+            index_elements=[UserWordModel.user_id, UserWordModel.word_id],
+        ).returning(UserWordModel.word_id).gino.all()
+        return [i[0] for i in rows]
+
+    @reads
     async def count_user_words(self, user_id: int, translation_code: str) -> int:
-        db = self.app.store.database.db
-        return await db.select([db.func.count()]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code)) \
-            .gino.scalar()
+        return await self.app.store.database.fetchval(queries.COUNT_USER_WORDS, user_id, translation_code)
 
+    @reads
     async def count_to_remember_user_words(self, user_id: int, translation_code: str) -> int:
-        db = self.app.store.database.db
-        return await db.select([db.func.count()]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code,
-                        UserWordModel.remembered_at == None)) \
-            .gino.scalar()
+        return await self.app.store.database.fetchval(queries.COUNT_TO_REMEMBER, user_id, translation_code)
 
+    @reads
     async def count_to_recall_user_words(self, user_id: int, translation_code: str) -> int:
-        db = self.app.store.database.db
-        n_show_originals = await db.select([db.func.count()]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code,
-                        UserWordModel.remembered_at != None,
-                        UserWordModel.next_show_original <= now())) \
-            .gino.scalar()
-        n_show_translations = await db.select([db.func.count()]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code,
-                        UserWordModel.remembered_at != None,
-                        UserWordModel.next_show_translation <= now())) \
-            .gino.scalar()
-        return n_show_originals + n_show_translations
+        return await self.app.store.database.fetchval(queries.COUNT_TO_RECALL, user_id, translation_code, now())
 
+    @reads
     async def get_user_words(self, user_id: int, translation_code: str) -> list[UserWordDC]:
         user_words: list[UserWordModel] = await UserWordModel.query \
             .where(and_(UserWordModel.user_id == user_id,
@@ -94,55 +114,81 @@ class UserAccessor(BaseAccessor):
             .gino.all()
         return [i.as_dataclass() for i in user_words]
 
+    @writes
     async def set_remembered(self, user_id: int, word_id: int) -> UserWordDC:
+        state = self.scheduler.initial_state()
+        next_show = now() + timedelta(days=self.scheduler.interval(state))
         model: UserWordModel = await UserWordModel.update \
             .values(remembered_at=now(),
-                    next_show_original=now() + recall_delay[0],
-                    next_show_translation=now() + recall_delay[0] + timedelta(days=1)) \
+                    next_show_original=next_show,
+                    next_show_translation=next_show + timedelta(days=1),
+                    ease_original=state.ease,
+                    ease_translation=state.ease,
+                    stability_original=state.stability,
+                    stability_translation=state.stability) \
             .where(and_(UserWordModel.user_id == user_id,
                         UserWordModel.word_id == word_id)) \
             .returning(*UserWordModel) \
             .gino.first()
+        await self.schedule_reminder(user_id, model.next_show_original)
         return model.as_dataclass()
 
+    def _review(self, user_word: Record, direction: str) -> tuple[ReviewState, datetime]:
+        """
+        Next state and show time of one direction ("original" or "translation") after a recall.
+        """
+        state = ReviewState(n_shown=user_word[f"n_shown_{direction}"],
+                            ease=user_word[f"ease_{direction}"],
+                            stability=user_word[f"stability_{direction}"])
+        current_time = now()
+        previous_review = user_word[f"next_show_{direction}"] - timedelta(days=self.scheduler.interval(state))
+        elapsed = (current_time - previous_review).total_seconds() / DAY
+        state = self.scheduler.review(state, elapsed)
+        return state, current_time + timedelta(days=self.scheduler.interval(state))
+
+    @writes
     async def set_shown_original(self, user_id: int, word_id: int) -> UserWordDC:
-        user_word: UserWordModel = await UserWordModel.query \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.word_id == word_id)) \
-            .gino.first()
+        user_word = await self.app.store.database.fetchrow(queries.REVIEW_STATE, user_id, word_id)
 
-        n_shown_original = user_word.n_shown_original + 1
-        next_show_original = now() + recall_delay[n_shown_original]
+        state, next_show_original = self._review(user_word, "original")
         model: UserWordModel = await UserWordModel.update \
             .values(next_show_original=next_show_original,
-                    n_shown_original=n_shown_original) \
-            .where(UserWordModel.id == user_word.id) \
+                    n_shown_original=state.n_shown,
+                    ease_original=state.ease,
+                    stability_original=state.stability) \
+            .where(and_(UserWordModel.user_id == user_id,
+                        UserWordModel.id == user_word["id"])) \
             .returning(*UserWordModel) \
             .gino.first()
+        await self.schedule_reminder(user_id, next_show_original)
         return model.as_dataclass()
 
+    @writes
     async def set_shown_translation(self, user_id: int, word_id: int) -> UserWordDC:
-        user_word: UserWordModel = await UserWordModel.query \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.word_id == word_id)) \
-            .gino.first()
+        user_word = await self.app.store.database.fetchrow(queries.REVIEW_STATE, user_id, word_id)
 
-        n_shown_translation = user_word.n_shown_translation + 1
-        next_show_translation = now() + recall_delay[n_shown_translation]
+        state, next_show_translation = self._review(user_word, "translation")
         model: UserWordModel = await UserWordModel.update \
             .values(next_show_translation=next_show_translation,
-                    n_shown_translation=n_shown_translation) \
-            .where(UserWordModel.id == user_word.id) \
+                    n_shown_translation=state.n_shown,
+                    ease_translation=state.ease,
+                    stability_translation=state.stability) \
+            .where(and_(UserWordModel.user_id == user_id,
+                        UserWordModel.id == user_word["id"])) \
             .returning(*UserWordModel) \
             .gino.first()
+        await self.schedule_reminder(user_id, next_show_translation)
         return model.as_dataclass()
 
+    @writes
     async def delete_word(self, user_id: int, word_id: int) -> None:
         await UserWordModel.delete \
             .where(and_(UserWordModel.user_id == user_id,
                         UserWordModel.word_id == word_id)) \
             .gino.status()
+        await self.app.store.database.fetchval(queries.DELETE_ARCHIVED_WORD, user_id, word_id)
 
+    @reads
     async def get_words_to_remember(self, user_id: int, translation_code: str) -> list[UserWordDC]:
         user_words: list[UserWordModel] = await UserWordModel.query \
             .where(and_(UserWordModel.user_id == user_id,
@@ -151,6 +197,7 @@ class UserAccessor(BaseAccessor):
             .gino.all()
         return [i.as_dataclass() for i in user_words]
 
+    @reads
     async def get_words_to_recall(self, user_id: int, translation_code: str) -> list[UserWordDC]:
         user_words: list[UserWordModel] = await UserWordModel.query \
             .where(and_(UserWordModel.user_id == user_id,
@@ -161,39 +208,122 @@ class UserAccessor(BaseAccessor):
             .gino.all()
         return [i.as_dataclass() for i in user_words]
 
+    @reads
     async def get_ids_user_words(self, user_id: int, translation_code: str) -> list[int]:
-        result = await self.app.store.database.db \
-            .select([UserWordModel.word_id]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code)) \
-            .gino.all()
+        result = await self.app.store.database.fetch(queries.IDS_USER_WORDS, user_id, translation_code)
         return [i[0] for i in result]
 
+    @reads
     async def get_ids_words_to_remember(self, user_id: int, translation_code: str) -> list[int]:
-        result = await self.app.store.database.db \
-            .select([UserWordModel.word_id]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code,
-                        UserWordModel.remembered_at == None)) \
-            .gino.all()
+        result = await self.app.store.database.fetch(queries.IDS_TO_REMEMBER, user_id, translation_code)
         return [i[0] for i in result]
 
+    @reads
     async def get_ids_original_words_to_recall(self, user_id: int, translation_code: str) -> list[int]:
-        result = await self.app.store.database.db \
-            .select([UserWordModel.word_id]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code,
-                        UserWordModel.remembered_at != None,
-                        UserWordModel.next_show_original <= now())) \
-            .gino.all()
+        result = await self.app.store.database.fetch(queries.IDS_ORIGINAL_TO_RECALL,
+                                                     user_id, translation_code, now())
         return [i[0] for i in result]
 
+    @reads
     async def get_ids_translation_words_to_recall(self, user_id: int, translation_code: str) -> list[int]:
-        result = await self.app.store.database.db \
-            .select([UserWordModel.word_id]) \
-            .where(and_(UserWordModel.user_id == user_id,
-                        UserWordModel.translation_code == translation_code,
-                        UserWordModel.remembered_at != None,
-                        UserWordModel.next_show_translation <= now())) \
-            .gino.all()
+        result = await self.app.store.database.fetch(queries.IDS_TRANSLATION_TO_RECALL,
+                                                     user_id, translation_code, now())
         return [i[0] for i in result]
+
+    @reads
+    async def get_session_to_remember(self,
+                                      user_id: int,
+                                      translation_code: str,
+                                      seed: Optional[int],
+                                      after: Optional[tuple[int, bool]],
+                                      limit: int) -> list[tuple[int, bool]]:
+        """
+        The next chunk of (word_id, swap) to remember after the cursor, see queries.SESSION_TO_REMEMBER.
+        """
+        word_id = after[0] if after else None
+        result = await self.app.store.database.fetch(queries.SESSION_TO_REMEMBER,
+                                                     user_id, translation_code, seed, word_id, limit)
+        return [(i[0], i[1]) for i in result]
+
+    @reads
+    async def get_session_to_recall(self,
+                                    user_id: int,
+                                    translation_code: str,
+                                    seed: Optional[int],
+                                    after: Optional[tuple[int, bool]],
+                                    limit: int,
+                                    until: datetime) -> list[tuple[int, bool]]:
+        """
+        The next chunk of (word_id, swap) due until the given time, see queries.SESSION_TO_RECALL.
+        """
+        word_id, swap = after or (None, False)
+        result = await self.app.store.database.fetch(queries.SESSION_TO_RECALL,
+                                                     user_id, translation_code, seed, word_id, swap, limit, until)
+        return [(i[0], i[1]) for i in result]
+
+    async def schedule_reminder(self, user_id: int, due: datetime) -> None:
+        """
+        Moves the reminder of the user to an earlier time only (ZADD LT, Redis 6.2+).
+        Later times are set by the reminder sender, which rechecks the database anyway.
+        """
+        if not self.app.config.reminders.enabled:
+            return
+        await self.app.store.database.redis.execute_command("ZADD", Reminders.due, "LT", due.timestamp(), user_id)
+
+    async def set_reminder(self, user_id: int, due: Optional[datetime]) -> None:
+        redis = self.app.store.database.redis
+        if due is None:
+            await redis.zrem(Reminders.due, user_id)
+        else:
+            await redis.zadd(Reminders.due, {user_id: due.timestamp()})
+
+    async def get_due_reminders(self, until: datetime, limit: int) -> list[int]:
+        result = await self.app.store.database.redis.zrangebyscore(Reminders.due, "-inf", until.timestamp(),
+                                                                   start=0, num=limit)
+        return [int(i) for i in result]
+
+    @reads
+    async def get_next_due(self, user_id: int, after: datetime) -> Optional[datetime]:
+        return await self.app.store.database.fetchval(queries.NEXT_DUE, user_id, after)
+
+    async def rebuild_reminders(self) -> int:
+        """
+        Fills the reminders from user_words, e.g. for the first start.
+        """
+        rows = await self.app.store.database.fetch(queries.DUE_TIMES)
+        redis = self.app.store.database.redis
+        await redis.delete(Reminders.due)
+        for i in range(0, len(rows), 1000):
+            await redis.zadd(Reminders.due, {user_id: due.timestamp() for user_id, due in rows[i:i + 1000]})
+        return len(rows)
+
+    async def replan_reviews(self, old: Scheduler, batch_size: int = 100_000) -> int:
+        """
+        Recomputes next_show_* of remembered words, archived ones included,
+        after config.scheduler is changed from the old one.
+        Rows are read as arrays and computed with NumPy, batch by batch by primary key.
+        """
+        import numpy as np
+
+        database = self.app.store.database
+        n_replanned = 0
+        for table in queries.REVIEW_STATE_KEYS:
+            last_user_id, last_id = 0, 0
+            while 1:
+                batch = await database.fetchrow(queries.REVIEW_STATES_BATCH[table], last_user_id, last_id, batch_size)
+                if batch["ids"] is None:
+                    break
+                values = []
+                for direction in ("original", "translation"):
+                    due, stability = replan_batch(old, self.scheduler,
+                                                  due=np.array(batch[f"due_{direction}"], dtype=np.float64),
+                                                  n_shown=np.array(batch[f"n_shown_{direction}"], dtype=np.int64),
+                                                  ease=np.array(batch[f"ease_{direction}"], dtype=np.float64),
+                                                  stability=np.array(batch[f"stability_{direction}"],
+                                                                     dtype=np.float64))
+                    values.extend([due.tolist(), stability.tolist()])
+                await database.fetchval(queries.UPDATE_REVIEW_STATES[table], batch["user_ids"], batch["ids"], *values)
+                n_replanned += len(batch["ids"])
+                last_user_id, last_id = batch["user_ids"][-1], batch["ids"][-1]
+        await self.rebuild_reminders()
+        return n_replanned
@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.database.database import Database
+from app.logger import logger
+from app.store.users import queries
+from app.store.users.accessor import UserAccessor
+from app.utils import now
+
+
+class UserWordArchiver(BaseAccessor):
+    """
+    Keeps the working set of user_words small. Mastered words which are not due for
+    archive.archive_after days are moved in batches to user_words_archive and back
+    archive.restore_before days before they are due, or at once when the user adds
+    the word again (UserAccessor.add_user_word). Counts and word ids of a user include archived words.
+    """
+    dependencies = (Database, UserAccessor)
+    instrumented = False
+    task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        if self.app.background:
+            self.task = asyncio.create_task(self.run())
+
+    async def disconnect(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+
+    async def run(self) -> None:
+        """
+        Due words are restored even when archiving is disabled, so they are not lost for recall.
+        """
+        while 1:
+            await asyncio.sleep(self.app.config.archive.interval)
+            try:
+                n_restored = await self.restore_due()
+                n_archived = await self.archive() if self.app.config.archive.enabled else 0
+                if n_restored or n_archived:
+                    logger.info("user words: %s archived, %s restored", n_archived, n_restored)
+            except Exception as e:
+                logger.exception(e)
+
+    async def archive(self) -> int:
+        config = self.app.config.archive
+        database = self.app.store.database
+        after = now() + timedelta(days=config.archive_after)
+        n_archived = 0
+        last_user_id, last_id = 0, 0
+        while 1:
+            batch = await database.fetchrow(queries.ARCHIVE_BATCH, last_user_id, last_id,
+                                            after, config.min_shown, config.batch_size)
+            if batch["user_id"] is None:
+                return n_archived
+            n_archived += batch["n"]
+            last_user_id, last_id = batch["user_id"], batch["id"]
+
+    async def restore_due(self) -> int:
+        config = self.app.config.archive
+        database = self.app.store.database
+        until = now() + timedelta(days=config.restore_before)
+        n_restored = 0
+        while 1:
+            rows = await database.fetch(queries.RESTORE_DUE_BATCH, until, config.batch_size)
+            for user_id, due, _ in rows:
+                await self.app.store.users.schedule_reminder(user_id, due)
+            n_batch = sum(i["n"] for i in rows)
+            n_restored += n_batch
+            if n_batch < config.batch_size:
+                return n_restored
@@ -0,0 +1,106 @@
+import asyncio
+import time
+import typing
+from contextlib import suppress
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.database.database import Database
+from app.logger import logger
+from app.store.users.models import ReviewEventDC, ReviewEventModel
+from app.utils import now
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class ReviewDirection:
+    original = "original"  # the original is shown, the translation is asked
+    translation = "translation"
+
+
+class ReviewOutcome:
+    remembered = "remembered"  # a new word is learned
+    recalled = "recalled"
+    forgotten = "forgotten"  # a due word is skipped
+    skipped = "skipped"  # a new word is skipped
+    deleted = "deleted"
+
+
+class ReviewLog(BaseAccessor):
+    """
+    Append-only history of answers for tuning the scheduler.
+    Events are buffered in memory and written with COPY every review_log.flush_interval
+    seconds or review_log.flush_size events, and on disconnect,
+    so answering a question does not wait for one more insert.
+    """
+    dependencies = (Database,)
+    instrumented = False
+    columns = ["user_id", "word_id", "direction", "outcome", "latency", "created_at"]
+    task: Optional[asyncio.Task] = None
+
+    def __init__(self, app: "Application"):
+        super().__init__(app)
+        self.buffer: list[ReviewEventDC] = []
+        self.shown_at: dict[int, float] = {}
+        self.full = asyncio.Event()
+
+    async def connect(self) -> None:
+        if self.app.config.review_log.enabled:
+            self.task = asyncio.create_task(self.run())
+
+    async def disconnect(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+        await self.flush()
+
+    async def run(self) -> None:
+        config = self.app.config.review_log
+        while 1:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.full.wait(), config.flush_interval)
+            self.full.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception(e)
+
+    def show(self, user_id: int) -> None:
+        """
+        Called when a question is shown, the latency of the next answer is counted from here.
+        """
+        self.shown_at[user_id] = time.monotonic()
+
+    def add(self, user_id: int, word_id: int, direction: str, outcome: str) -> None:
+        shown_at = self.shown_at.pop(user_id, None)
+        config = self.app.config.review_log
+        if not config.enabled:
+            return
+        self.buffer.append(ReviewEventDC(user_id=user_id,
+                                         word_id=word_id,
+                                         direction=direction,
+                                         outcome=outcome,
+                                         latency=None if shown_at is None else time.monotonic() - shown_at,
+                                         created_at=now()))
+        if len(self.buffer) >= config.flush_size:
+            self.full.set()
+
+    async def flush(self) -> int:
+        if not self.buffer:
+            return 0
+        events, self.buffer = self.buffer, []
+        try:
+            await self.app.store.database.copy_records(ReviewEventModel.__tablename__,
+                                                       records=[i.as_tuple() for i in events],
+                                                       columns=self.columns)
+        except BaseException:
+            # kept for the next flush, the oldest are dropped if the database is down for long
+            self.buffer[:0] = events
+            n_dropped = len(self.buffer) - self.app.config.review_log.max_buffer
+            if n_dropped > 0:
+                del self.buffer[:n_dropped]
+                logger.warning("%s review events are dropped", n_dropped)
+            raise
+        return len(events)
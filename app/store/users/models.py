@@ -91,6 +91,10 @@ class UserWordDC:
     next_show_translation: Optional[datetime] = None
     n_shown_original: int = 0
     n_shown_translation: int = 0
+    ease_original: float = 2.5
+    ease_translation: float = 2.5
+    stability_original: float = 1.0
+    stability_translation: float = 1.0
     id: Optional[int] = None
 
     def as_model(self) -> "UserWordModel":
@@ -102,7 +106,11 @@ class UserWordDC:
                              next_show_original=self.next_show_original,
                              next_show_translation=self.next_show_translation,
                              n_shown_original=self.n_shown_original,
-                             n_shown_translation=self.n_shown_translation)
+                             n_shown_translation=self.n_shown_translation,
+                             ease_original=self.ease_original,
+                             ease_translation=self.ease_translation,
+                             stability_original=self.stability_original,
+                             stability_translation=self.stability_translation)
 
     def as_dict(self) -> dict:
         result = asdict(self)
@@ -112,8 +120,10 @@ class UserWordDC:
 
 class UserWordModel(db.Model):
     __tablename__ = "user_words"
+    # see app.database.partitioning, every query has to filter by user_id to touch one partition
+    __table_args__ = dict(postgresql_partition_by="HASH (user_id)", info=dict(partitions=16))
 
-    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    id = db.Column(db.Integer, autoincrement=True)
     user_id = db.Column(db.ForeignKey(UserModel.id, ondelete="CASCADE"), nullable=False)
     translation_code = db.Column(db.String, nullable=False)
     word_id = db.Column(db.ForeignKey(WordModel.id, ondelete="CASCADE"), nullable=False)
@@ -123,7 +133,12 @@ class UserWordModel(db.Model):
     next_show_translation = db.Column(db.DateTime(timezone=True), nullable=True)
     n_shown_original = db.Column(db.Integer, nullable=False)
     n_shown_translation = db.Column(db.Integer, nullable=False)
+    ease_original = db.Column(db.Float, nullable=False, server_default="2.5")
+    ease_translation = db.Column(db.Float, nullable=False, server_default="2.5")
+    stability_original = db.Column(db.Float, nullable=False, server_default="1.0")
+    stability_translation = db.Column(db.Float, nullable=False, server_default="1.0")
 
+    _primary_key = db.PrimaryKeyConstraint("user_id", "id")
     _unique_constraint = db.UniqueConstraint("user_id", "word_id")
 
     def as_dataclass(self) -> UserWordDC:
@@ -136,4 +151,71 @@ class UserWordModel(db.Model):
                           next_show_translation=self.next_show_translation,
                           n_shown_original=self.n_shown_original,
                           n_shown_translation=self.n_shown_translation,
+                          ease_original=self.ease_original,
+                          ease_translation=self.ease_translation,
+                          stability_original=self.stability_original,
+                          stability_translation=self.stability_translation,
                           id=self.id)
+
+
+class UserWordArchiveModel(db.Model):
+    """
+    Mastered user_words which are not due for a long time, see UserWordArchiver.
+    Only the primary key is indexed besides the due time, the rows are read back as they are.
+    """
+    __tablename__ = "user_words_archive"
+
+    id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.ForeignKey(UserModel.id, ondelete="CASCADE"), primary_key=True)
+    translation_code = db.Column(db.String, nullable=False)
+    word_id = db.Column(db.ForeignKey(WordModel.id, ondelete="CASCADE"), primary_key=True)
+    added_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    remembered_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    next_show_original = db.Column(db.DateTime(timezone=True), nullable=True)
+    next_show_translation = db.Column(db.DateTime(timezone=True), nullable=True)
+    n_shown_original = db.Column(db.Integer, nullable=False)
+    n_shown_translation = db.Column(db.Integer, nullable=False)
+    ease_original = db.Column(db.Float, nullable=False)
+    ease_translation = db.Column(db.Float, nullable=False)
+    stability_original = db.Column(db.Float, nullable=False)
+    stability_translation = db.Column(db.Float, nullable=False)
+
+    _idx1 = db.Index("user_words_archive_idx_due", db.func.least(next_show_original, next_show_translation))
+
+
+@dataclass
+class ReviewEventDC:
+    user_id: int
+    word_id: int
+    direction: str  # ReviewDirection
+    outcome: str  # ReviewOutcome
+    latency: Optional[float]  # seconds from showing the question to the answer
+    created_at: datetime
+    id: Optional[int] = None
+
+    def as_tuple(self) -> tuple:
+        return self.user_id, self.word_id, self.direction, self.outcome, self.latency, self.created_at
+
+
+class ReviewEventModel(db.Model):
+    __tablename__ = "review_events"
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    # no foreign keys: buffered events of a deleted user or word must not fail the whole batch
+    user_id = db.Column(db.Integer, nullable=False)
+    word_id = db.Column(db.Integer, nullable=False)
+    direction = db.Column(db.String, nullable=False)
+    outcome = db.Column(db.String, nullable=False)
+    latency = db.Column(db.Float, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    _idx1 = db.Index("review_events_idx_user_id_created_at", "user_id", "created_at")
+
+    def as_dataclass(self) -> ReviewEventDC:
+        return ReviewEventDC(user_id=self.user_id,
+                             word_id=self.word_id,
+                             direction=self.direction,
+                             outcome=self.outcome,
+                             latency=self.latency,
+                             created_at=self.created_at,
+                             id=self.id)
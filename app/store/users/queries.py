@@ -0,0 +1,209 @@
+"""
+Hot queries of UserAccessor as constant SQL, prepared once per connection
+(see Database.fetch). user_words is partitioned by user_id, so queries of a user
+filter by it, the rest (DUE_TIMES, REVIEW_STATES_BATCH) are maintenance jobs over all partitions.
+"""
+
+COUNT_TO_REMEMBER = """
+SELECT count(*) FROM user_words
+WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NULL
+"""
+
+COUNT_TO_RECALL = """
+SELECT count(*) FILTER (WHERE next_show_original <= $3)
+     + count(*) FILTER (WHERE next_show_translation <= $3)
+FROM user_words
+WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NOT NULL
+"""
+
+# words of a user include archived ones, see UserWordArchiver
+COUNT_USER_WORDS = """
+SELECT (SELECT count(*) FROM user_words WHERE user_id = $1 AND translation_code = $2)
+     + (SELECT count(*) FROM user_words_archive WHERE user_id = $1 AND translation_code = $2)
+"""
+
+IDS_USER_WORDS = """
+SELECT word_id FROM user_words
+WHERE user_id = $1 AND translation_code = $2
+UNION ALL
+SELECT word_id FROM user_words_archive
+WHERE user_id = $1 AND translation_code = $2
+"""
+
+IDS_TO_REMEMBER = """
+SELECT word_id FROM user_words
+WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NULL
+"""
+
+IDS_ORIGINAL_TO_RECALL = """
+SELECT word_id FROM user_words
+WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NOT NULL
+  AND next_show_original <= $3
+"""
+
+IDS_TRANSLATION_TO_RECALL = """
+SELECT word_id FROM user_words
+WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NOT NULL
+  AND next_show_translation <= $3
+"""
+
+# Sessions are read in chunks after a keyset cursor (word_id, swap) of the previous chunk.
+# The order is random per seed ($3): hashing is stable, so the next chunk continues
+# the same order without keeping the whole list. A NULL seed means the order of word ids.
+# $4 (and $5 for recall) - the cursor, NULL for the first chunk.
+SESSION_TO_REMEMBER = """
+SELECT word_id, false AS swap FROM user_words
+WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NULL
+  AND ($4::integer IS NULL
+       OR (coalesce(hashint8extended(word_id * 2, $3), word_id * 2), word_id)
+        > (coalesce(hashint8extended($4::bigint * 2, $3), $4::bigint * 2), $4))
+ORDER BY coalesce(hashint8extended(word_id * 2, $3), word_id * 2), word_id
+LIMIT $5
+"""
+
+# both directions of due words: (word_id, false) - the original is asked, (word_id, true) - the translation
+SESSION_TO_RECALL = """
+SELECT word_id, swap FROM (
+    SELECT word_id, false AS swap FROM user_words
+    WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NOT NULL AND next_show_original <= $7
+    UNION ALL
+    SELECT word_id, true AS swap FROM user_words
+    WHERE user_id = $1 AND translation_code = $2 AND remembered_at IS NOT NULL AND next_show_translation <= $7
+) AS due
+WHERE $4::integer IS NULL
+   OR (coalesce(hashint8extended(word_id * 2 + swap::integer, $3), word_id * 2 + swap::integer), word_id, swap)
+    > (coalesce(hashint8extended($4::bigint * 2 + $5::boolean::integer, $3), $4::bigint * 2 + $5::boolean::integer),
+       $4, $5::boolean)
+ORDER BY coalesce(hashint8extended(word_id * 2 + swap::integer, $3), word_id * 2 + swap::integer), word_id, swap
+LIMIT $6
+"""
+
+REVIEW_STATE = """
+SELECT id, n_shown_original, n_shown_translation, ease_original, ease_translation,
+       stability_original, stability_translation, next_show_original, next_show_translation
+FROM user_words
+WHERE user_id = $1 AND word_id = $2
+"""
+
+NEXT_DUE = """
+SELECT least(min(next_show_original) FILTER (WHERE next_show_original > $2),
+             min(next_show_translation) FILTER (WHERE next_show_translation > $2))
+FROM user_words
+WHERE user_id = $1 AND remembered_at IS NOT NULL
+"""
+
+DUE_TIMES = """
+SELECT user_id, least(min(next_show_original), min(next_show_translation)) FROM user_words
+WHERE remembered_at IS NOT NULL
+GROUP BY user_id
+"""
+
+# Review states are replanned in user_words and user_words_archive, each is read by its primary key:
+# (user_id, id) and (user_id, word_id).
+REVIEW_STATE_KEYS = {"user_words": "id", "user_words_archive": "word_id"}
+
+_REVIEW_STATES_BATCH = """
+SELECT array_agg(user_id ORDER BY user_id, {key}) AS user_ids,
+       array_agg({key} ORDER BY user_id, {key}) AS ids,
+       array_agg(n_shown_original ORDER BY user_id, {key}) AS n_shown_original,
+       array_agg(n_shown_translation ORDER BY user_id, {key}) AS n_shown_translation,
+       array_agg(ease_original ORDER BY user_id, {key}) AS ease_original,
+       array_agg(ease_translation ORDER BY user_id, {key}) AS ease_translation,
+       array_agg(stability_original ORDER BY user_id, {key}) AS stability_original,
+       array_agg(stability_translation ORDER BY user_id, {key}) AS stability_translation,
+       array_agg(extract(epoch FROM next_show_original)::float8 ORDER BY user_id, {key}) AS due_original,
+       array_agg(extract(epoch FROM next_show_translation)::float8 ORDER BY user_id, {key}) AS due_translation
+FROM (
+    SELECT * FROM {table}
+    WHERE (user_id, {key}) > ($1, $2) AND remembered_at IS NOT NULL
+    ORDER BY user_id, {key}
+    LIMIT $3
+) AS batch
+"""
+
+_UPDATE_REVIEW_STATES = """
+UPDATE {table}
+SET next_show_original = to_timestamp(batch.due_original),
+    stability_original = batch.stability_original,
+    next_show_translation = to_timestamp(batch.due_translation),
+    stability_translation = batch.stability_translation
+FROM unnest($1::integer[], $2::integer[], $3::float8[], $4::float8[], $5::float8[], $6::float8[])
+    AS batch(user_id, id, due_original, stability_original, due_translation, stability_translation)
+WHERE {table}.user_id = batch.user_id AND {table}.{key} = batch.id
+"""
+
+REVIEW_STATES_BATCH = {table: _REVIEW_STATES_BATCH.format(table=table, key=key)
+                       for table, key in REVIEW_STATE_KEYS.items()}
+UPDATE_REVIEW_STATES = {table: _UPDATE_REVIEW_STATES.format(table=table, key=key)
+                        for table, key in REVIEW_STATE_KEYS.items()}
+
+# Archiving moves rows between user_words and user_words_archive in one statement.
+# Columns are listed, because their order may differ after migrations.
+USER_WORD_COLUMNS = """
+id, user_id, translation_code, word_id, added_at, remembered_at, next_show_original, next_show_translation,
+n_shown_original, n_shown_translation, ease_original, ease_translation, stability_original, stability_translation
+"""
+
+# $1, $2 - the keyset cursor (user_id, id), $3 - rows due later are archived, $4 - min n_shown_*, $5 - limit
+ARCHIVE_BATCH = f"""
+WITH batch AS (
+    SELECT user_id, id FROM user_words
+    WHERE (user_id, id) > ($1, $2) AND remembered_at IS NOT NULL
+      AND least(next_show_original, next_show_translation) > $3
+      AND n_shown_original >= $4 AND n_shown_translation >= $4
+    ORDER BY user_id, id
+    LIMIT $5
+    FOR UPDATE SKIP LOCKED
+), moved AS (
+    DELETE FROM user_words
+    WHERE (user_id, id) IN (SELECT user_id, id FROM batch)
+    RETURNING {USER_WORD_COLUMNS}
+), archived AS (
+    INSERT INTO user_words_archive ({USER_WORD_COLUMNS})
+    SELECT {USER_WORD_COLUMNS} FROM moved
+    ON CONFLICT DO NOTHING
+)
+SELECT count(*) AS n, (SELECT user_id FROM batch ORDER BY user_id DESC, id DESC LIMIT 1) AS user_id,
+       (SELECT id FROM batch ORDER BY user_id DESC, id DESC LIMIT 1) AS id
+FROM moved
+"""
+
+# $1 - rows due earlier are restored, $2 - limit. Returns the restored due time of each user for reminders.
+RESTORE_DUE_BATCH = f"""
+WITH moved AS (
+    DELETE FROM user_words_archive
+    WHERE (user_id, word_id) IN (
+        SELECT user_id, word_id FROM user_words_archive
+        WHERE least(next_show_original, next_show_translation) <= $1
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING {USER_WORD_COLUMNS}
+), restored AS (
+    INSERT INTO user_words ({USER_WORD_COLUMNS})
+    SELECT {USER_WORD_COLUMNS} FROM moved
+    ON CONFLICT DO NOTHING
+)
+SELECT user_id, min(least(next_show_original, next_show_translation)) AS due, count(*) AS n
+FROM moved
+GROUP BY user_id
+"""
+
+# a word is added again by the user, returns the restored due time or NULL
+RESTORE_USER_WORDS = f"""
+WITH moved AS (
+    DELETE FROM user_words_archive
+    WHERE user_id = $1 AND word_id = ANY($2::integer[])
+    RETURNING {USER_WORD_COLUMNS}
+), restored AS (
+    INSERT INTO user_words ({USER_WORD_COLUMNS})
+    SELECT {USER_WORD_COLUMNS} FROM moved
+    ON CONFLICT DO NOTHING
+)
+SELECT min(least(next_show_original, next_show_translation)) FROM moved
+"""
+
+DELETE_ARCHIVED_WORD = """
+DELETE FROM user_words_archive
+WHERE user_id = $1 AND word_id = $2
+"""
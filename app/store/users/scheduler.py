@@ -0,0 +1,172 @@
+"""
+Spaced repetition schedulers. Every direction of a user word (original, translation)
+has its own ReviewState: the number of successful recalls, the ease (SM-2)
+and the stability in days (SM-2 keeps the current interval there, FSRS - the memory stability).
+
+Scalar methods are used by the bot for one review, the *_batch functions recompute
+due dates of whole tables with NumPy, which is imported only there to keep the startup fast.
+"""
+import math
+import typing
+from dataclasses import dataclass
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    from app.web.config import SchedulerConfig
+
+DAY = 24 * 60 * 60
+
+
+class SchedulerKind:
+    ladder = "ladder"
+    sm2 = "sm2"
+    fsrs = "fsrs"
+
+
+@dataclass
+class ReviewState:
+    n_shown: int = 0
+    ease: float = 2.5
+    stability: float = 1.0  # days
+
+
+class Scheduler:
+    initial_stability = 1.0
+
+    def __init__(self, config: "SchedulerConfig"):
+        self.config = config
+
+    def initial_state(self) -> ReviewState:
+        return ReviewState(n_shown=0, ease=self.config.initial_ease, stability=self.initial_stability)
+
+    def review(self, state: ReviewState, elapsed: float, remembered: bool = True) -> ReviewState:
+        """
+        elapsed - days since the previous review (or remembering).
+        """
+        raise NotImplementedError
+
+    def interval(self, state: ReviewState) -> float:
+        """
+        Days until the next review.
+        """
+        raise NotImplementedError
+
+    def intervals(self, n_shown: "np.ndarray", ease: "np.ndarray", stability: "np.ndarray") -> "np.ndarray":
+        raise NotImplementedError
+
+
+class LadderScheduler(Scheduler):
+    """
+    Fixed delays, the last one is repeated.
+    """
+
+    def review(self, state: ReviewState, elapsed: float, remembered: bool = True) -> ReviewState:
+        return ReviewState(n_shown=state.n_shown + 1 if remembered else 0,
+                           ease=state.ease,
+                           stability=state.stability)
+
+    def interval(self, state: ReviewState) -> float:
+        steps = self.config.ladder
+        return steps[min(state.n_shown, len(steps) - 1)]
+
+    def intervals(self, n_shown: "np.ndarray", ease: "np.ndarray", stability: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        steps = np.asarray(self.config.ladder, dtype=np.float64)
+        return steps[np.minimum(n_shown, len(steps) - 1)]
+
+
+class SM2Scheduler(Scheduler):
+    """
+    SuperMemo 2: the first recall after 6 days, then the interval is multiplied by the ease.
+    """
+    quality_remembered = 4
+    quality_forgotten = 1
+    min_ease = 1.3
+
+    def review(self, state: ReviewState, elapsed: float, remembered: bool = True) -> ReviewState:
+        q = self.quality_remembered if remembered else self.quality_forgotten
+        ease = max(self.min_ease, state.ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+        if not remembered:
+            return ReviewState(n_shown=0, ease=ease, stability=self.initial_stability)
+        n_shown = state.n_shown + 1
+        stability = 6.0 if n_shown == 1 else state.stability * state.ease
+        return ReviewState(n_shown=n_shown, ease=ease, stability=min(stability, self.config.max_interval))
+
+    def interval(self, state: ReviewState) -> float:
+        return state.stability
+
+    def intervals(self, n_shown: "np.ndarray", ease: "np.ndarray", stability: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        return np.asarray(stability, dtype=np.float64)
+
+
+class FSRSScheduler(Scheduler):
+    """
+    FSRS v4 stability model with a fixed difficulty: the interval is chosen
+    so that the word is recalled with the probability of desired_retention.
+    """
+    decay = -0.5
+    factor = 19 / 81
+    w = [0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01, 1.49, 0.14, 0.94, 2.18, 0.05, 0.34, 1.26, 0.29, 2.61]
+
+    def retrievability(self, elapsed: float, stability: float) -> float:
+        return (1 + self.factor * elapsed / stability) ** self.decay
+
+    def review(self, state: ReviewState, elapsed: float, remembered: bool = True) -> ReviewState:
+        w = self.w
+        d = self.config.difficulty
+        s = state.stability
+        r = self.retrievability(max(0.0, elapsed), s)
+        if remembered:
+            s = s * (1 + math.exp(w[8]) * (11 - d) * s ** -w[9] * (math.exp(w[10] * (1 - r)) - 1))
+            n_shown = state.n_shown + 1
+        else:
+            s = min(s, w[11] * d ** -w[12] * ((s + 1) ** w[13] - 1) * math.exp(w[14] * (1 - r)))
+            n_shown = 0
+        return ReviewState(n_shown=n_shown, ease=state.ease, stability=min(s, self.config.max_interval))
+
+    def interval(self, state: ReviewState) -> float:
+        return self.retention_factor() * state.stability
+
+    def intervals(self, n_shown: "np.ndarray", ease: "np.ndarray", stability: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        return self.retention_factor() * np.asarray(stability, dtype=np.float64)
+
+    def retention_factor(self) -> float:
+        return (self.config.desired_retention ** (1 / self.decay) - 1) / self.factor
+
+
+SCHEDULERS: dict[str, type[Scheduler]] = {
+    SchedulerKind.ladder: LadderScheduler,
+    SchedulerKind.sm2: SM2Scheduler,
+    SchedulerKind.fsrs: FSRSScheduler,
+}
+
+
+def create_scheduler(config: "SchedulerConfig") -> Scheduler:
+    try:
+        return SCHEDULERS[config.kind](config)
+    except KeyError:
+        raise ValueError(f"unknown scheduler: {config.kind}")
+
+
+def replan_batch(old: Scheduler,
+                 new: Scheduler,
+                 due: "np.ndarray",
+                 n_shown: "np.ndarray",
+                 ease: "np.ndarray",
+                 stability: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Recomputes due times (unix seconds) after a change of the scheduler or its parameters:
+    the previous review is due minus the old interval. When the kind changes,
+    the old interval becomes the stability of the new scheduler.
+    Returns new due times and stabilities.
+    """
+    old_intervals = old.intervals(n_shown, ease, stability)
+    last_review = due - old_intervals * DAY
+    if type(new) is not type(old):
+        stability = old_intervals
+    return last_review + new.intervals(n_shown, ease, stability) * DAY, stability
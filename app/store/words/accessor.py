@@ -1,27 +1,66 @@
 from typing import Optional
 
+import orjson
 from sqlalchemy import and_
 from sqlalchemy.dialects.postgresql import insert
 
 from app.base.accessor import BaseAccessor
+from app.database.database import Database, db
+from app.database.replicas import reads, writes
+from app.store.words import queries
+from app.store.words.autocomplete import WordCard
+from app.store.words.codec import ProfileStorage, encode_profile, decode_profile
 from app.store.words.models import WordDC, WordModel
 
 
 class WordAccessor(BaseAccessor):
+    dependencies = (Database,)
 
+    @writes
     async def add_word(self, word: WordDC) -> WordDC:
         """
         To avoid error in cases when more than one user add the same word,
         we use insert method.
         """
-        stmt = insert(WordModel).values(**word.as_dict())
+        values = word.as_dict()
+        if self.app.config.database.profile_storage == ProfileStorage.binary:
+            values["profile_blob"] = encode_profile(values.pop("profile"))
+        stmt = insert(WordModel).values(**values)
         model: WordModel = await stmt.on_conflict_do_update(
             index_elements=[WordModel.translation_code, WordModel.original],
             set_=dict(audio_id=stmt.excluded.audio_id,
-                      profile=stmt.excluded.profile)
+                      profile=stmt.excluded.profile,
+                      profile_blob=stmt.excluded.profile_blob)
         ).returning(*WordModel).gino.model(WordModel).first()
-        return model.as_dataclass()
+        word = model.as_dataclass()
+        self.app.store.word_index.add(WordCard.from_word(word))
+        return word
 
+    @writes
+    async def add_words(self, words: list[WordDC]) -> list[WordDC]:
+        """
+        Multi-row version of add_word, originals must be unique.
+        Audio of existing words is kept.
+        """
+        if not words:
+            return []
+        values = [i.as_dict() for i in words]
+        if self.app.config.database.profile_storage == ProfileStorage.binary:
+            for i in values:
+                i["profile_blob"] = encode_profile(i.pop("profile"))
+        stmt = insert(WordModel).values(values)
+        models: list[WordModel] = await stmt.on_conflict_do_update(
+            index_elements=[WordModel.translation_code, WordModel.original],
+            set_=dict(audio_id=db.func.coalesce(stmt.excluded.audio_id, WordModel.audio_id),
+                      profile=stmt.excluded.profile,
+                      profile_blob=stmt.excluded.profile_blob)
+        ).returning(*WordModel).gino.model(WordModel).all()
+        words = [i.as_dataclass() for i in models]
+        for i in words:
+            self.app.store.word_index.add(WordCard.from_word(i))
+        return words
+
+    @reads
     async def get_word(self, translation_code: str, original: str) -> Optional[WordDC]:
         word_model: WordModel = await WordModel.query \
             .where(and_(WordModel.translation_code == translation_code,
@@ -31,8 +70,72 @@ class WordAccessor(BaseAccessor):
             return None
         return word_model.as_dataclass()
 
+    @reads
+    async def get_words(self, translation_code: str, originals: list[str]) -> list[WordDC]:
+        if not originals:
+            return []
+        word_models: list[WordModel] = await WordModel.query \
+            .where(and_(WordModel.translation_code == translation_code,
+                        WordModel.original.in_(originals))) \
+            .gino.all()
+        return [i.as_dataclass() for i in word_models]
+
+    @reads
     async def get_word_by_id(self, word_id: int) -> WordDC:
         word_model: WordModel = await WordModel.query \
             .where(WordModel.id == word_id) \
             .gino.first()
         return word_model.as_dataclass()
+
+    async def update_profiles(self, words: list[WordDC]) -> int:
+        """
+        Replaces profiles of existing words found by (translation_code, original), audio is kept.
+        Returns the number of updated words.
+        """
+        if not words:
+            return 0
+        if self.app.config.database.profile_storage == ProfileStorage.binary:
+            query = queries.UPDATE_PROFILE_BLOBS
+            profiles = [encode_profile(i.as_dict()["profile"]) for i in words]
+        else:
+            query = queries.UPDATE_PROFILES
+            profiles = [orjson.dumps(i.as_dict()["profile"]).decode() for i in words]
+        return await self.app.store.database.fetchval(query,
+                                                      [i.translation_code for i in words],
+                                                      [i.original for i in words],
+                                                      profiles)
+
+    async def convert_profiles(self, storage: str, batch_size: int = 1000) -> int:
+        """
+        Moves existing rows to the given profile storage.
+        Rows are processed in batches by primary key, so it can be interrupted and restarted.
+        """
+        db = self.app.store.database.db
+        if storage == ProfileStorage.binary:
+            source, target = WordModel.profile, WordModel.profile_blob
+        elif storage == ProfileStorage.jsonb:
+            source, target = WordModel.profile_blob, WordModel.profile
+        else:
+            raise ValueError(storage)
+
+        n_converted = 0
+        last_id = 0
+        while 1:
+            rows = await db.select([WordModel.id, source]) \
+                .where(and_(WordModel.id > last_id,
+                            source != None)) \
+                .order_by(WordModel.id) \
+                .limit(batch_size) \
+                .gino.all()
+            if not rows:
+                break
+            if storage == ProfileStorage.binary:
+                values = [(encode_profile(profile), word_id) for word_id, profile in rows]
+            else:
+                values = [(orjson.dumps(decode_profile(blob)).decode(), word_id) for word_id, blob in rows]
+            query = f"UPDATE words SET {target.name} = $1, {source.name} = NULL WHERE id = $2"
+            async with db.transaction() as tx:
+                await tx.connection.raw_connection.executemany(query, values)
+            n_converted += len(rows)
+            last_id = rows[-1][0]
+        return n_converted
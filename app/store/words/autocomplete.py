@@ -0,0 +1,91 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+
+import orjson
+
+from app.store.words.codec import decode_plain_profile
+from app.store.words.models import WordDC
+
+MAX_CARD_TRANSLATIONS = 10  # as many as payload.full_word_text shows
+
+
+@dataclass
+class WordCard:
+    """
+    The short fields of a word, enough for payload.full_word_text.
+    """
+    id: int
+    translation_code: str
+    original: str
+    transcription: list[str]
+    translations: list[str]
+    past_indefinite: list[str]
+    past_participle: list[str]
+    noun_plural: list[str]
+
+    @classmethod
+    def from_word(cls, word: WordDC) -> "WordCard":
+        return cls(id=word.id,
+                   translation_code=word.translation_code,
+                   original=word.original,
+                   transcription=word.transcription,
+                   translations=word.translations[:MAX_CARD_TRANSLATIONS],
+                   past_indefinite=word.past_indefinite,
+                   past_participle=word.past_participle,
+                   noun_plural=word.noun_plural)
+
+    @classmethod
+    def from_row(cls, row) -> "WordCard":
+        """
+        A row of queries.WORD_CARD_COLUMNS.
+        """
+        if row["profile"] is not None:
+            profile = orjson.loads(row["profile"])
+        else:
+            profile = decode_plain_profile(row["profile_blob"])
+        return cls(id=row["id"],
+                   translation_code=row["translation_code"],
+                   original=row["original"],
+                   transcription=profile["transcription"],
+                   translations=profile["translations"][:MAX_CARD_TRANSLATIONS],
+                   past_indefinite=profile["past_indefinite"],
+                   past_participle=profile["past_participle"],
+                   noun_plural=profile["noun_plural"])
+
+
+class PrefixIndex:
+    """
+    Cards of one translation code with originals in a sorted list: words starting
+    with a prefix are a contiguous slice found by bisect, in code point order.
+    """
+
+    def __init__(self):
+        self.originals: list[str] = []
+        self.cards: dict[str, WordCard] = {}
+
+    def __len__(self) -> int:
+        return len(self.originals)
+
+    def add(self, card: WordCard) -> None:
+        if card.original not in self.cards:
+            insort(self.originals, card.original)
+        self.cards[card.original] = card
+
+    def add_many(self, cards: list[WordCard]) -> None:
+        """
+        One sort instead of an insertion per card, the sorted list is a single run for timsort.
+        """
+        new = [i.original for i in cards if i.original not in self.cards]
+        self.cards.update((i.original, i) for i in cards)
+        if new:
+            self.originals.extend(set(new))
+            self.originals.sort()
+
+    def complete(self, prefix: str, limit: int = 10) -> list[WordCard]:
+        result = []
+        for i in range(bisect_left(self.originals, prefix), len(self.originals)):
+            original = self.originals[i]
+            if not original.startswith(prefix) or len(result) == limit:
+                break
+            result.append(self.cards[original])
+        return result
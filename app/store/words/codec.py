@@ -0,0 +1,49 @@
+import struct
+import zlib
+
+import orjson
+
+
+class ProfileStorage:
+    jsonb = "jsonb"
+    binary = "binary"
+
+
+PROFILE_VERSION = 1
+
+# version, length of the uncompressed part
+_header = struct.Struct("!BI")
+
+# short fields which are read on every card, stored as plain orjson
+_plain_fields = ("transcription", "translations", "past_indefinite", "past_participle", "noun_plural")
+# long texts, shown only on demand, stored zlib-compressed
+_compressed_fields = ("examples", "idioms")
+
+
+def encode_profile(profile: dict) -> bytes:
+    plain = orjson.dumps([profile[i] for i in _plain_fields])
+    compressed = zlib.compress(orjson.dumps([profile[i] for i in _compressed_fields]))
+    return _header.pack(PROFILE_VERSION, len(plain)) + plain + compressed
+
+
+def decode_profile(blob: bytes) -> dict:
+    version, size = _header.unpack_from(blob)
+    if version != PROFILE_VERSION:
+        raise ValueError(f"unknown profile version: {version}")
+    start = _header.size
+    plain = orjson.loads(blob[start:start + size])
+    compressed = orjson.loads(zlib.decompress(blob[start + size:]))
+    result = dict(zip(_plain_fields, plain))
+    result.update(zip(_compressed_fields, compressed))
+    return result
+
+
+def decode_plain_profile(blob: bytes) -> dict:
+    """
+    Only the short fields, without decompressing examples and idioms.
+    """
+    version, size = _header.unpack_from(blob)
+    if version != PROFILE_VERSION:
+        raise ValueError(f"unknown profile version: {version}")
+    start = _header.size
+    return dict(zip(_plain_fields, orjson.loads(blob[start:start + size])))
@@ -0,0 +1,140 @@
+import asyncio
+import html
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.database.database import Database
+from app.logger import logger
+from app.store.users.models import UserWordDC
+from app.store.words.models import WordDC
+from app.utils import now
+
+MIN_WORD_LENGTH = 2
+MAX_WORD_LENGTH = 20
+FORBIDDEN_CHARS = "[]()<>/?,.|\\~`!@#$%^&*_+=:;1234567890"
+
+HTML_TAG = re.compile(r"<[^>]*>")
+COLUMN_SEPARATOR = re.compile(r"[\t,;]")
+WORD_SEPARATOR = re.compile(r"[\n,;]")
+
+
+def is_valid_word(original: str) -> bool:
+    return MIN_WORD_LENGTH <= len(original) <= MAX_WORD_LENGTH \
+           and not any(i in FORBIDDEN_CHARS for i in original)
+
+
+def read_words(lines: Iterable[str], limit: Optional[int] = None) -> list[str]:
+    """
+    Reads plain text (a word per line), CSV and Anki exports (tab separated, with # comments):
+    the first column is the word. Invalid words are skipped, the order of the rest is kept.
+    """
+    result = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        line = html.unescape(HTML_TAG.sub("", line))
+        original = COLUMN_SEPARATOR.split(line, 1)[0].strip().strip("\"'").lower()
+        if not is_valid_word(original):
+            continue
+        result[original] = None
+        if limit is not None and len(result) >= limit:
+            break
+    return list(result)
+
+
+def split_words(text: str) -> list[str]:
+    """
+    Splits a message like "apple, banana, cherry" or a list of words on separate lines.
+    """
+    result = [i.strip().lower() for i in WORD_SEPARATOR.split(text)]
+    return list(dict.fromkeys(i for i in result if i))
+
+
+@dataclass
+class ImportResult:
+    n_added: int = 0  # new words of the user
+    n_existed: int = 0  # added by the user before
+    n_translated: int = 0  # new words of the dictionary
+    not_found: list[str] = field(default_factory=list)
+
+
+class WordImporter(BaseAccessor):
+    """
+    Adds lists of words in batches: known words are fetched with one query per batch,
+    the rest are translated concurrently (at most importer.concurrency requests
+    for all bulk imports together) and inserted with multi-row inserts.
+    Imported words have no audio.
+    """
+    dependencies = (Database,)
+    semaphore: asyncio.Semaphore
+
+    async def connect(self) -> None:
+        self.semaphore = asyncio.Semaphore(self.app.config.importer.concurrency)
+
+    async def translate(self,
+                        translation_code: str,
+                        original: str,
+                        semaphore: asyncio.Semaphore) -> Optional[WordDC]:
+        async with semaphore:
+            try:
+                return await self.app.store.translator.translate(translation_code, original)
+            except Exception as e:
+                logger.warning("failed to translate %r: %r", original, e)
+                return None
+
+    async def import_words(self,
+                           translation_code: str,
+                           originals: list[str],
+                           user_id: Optional[int] = None,
+                           concurrency: Optional[int] = None) -> ImportResult:
+        """
+        Without user_id words are only added to the dictionary.
+        concurrency limits translator requests of this call, e.g. of a message with several words,
+        which does not wait for bulk imports (files, scripts) sharing importer.concurrency.
+        """
+        result = ImportResult()
+        batch_size = self.app.config.importer.batch_size
+        semaphore = self.semaphore if concurrency is None else asyncio.Semaphore(concurrency)
+        for i in range(0, len(originals), batch_size):
+            await self.import_batch(result, translation_code, originals[i:i + batch_size], user_id, semaphore)
+            logger.info("imported %s of %s words", min(i + batch_size, len(originals)), len(originals))
+        return result
+
+    async def import_batch(self,
+                           result: ImportResult,
+                           translation_code: str,
+                           originals: list[str],
+                           user_id: Optional[int],
+                           semaphore: asyncio.Semaphore) -> None:
+        words = await self.app.store.words.get_words(translation_code, originals)
+        known = {i.original for i in words}
+
+        missing = [i for i in originals if i not in known]
+        translated = await asyncio.gather(*[self.translate(translation_code, i, semaphore) for i in missing])
+        new_words: dict[str, WordDC] = {}
+        for original, word in zip(missing, translated):
+            if word is None or not word.translations:
+                result.not_found.append(original)
+            elif word.original not in known:
+                # the translator may correct the original to an already known word
+                new_words[word.original] = word
+        words.extend(await self.app.store.words.add_words(list(new_words.values())))
+        result.n_translated += len(new_words)
+
+        if user_id is None:
+            return
+        current_time = now()
+        word_ids = list(dict.fromkeys(i.id for i in words if i.translations))
+        added = await self.app.store.users.add_user_words([
+            UserWordDC(user_id=user_id,
+                       translation_code=translation_code,
+                       word_id=i,
+                       added_at=current_time)
+            for i in word_ids
+        ])
+        result.n_added += len(added)
+        result.n_existed += len(word_ids) - len(added)
@@ -0,0 +1,142 @@
+import asyncio
+import time
+import typing
+from collections import defaultdict
+from contextlib import suppress
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.database.database import Database
+from app.logger import logger
+from app.store.words import queries
+from app.store.words.autocomplete import PrefixIndex, WordCard
+from app.store.words.spelling import SpellingIndex, allowed_distance
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def prefix_range(prefix: str) -> tuple[str, str]:
+    """
+    [lower, upper) of strings starting with the prefix in code point order,
+    U+10FFFF is a noncharacter, which does not occur in words.
+    """
+    return prefix, prefix + "\U0010ffff"
+
+
+class WordIndex(BaseAccessor):
+    """
+    Words of the words table in memory, per translation code: to suggest known words
+    for misspelled ones without asking the translator and to complete inline queries
+    without the database. They are loaded in the background after connect, words of
+    this process are added by WordAccessor at once and words added by other processes
+    every word_index.refresh_interval seconds.
+
+    A word takes about 1.2KB for spelling with prefix_length 5 (4KB with 7, the deletes grow
+    with it) and 1KB for its card, so at most word_index.max_words words are kept. After that
+    new words are neither suggested nor completed from memory.
+    """
+    dependencies = (Database,)
+    instrumented = False
+    task: Optional[asyncio.Task] = None
+
+    def __init__(self, app: "Application"):
+        super().__init__(app)
+        self.spelling: dict[str, SpellingIndex] = {}
+        self.prefixes: dict[str, PrefixIndex] = defaultdict(PrefixIndex)
+        self.last_id = 0
+        self.n_words = 0
+        self.loaded = False
+
+    async def connect(self) -> None:
+        if self.app.config.word_index.enabled and self.app.background:
+            self.task = asyncio.create_task(self.run())
+
+    async def disconnect(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+
+    async def run(self) -> None:
+        while 1:
+            try:
+                start = time.monotonic()
+                n_loaded = await self.load()
+                if not self.loaded:
+                    self.loaded = True
+                    logger.info("word index: %s words loaded in %.1fs", n_loaded, time.monotonic() - start)
+            except Exception as e:
+                logger.exception(e)
+            await asyncio.sleep(self.app.config.word_index.refresh_interval)
+
+    @property
+    def full(self) -> bool:
+        return self.n_words >= self.app.config.word_index.max_words
+
+    async def load(self) -> int:
+        """
+        Words with id above the last loaded one, in batches, until word_index.max_words.
+        """
+        config = self.app.config.word_index
+        n_loaded = 0
+        while 1:
+            if self.full:
+                return n_loaded
+            batch_size = min(config.batch_size, config.max_words - self.n_words)
+            rows = await self.app.store.database.fetch(queries.WORD_CARDS_BATCH, self.last_id, batch_size)
+            cards = defaultdict(list)
+            for row in rows:
+                card = WordCard.from_row(row)
+                self.add_spelling(card.translation_code, card.original)
+                cards[card.translation_code].append(card)
+            for translation_code, i in cards.items():
+                self.prefixes[translation_code].add_many(i)
+            n_loaded += len(rows)
+            if rows:
+                self.last_id = rows[-1]["id"]
+            if self.full:
+                logger.warning("word index: max_words %s is reached", config.max_words)
+            if len(rows) < batch_size:
+                return n_loaded
+
+    def add(self, card: WordCard) -> None:
+        if not self.app.config.word_index.enabled or self.full:
+            return
+        self.add_spelling(card.translation_code, card.original)
+        self.prefixes[card.translation_code].add(card)
+
+    def add_spelling(self, translation_code: str, original: str) -> None:
+        index = self.spelling.get(translation_code)
+        if index is None:
+            config = self.app.config.word_index
+            index = self.spelling[translation_code] = SpellingIndex(config.max_distance, config.prefix_length)
+        if index.add(original):
+            self.n_words += 1
+
+    def suggest(self, translation_code: str, original: str) -> list[str]:
+        """
+        Known words close to the unknown original, the closest first.
+        """
+        index = self.spelling.get(translation_code)
+        if index is None:
+            return []
+        config = self.app.config.word_index
+        suggestions = index.lookup(original, allowed_distance(original, config.max_distance), config.max_suggestions)
+        return [word for distance, word in suggestions if distance > 0]
+
+    async def complete(self, translation_code: str, prefix: str) -> list[WordCard]:
+        """
+        Words starting with the prefix, from memory once the index is loaded and from the database
+        before that. When not all words fit in memory, the database is asked only if memory has
+        fewer than word_index.max_completions of them.
+        """
+        limit = self.app.config.word_index.max_completions
+        if self.loaded:
+            cards = self.prefixes[translation_code].complete(prefix, limit)
+            if len(cards) == limit or not self.full:
+                return cards
+        rows = await self.app.store.database.fetch(queries.WORD_CARDS_BY_PREFIX,
+                                                   translation_code, *prefix_range(prefix), limit)
+        return [WordCard.from_row(i) for i in rows]
@@ -6,6 +6,7 @@ from typing import Optional
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.database.database import db
+from app.store.words.codec import decode_profile
 
 if typing.TYPE_CHECKING:
     import sqlalchemy as db
@@ -60,7 +61,9 @@ class WordModel(db.Model):
     translation_code = db.Column(db.String, nullable=False)
     original = db.Column(db.String, nullable=False)
 
-    profile = db.Column(JSONB, nullable=False)
+    # exactly one of them is filled, depending on DatabaseConfig.profile_storage
+    profile = db.Column(JSONB, nullable=True)
+    profile_blob = db.Column(db.LargeBinary, nullable=True)
     transcription = db.ArrayProperty()
     translations = db.ArrayProperty()
     past_indefinite = db.ArrayProperty()
@@ -73,8 +76,17 @@ class WordModel(db.Model):
     added_at = db.Column(db.DateTime(timezone=True), nullable=False)
 
     _idx1 = db.Index("words_idx_translation_code_original", "translation_code", "original", unique=True)
+    # originals by a prefix in code point order, see queries.WORD_CARDS_BY_PREFIX
+    _idx2 = db.Index("words_idx_translation_code_original_c", translation_code, original.collate("C"))
 
     def as_dataclass(self) -> WordDC:
+        if self.profile_blob is not None:
+            return WordDC(translation_code=self.translation_code,
+                          original=self.original,
+                          audio_id=self.audio_id,
+                          added_at=self.added_at,
+                          id=self.id,
+                          **decode_profile(self.profile_blob))
         return WordDC(translation_code=self.translation_code,
                       original=self.original,
                       transcription=self.transcription,
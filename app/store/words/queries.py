@@ -0,0 +1,42 @@
+"""
+Constant SQL of WordAccessor, see app/store/users/queries.py.
+"""
+
+# $1, $2 - arrays of (translation_code, original), $3 - profiles, returns the number of updated words
+UPDATE_PROFILES = """
+WITH updated AS (
+    UPDATE words SET profile = batch.profile, profile_blob = NULL
+    FROM unnest($1::text[], $2::text[], $3::jsonb[]) AS batch(translation_code, original, profile)
+    WHERE words.translation_code = batch.translation_code AND words.original = batch.original
+    RETURNING 1
+)
+SELECT count(*) FROM updated
+"""
+
+UPDATE_PROFILE_BLOBS = """
+WITH updated AS (
+    UPDATE words SET profile_blob = batch.profile_blob, profile = NULL
+    FROM unnest($1::text[], $2::text[], $3::bytea[]) AS batch(translation_code, original, profile_blob)
+    WHERE words.translation_code = batch.translation_code AND words.original = batch.original
+    RETURNING 1
+)
+SELECT count(*) FROM updated
+"""
+
+# columns of autocomplete.WordCard, without examples and idioms
+WORD_CARD_COLUMNS = "id, translation_code, original, profile - 'examples' - 'idioms' AS profile, profile_blob"
+
+# $1 - the last loaded id, $2 - limit
+WORD_CARDS_BATCH = f"""
+SELECT {WORD_CARD_COLUMNS} FROM words WHERE id > $1 ORDER BY id LIMIT $2
+"""
+
+# $1 - translation_code, $2, $3 - the range of originals starting with the prefix (see index.prefix_range),
+# $4 - limit. A range scan of words_idx_translation_code_original_c in its order, unlike LIKE
+# it stays on the index in the generic plan of the prepared statement.
+WORD_CARDS_BY_PREFIX = f"""
+SELECT {WORD_CARD_COLUMNS} FROM words
+WHERE translation_code = $1 AND original COLLATE "C" >= $2 AND original COLLATE "C" < $3
+ORDER BY original COLLATE "C"
+LIMIT $4
+"""
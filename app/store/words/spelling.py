@@ -0,0 +1,104 @@
+from collections import deque
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Damerau-Levenshtein distance (optimal string alignment, adjacent transpositions cost 1),
+    max_distance + 1 when it is larger than max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def allowed_distance(term: str, max_distance: int) -> int:
+    """
+    Like fuzziness AUTO of Elasticsearch: a typo in a short word is rather another word.
+    """
+    if len(term) < 3:
+        return 0
+    if len(term) < 6:
+        return min(1, max_distance)
+    return max_distance
+
+
+class SpellingIndex:
+    """
+    Symmetric delete spelling correction (SymSpell) over the originals of one translation code.
+    Every word is indexed by the deletes of its first prefix_length characters up to max_distance,
+    a term is looked up by its own deletes, so no candidates are generated from the alphabet
+    and a lookup takes microseconds. Candidates are checked by edit_distance on whole words.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 5):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words: set[str] = set()
+        self.deletes: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.words
+
+    def edits(self, prefix: str) -> set[str]:
+        """
+        The prefix and its deletes up to max_distance, except the empty string.
+        """
+        result = {prefix}
+        level = {prefix}
+        for _ in range(self.max_distance):
+            level = {i[:j] + i[j + 1:] for i in level for j in range(len(i))} - {""}
+            result |= level
+        return result
+
+    def add(self, word: str) -> bool:
+        if word in self.words:
+            return False
+        self.words.add(word)
+        for key in self.edits(word[:self.prefix_length]):
+            self.deletes.setdefault(key, []).append(word)
+        return True
+
+    def lookup(self, term: str, max_distance: int = None, limit: int = 5) -> list[tuple[int, str]]:
+        """
+        (distance, word) of the closest words, the closest and most similar in length first.
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if term in self.words:
+            return [(0, term)]
+        prefix = term[:self.prefix_length]
+        found: dict[str, int] = {}
+        checked: set[str] = set()
+        candidates = deque([prefix])
+        seen = {prefix}
+        while candidates:
+            candidate = candidates.popleft()
+            for word in self.deletes.get(candidate, ()):
+                if word in checked:
+                    continue
+                checked.add(word)
+                distance = edit_distance(term, word, max_distance)
+                if distance <= max_distance:
+                    found[word] = distance
+            if len(prefix) - len(candidate) < max_distance and len(candidate) > 1:
+                for i in range(len(candidate)):
+                    delete = candidate[:i] + candidate[i + 1:]
+                    if delete not in seen:
+                        seen.add(delete)
+                        candidates.append(delete)
+        result = sorted(found.items(), key=lambda i: (i[1], abs(len(i[0]) - len(term)), i[0]))
+        return [(distance, word) for word, distance in result[:limit]]
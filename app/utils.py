@@ -1,14 +1,16 @@
 import asyncio
-import multiprocessing
+import importlib
 import os
 import pathlib
 import uuid
+from collections.abc import Callable
 from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any
 from datetime import datetime, timezone
 
-from gtts import gTTS
-
 from app.logger import logger
+from app.metrics import audio_seconds
 
 
 def now() -> datetime:
@@ -19,7 +21,30 @@ def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs blocking io (files, process joins) in the default executor instead of the event loop.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, partial(func, *args, **kwargs))
+
+
+def file_size(filename: pathlib.Path) -> int:
+    try:
+        return filename.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def remove_file(filename: pathlib.Path) -> None:
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+
 def proc_generate_audio(foreign_lang_code: str, original: str, filename: str):
+    from gtts import gTTS
+
     audio = gTTS(original, lang=foreign_lang_code)
     try:
         audio.save(filename)
@@ -29,37 +54,49 @@ def proc_generate_audio(foreign_lang_code: str, original: str, filename: str):
 
 class MediaGenerator:
     last_activity = now()
+    lock = asyncio.Lock()
 
     @classmethod
     @asynccontextmanager
     async def generate_audio(cls, foreign_lang_code: str, original: str) -> pathlib.Path:
-        await asyncio.sleep(
-            max(0.0, 3.0 - (now() - cls.last_activity).total_seconds())  # to avoid flood detection
-        )
+        # gtts is heavy, so it is imported on the first use instead of at startup,
+        # in a thread not to block the loop; forked processes inherit the already imported module
+        import multiprocessing
+        await run_blocking(importlib.import_module, "gtts")
 
         path = pathlib.Path(__file__).resolve().parent.parent / "temp"
-        path.mkdir(exist_ok=True, parents=True)
+        await run_blocking(path.mkdir, exist_ok=True, parents=True)
         filename = path / f"{generate_uuid()}.mp3"
 
-        while 1:
-            # генерация аудио имеет свойство зависать на 20 секунд, а затем выдавать ошибку,
-            # поэтому запускаем в отдельном процессе и ждём нужное время
-            # к тому же, нам нужна асинхронность
-            proc = multiprocessing.Process(target=proc_generate_audio,
-                                           args=(foreign_lang_code, original, str(filename)))
-            proc.start()
-            try:
-                proc.join(timeout=5.0)
-            except multiprocessing.TimeoutError:
-                logger.warning("gTTS process killed, starting new one")
-            proc.kill()
-
-            if not filename.exists() or filename.stat().st_size == 0:
-                logger.warning("gTTS error, file not saved")
-                continue
-            break
-
-        yield filename
-
-        os.remove(filename)
-        cls.last_activity = now()
+        # one generation at a time: concurrent callers would all see the same last_activity
+        async with cls.lock:
+            await asyncio.sleep(
+                max(0.0, 3.0 - (now() - cls.last_activity).total_seconds())  # to avoid flood detection
+            )
+            with audio_seconds.time():
+                while 1:
+                    # генерация аудио имеет свойство зависать на 20 секунд, а затем выдавать ошибку,
+                    # поэтому запускаем в отдельном процессе и ждём нужное время
+                    # к тому же, нам нужна асинхронность
+                    proc = multiprocessing.Process(target=proc_generate_audio,
+                                                   args=(foreign_lang_code, original, str(filename)))
+                    proc.start()
+                    # join returns after the timeout even if the process is still alive,
+                    # it is waited in a thread so other users are not blocked
+                    await run_blocking(proc.join, timeout=5.0)
+                    if proc.is_alive():
+                        logger.warning("gTTS process killed, starting new one")
+                    proc.kill()
+                    await run_blocking(proc.join)
+                    proc.close()
+
+                    if await run_blocking(file_size, filename) == 0:
+                        logger.warning("gTTS error, file not saved")
+                        continue
+                    break
+            cls.last_activity = now()
+
+        try:
+            yield filename
+        finally:
+            await run_blocking(remove_file, filename)
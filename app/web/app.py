@@ -1,8 +1,12 @@
+import asyncio
 import pathlib
-from collections.abc import Callable, Awaitable
+import time
 from typing import Union
 
-from app.logger import logger
+from app.base.accessor import BaseAccessor
+from app.logger import logger, setup_logging
+from app.metrics.loop import LoopMonitor, setup_monitor
+from app.metrics.server import MetricsServer, setup_metrics
 from app.store.store import Store, setup_store
 from app.web.config import Config, setup_config
 
@@ -10,24 +14,106 @@ from app.web.config import Config, setup_config
 class Application:
     config: Config
     store: Store
+    metrics: MetricsServer
+    monitor: LoopMonitor
 
     def __init__(self):
-        self.on_connect: list[Callable[[], Awaitable[None]]] = []
-        self.on_disconnect: list[Callable[[], Awaitable[None]]] = []
+        self.accessors: list[BaseAccessor] = []
+        # False in scripts: they run next to the bot, which serves metrics and runs the background jobs
+        self.background = True
+        self.timings: dict[str, dict[str, float]] = {"connect": {}, "disconnect": {}}
+
+    def get_dependencies(self, accessor: BaseAccessor) -> list[BaseAccessor]:
+        # dependencies which are not registered in the app (e.g. bot accessors in scripts) are skipped
+        return [i for i in self.accessors
+                if i is not accessor and isinstance(i, accessor.dependencies)]
+
+    def get_dependents(self, accessor: BaseAccessor) -> list[BaseAccessor]:
+        return [i for i in self.accessors
+                if any(j is accessor for j in self.get_dependencies(i))]
+
+    def check_dependencies(self) -> None:
+        done: list[BaseAccessor] = []
+
+        def visit(accessor: BaseAccessor, path: list[BaseAccessor]):
+            if any(i is accessor for i in path):
+                cycle = " -> ".join(type(i).__name__ for i in path + [accessor])
+                raise ValueError(f"dependency cycle: {cycle}")
+            if any(i is accessor for i in done):
+                return
+            for dependency in self.get_dependencies(accessor):
+                visit(dependency, path + [accessor])
+            done.append(accessor)
+
+        for i in self.accessors:
+            visit(i, [])
+
+    async def run_accessor(self, accessor: BaseAccessor, action: str, after: list[asyncio.Task]) -> None:
+        name = type(accessor).__name__
+        if after:
+            done, _ = await asyncio.wait(after)
+            if action == "connect" and any(i.cancelled() or i.exception() for i in done):
+                raise RuntimeError(f"{name} is not connected, its dependencies failed")
+
+        if action == "connect":
+            func, timeout = accessor.connect, accessor.connect_timeout or self.config.common.connect_timeout
+        else:
+            func, timeout = accessor.disconnect, accessor.disconnect_timeout or self.config.common.disconnect_timeout
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(func(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{name} {action} timed out after {timeout}s")
+        finally:
+            self.timings[action][name] = time.perf_counter() - start
+
+    async def run_accessors(self, action: str) -> list[Union[None, BaseException]]:
+        """
+        Runs connect (or disconnect) of all accessors concurrently.
+        Connect of an accessor starts when all its dependencies are connected,
+        disconnect - when everything which depends on it is disconnected.
+        """
+        tasks: dict[int, asyncio.Task] = {}
+
+        def schedule(accessor: BaseAccessor) -> asyncio.Task:
+            if id(accessor) not in tasks:
+                if action == "connect":
+                    after = [schedule(i) for i in self.get_dependencies(accessor)]
+                else:
+                    after = [schedule(i) for i in self.get_dependents(accessor)]
+                tasks[id(accessor)] = asyncio.create_task(self.run_accessor(accessor, action, after))
+            return tasks[id(accessor)]
+
+        self.check_dependencies()
+        start = time.perf_counter()
+        results = await asyncio.gather(*[schedule(i) for i in self.accessors], return_exceptions=True)
+
+        timings = ", ".join(f"{name}={seconds:.3f}s"
+                            for name, seconds in sorted(self.timings[action].items(), key=lambda i: -i[1]))
+        logger.info(f"{action} done in {time.perf_counter() - start:.3f}s: {timings}")
+        return results
 
     async def connect(self, *args, **kwargs):
         logger.info("connecting to the app")
-        for func in self.on_connect:
-            await func()
+        for result in await self.run_accessors("connect"):
+            if isinstance(result, BaseException):
+                raise result
 
     async def disconnect(self, *args, **kwargs):
         logger.info("disconnecting from the app")
-        for func in self.on_disconnect:
-            await func()
+        for accessor, result in zip(self.accessors, await self.run_accessors("disconnect")):
+            if isinstance(result, BaseException):
+                logger.error(f"{type(accessor).__name__} disconnect failed: {result!r}")
 
 
-def setup_app(config_file: Union[str, pathlib.Path]) -> Application:
+def setup_app(config_file: Union[str, pathlib.Path], background: bool = True) -> Application:
     app = Application()
+    app.background = background
     setup_config(app, config_file)
+    setup_logging(app.config.logging)
     setup_store(app)
+    if background:
+        setup_metrics(app)
+        setup_monitor(app)
     return app
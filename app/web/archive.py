@@ -0,0 +1,66 @@
+import pathlib
+import sqlite3
+import time
+import zlib
+from typing import Optional
+
+
+class ResponseKind:
+    lookup = "lookup"  # lookupMultiple, translations and forms
+    exclusive = "exclusive"  # lookupMultiple of phrases, asked when lookup has no translations
+    corpus = "corpus"  # queryCorpus, examples and idioms
+
+
+class ResponseArchive:
+    """
+    Raw translator responses in SQLite, compressed with zlib, the latest one per word.
+    Words are parsed again from here (app.web.reparse) when the parser changes,
+    without asking the translator. Methods are blocking, see app.utils.run_blocking.
+    """
+    kinds = [ResponseKind.lookup, ResponseKind.exclusive, ResponseKind.corpus]
+
+    def __init__(self, filename: pathlib.Path, create: bool = True):
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        if not create:
+            return
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS responses ("
+                                "translation_code TEXT NOT NULL, "
+                                "original TEXT NOT NULL, "
+                                "fetched_at REAL NOT NULL, "
+                                "lookup BLOB NOT NULL, "
+                                "exclusive BLOB, "
+                                "corpus BLOB NOT NULL, "
+                                "PRIMARY KEY (translation_code, original))")
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def put(self, translation_code: str, original: str, responses: dict[str, bytes]) -> None:
+        values = [zlib.compress(responses[i]) if i in responses else None for i in self.kinds]
+        self.connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                                (translation_code, original, time.time(), *values))
+        self.connection.commit()
+
+    def get(self, translation_code: str, original: str) -> Optional[dict[str, bytes]]:
+        row = self.connection.execute(f"SELECT {', '.join(self.kinds)} FROM responses "
+                                      f"WHERE translation_code = ? AND original = ?",
+                                      (translation_code, original)).fetchone()
+        return None if row is None else self.decompress(row)
+
+    def decompress(self, row: tuple) -> dict[str, bytes]:
+        return {kind: zlib.decompress(value) for kind, value in zip(self.kinds, row) if value is not None}
+
+    def rowid_bounds(self) -> tuple[int, int]:
+        first, last = self.connection.execute("SELECT min(rowid), max(rowid) FROM responses").fetchone()
+        return (first, last) if first is not None else (1, 0)
+
+    def read(self, first_rowid: int, last_rowid: int) -> list[tuple[str, str, dict[str, bytes]]]:
+        """
+        (translation_code, original, responses) with rowid in [first_rowid, last_rowid].
+        """
+        rows = self.connection.execute(f"SELECT translation_code, original, {', '.join(self.kinds)} "
+                                       f"FROM responses WHERE rowid BETWEEN ? AND ?",
+                                       (first_rowid, last_rowid))
+        return [(i[0], i[1], self.decompress(i[2:])) for i in rows]
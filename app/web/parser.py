@@ -1,117 +1,187 @@
 import asyncio
+import pathlib
 import typing
+from dataclasses import dataclass
 from typing import Optional
 
+import orjson
 from aiohttp import ClientSession, TCPConnector
 
-from app.base.accessor import BaseAccessor
 from app.logger import logger
 from app.store.words.models import WordDC
-from app.utils import now
+from app.utils import now, run_blocking
+from app.web.archive import ResponseArchive, ResponseKind
+from app.web.translation import TranslatorBackend
 
 if typing.TYPE_CHECKING:
     pass
 
 
-def get_correct_original(namespace) -> Optional[str]:
+MAX_TRANSLATIONS = 5  # per part of speech
+MAX_EXAMPLES = 30  # and idioms
+
+
+@dataclass
+class Lookup:
+    original: Optional[str]
+    translations: list[str]
+    transcriptions: list[str]
+    past_indefinite: list[str]
+    past_participle: list[str]
+    noun_plural: list[str]
+
+
+def parse_lookup(namespace) -> Lookup:
+    """
+    All fields of a lookupMultiple response in one pass over namespace["regular"].
+    Duplicates are dropped by dict keys, which keep the order.
+    """
+    original = None
+    translations = {}
+    transcriptions = {}
+    past_indefinite = []
+    past_participle = []
+    noun_plural = []
     for loc in namespace["regular"]:
-        return loc["text"]
+        if original is None:
+            original = loc["text"]
+        for tr in loc["tr"][:MAX_TRANSLATIONS]:
+            translations[tr["text"]] = None
+        if "ts" in loc:
+            transcriptions[loc["ts"]] = None
+        if "pos" not in loc or "prdg" not in loc:
+            continue
+        pos = loc["pos"]["tooltip"]
+        if pos == "verb":
+            rows = loc["prdg"]["data"][0]["tables"][0]["rows"]
+            past_indefinite = [i.replace("(had) ", "") for i in rows[0]]
+            past_participle = [i.replace("(had) ", "") for i in rows[2]]
+        elif pos == "noun":
+            noun_plural.append(loc["prdg"]["data"][0]["tables"][0]["rows"][0][1])
+    return Lookup(original=original,
+                  translations=list(translations),
+                  transcriptions=list(transcriptions),
+                  past_indefinite=past_indefinite,
+                  past_participle=past_participle,
+                  noun_plural=noun_plural)
+
+
+def parse_corpus(namespace, limit: Optional[int] = None) -> tuple[list[list[str]], list[list[str]]]:
+    """
+    (examples, idioms) of a queryCorpus response in one pass, at most limit of each.
+    """
+    examples = []
+    idioms = []
+    for row in namespace["result"]["examples"]:
+        result = idioms if row["ref"]["type"] == "idiom" else examples
+        if limit is None or len(result) < limit:
+            result.append([row["src"], row["dst"]])
+        elif len(examples) >= limit and len(idioms) >= limit:
+            break
+    return examples, idioms
+
+
+def get_correct_original(namespace) -> Optional[str]:
+    return parse_lookup(namespace).original
 
 
 def get_translations(namespace) -> list[str]:
-    result = []
-    for loc in namespace["regular"]:
-        for tr in loc["tr"][:5]:
-            if tr["text"] not in result:
-                result.append(tr["text"])
-    return result
+    return parse_lookup(namespace).translations
+
+
+def has_translations(namespace) -> bool:
+    """
+    The same as bool(get_translations(namespace)) without parsing the other fields.
+    """
+    return any(loc["tr"] for loc in namespace["regular"])
 
 
 def get_exclusive(namespace) -> list[str]:
-    result = []
-    if "def" not in namespace:
-        return result
-    for loc in namespace["def"]:
-        for tr in loc["tr"][:5]:
-            if tr["def"] not in result:
-                result.append(tr["def"])
-    return result
+    result = {}
+    for loc in namespace.get("def", []):
+        for tr in loc["tr"][:MAX_TRANSLATIONS]:
+            result[tr["def"]] = None
+    return list(result)
 
 
 def get_transcriptions(namespace) -> list[str]:
-    result = set()
-    for loc in namespace["regular"]:
-        if "ts" in loc:
-            result.add(loc["ts"])
-    return list(result)
+    return parse_lookup(namespace).transcriptions
 
 
 def get_verb_forms(namespace) -> dict:
-    result = {}
-    for loc in namespace["regular"]:
-        if "pos" not in loc:
-            continue
-        if loc["pos"]["tooltip"] != "verb":
-            continue
-        if "prdg" not in loc:
-            continue
-        rows = loc["prdg"]["data"][0]["tables"][0]["rows"]
-        result["indefinite"] = [i.replace("(had) ", "") for i in rows[0]]
-        result["participle"] = [i.replace("(had) ", "") for i in rows[2]]
-    return result
+    lookup = parse_lookup(namespace)
+    if not lookup.past_indefinite and not lookup.past_participle:
+        return {}
+    return dict(indefinite=lookup.past_indefinite, participle=lookup.past_participle)
 
 
 def get_noun_plural(namespace) -> list[str]:
-    result = []
-    for loc in namespace["regular"]:
-        if "pos" not in loc:
-            continue
-        if loc["pos"]["tooltip"] != "noun":
-            continue
-        if "prdg" not in loc:
-            continue
-        result.append(loc["prdg"]["data"][0]["tables"][0]["rows"][0][1])
-    return result
+    return parse_lookup(namespace).noun_plural
 
 
 def get_idioms(namespace) -> list[list[str]]:
-    result = []
-    for row in namespace["result"]["examples"]:
-        if row["ref"]["type"] != "idiom":
-            continue
-        result.append([row["src"], row["dst"]])
-    return result
+    return parse_corpus(namespace)[1]
 
 
 def get_examples(namespace) -> list[list[str]]:
-    result = []
-    for row in namespace["result"]["examples"]:
-        if row["ref"]["type"] == "idiom":
-            continue
-        result.append([row["src"], row["dst"]])
-    return result
-
-
-class YandexTranslator(BaseAccessor):
+    return parse_corpus(namespace)[0]
+
+
+def parse_word(translation_code: str,
+               original: str,
+               responses: dict[str, bytes],
+               lookup_namespace: Optional[dict] = None) -> WordDC:
+    """
+    A word from raw responses of the translator by ResponseKind,
+    the same for new words and for words parsed again from ResponseArchive.
+    lookup_namespace - the lookup response of translation_code if it is decoded already.
+    """
+    if lookup_namespace is None:
+        lookup_namespace = orjson.loads(responses[ResponseKind.lookup])[translation_code]
+    lookup = parse_lookup(lookup_namespace)
+    translations = lookup.translations
+    if not translations and ResponseKind.exclusive in responses:
+        translations = get_exclusive(orjson.loads(responses[ResponseKind.exclusive])[translation_code])
+    examples, idioms = parse_corpus(orjson.loads(responses[ResponseKind.corpus]), limit=MAX_EXAMPLES)
+    return WordDC(translation_code=translation_code,
+                  original=lookup.original or original,
+                  transcription=lookup.transcriptions,
+                  translations=translations,
+                  past_indefinite=lookup.past_indefinite,
+                  past_participle=lookup.past_participle,
+                  noun_plural=lookup.noun_plural,
+                  examples=examples,
+                  idioms=idioms,
+                  audio_id=None,
+                  added_at=now())
+
+
+class YandexTranslator(TranslatorBackend):
+    name = "yandex"
     session: ClientSession
+    archive: Optional[ResponseArchive] = None
+    archive_lock: asyncio.Lock
 
     async def connect(self) -> None:
         self.session = ClientSession(connector=TCPConnector(verify_ssl=False, force_close=True))
+        self.archive_lock = asyncio.Lock()
+        archive_file = self.app.config.translator.archive_file
+        if archive_file is not None:
+            self.archive = await run_blocking(ResponseArchive, pathlib.Path(archive_file))
 
     async def disconnect(self) -> None:
         await self.session.close()
+        if self.archive is not None:
+            async with self.archive_lock:
+                await run_blocking(self.archive.close)
 
-    async def get(self, url: str) -> dict:
-        try:
-            async with self.session.get(url) as response:
-                response.raise_for_status()
-                return await response.json()
-        except Exception as e:
-            logger.exception(e)
-            await asyncio.sleep(5.0)
+    async def get(self, url: str) -> bytes:
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
 
     async def translate(self, translation_code: str, original: str) -> WordDC:
-        logger.info(f"({translation_code}) {original}")
+        logger.info("(%s) %s", translation_code, original)
         url_translate = f"https://dictionary.yandex.net/dicservice.json/lookupMultiple?" \
                         f"text={original}&lang={translation_code}&flags=15783&dict={translation_code}"
         url_examples = f"https://dictionary.yandex.net/dicservice.json/queryCorpus?" \
@@ -121,26 +191,16 @@ class YandexTranslator(BaseAccessor):
                         f"srv=tr-text&text={original}&type=regular&lang={translation_code}" \
                         f"&flags=1255&dict={translation_code}.regular"
 
-        base_namespace = (await self.get(url_translate))[translation_code]
-        translations = get_translations(base_namespace)
-        if not translations:
-            exclusive_namespace = (await self.get(url_exclusive))[translation_code]
-            exclusive_translations = get_exclusive(exclusive_namespace)
-            translations.extend(exclusive_translations)
-
-        verb_forms = get_verb_forms(base_namespace)
-
-        examples_namespace = await self.get(url_examples)
-
+        responses = {ResponseKind.lookup: await self.get(url_translate)}
+        lookup_namespace = orjson.loads(responses[ResponseKind.lookup])[translation_code]
+        if not has_translations(lookup_namespace):
+            responses[ResponseKind.exclusive] = await self.get(url_exclusive)
+        responses[ResponseKind.corpus] = await self.get(url_examples)
+
+        # before parsing: responses which the parser fails on are the ones to parse again
+        if self.archive is not None:
+            async with self.archive_lock:  # one sqlite connection for all threads
+                await run_blocking(self.archive.put, translation_code, original, responses)
+        word = parse_word(translation_code, original, responses, lookup_namespace)
         logger.info("done")
-        return WordDC(translation_code=translation_code,
-                      original=get_correct_original(base_namespace) or original,
-                      transcription=get_transcriptions(base_namespace),
-                      translations=translations,
-                      past_indefinite=verb_forms.get("indefinite", []),
-                      past_participle=verb_forms.get("participle", []),
-                      noun_plural=get_noun_plural(base_namespace),
-                      examples=get_examples(examples_namespace)[:30],
-                      idioms=get_idioms(examples_namespace)[:30],
-                      audio_id=None,
-                      added_at=now())
+        return word
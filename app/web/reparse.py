@@ -0,0 +1,59 @@
+"""
+Parses words again from ResponseArchive, e.g. after a change of the parser, without the translator:
+chunks of the archive are parsed in worker processes, profiles are written by WordAccessor.update_profiles.
+"""
+import asyncio
+import multiprocessing
+import pathlib
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from app.logger import logger
+from app.store.words.models import WordDC
+from app.web.archive import ResponseArchive
+from app.web.parser import parse_word
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+def parse_rows(filename: pathlib.Path, first_rowid: int, last_rowid: int) -> list[WordDC]:
+    """
+    Runs in a worker process, found words of the archive rows with rowid in [first_rowid, last_rowid].
+    """
+    archive = ResponseArchive(filename, create=False)
+    try:
+        result = []
+        for translation_code, original, responses in archive.read(first_rowid, last_rowid):
+            try:
+                word = parse_word(translation_code, original, responses)
+            except Exception as e:
+                logger.warning("failed to parse %r: %r", original, e)
+                continue
+            if word.translations:
+                result.append(word)
+        return result
+    finally:
+        archive.close()
+
+
+async def reparse_archive(app: "Application", filename: pathlib.Path, processes: int, chunk_size: int) -> int:
+    """
+    Returns the number of updated words.
+    """
+    archive = ResponseArchive(filename, create=False)
+    try:
+        first, last = archive.rowid_bounds()
+    finally:
+        archive.close()
+
+    loop = asyncio.get_running_loop()
+    n_updated = 0
+    # spawned workers do not inherit connections and threads of the app
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [loop.run_in_executor(executor, parse_rows, filename, i, min(i + chunk_size - 1, last))
+                   for i in range(first, last + 1, chunk_size)]
+        for i, future in enumerate(asyncio.as_completed(futures)):
+            n_updated += await app.store.words.update_profiles(await future)
+            logger.info("parsed %s of %s chunks, %s words updated", i + 1, len(futures), n_updated)
+    return n_updated
@@ -0,0 +1,114 @@
+import pathlib
+import time
+import typing
+from typing import Optional
+
+import orjson
+
+from app.base.accessor import BaseAccessor
+from app.logger import logger
+from app.store.words.models import WordDC
+from app.utils import now, run_blocking
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class TranslationError(Exception):
+    pass
+
+
+class TranslatorBackend(BaseAccessor):
+    """
+    A source of translations, see Translator. translate() raises on failures
+    (timeouts, HTTP errors, unexpected payloads) and returns a word
+    without translations when the word is not found.
+    """
+    name: str
+
+
+class CircuitBreaker:
+    """
+    Closed: requests go through. After failure_threshold failures in a row it opens,
+    requests are rejected for reset_timeout seconds, then a single trial request
+    is let through (half-open): its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self.trial = True
+        return True
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.trial or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial = False
+
+    def cancel(self) -> None:
+        """
+        The request was cancelled, e.g. another backend answered first.
+        """
+        self.trial = False
+
+
+class LocalDictionary(TranslatorBackend):
+    """
+    Words from translator.dictionary_file, JSON lines with the fields of WordDC
+    except audio_id and added_at, e.g. an export of the words table.
+    """
+    name = "local"
+
+    def __init__(self, app: "Application"):
+        super().__init__(app)
+        self.words: dict[tuple[str, str], dict] = {}
+
+    async def connect(self) -> None:
+        filename = self.app.config.translator.dictionary_file
+        if filename is None:
+            return
+        self.words = await run_blocking(self.load, pathlib.Path(filename))
+        logger.info("local dictionary: %s words", len(self.words))
+
+    @staticmethod
+    def load(filename: pathlib.Path) -> dict[tuple[str, str], dict]:
+        result = {}
+        with open(filename, "rb") as f:
+            for line in f:
+                if line.strip():
+                    word = orjson.loads(line)
+                    result[(word["translation_code"], word["original"])] = word
+        return result
+
+    async def translate(self, translation_code: str, original: str) -> WordDC:
+        word = self.words.get((translation_code, original), {})
+        return WordDC(translation_code=translation_code,
+                      original=original,
+                      transcription=word.get("transcription", []),
+                      translations=word.get("translations", []),
+                      past_indefinite=word.get("past_indefinite", []),
+                      past_participle=word.get("past_participle", []),
+                      noun_plural=word.get("noun_plural", []),
+                      examples=word.get("examples", []),
+                      idioms=word.get("idioms", []),
+                      audio_id=None,
+                      added_at=now())
@@ -0,0 +1,135 @@
+import asyncio
+import time
+import typing
+from collections import deque
+from contextlib import suppress
+from typing import Optional
+
+from app.base.accessor import BaseAccessor
+from app.logger import logger
+from app.metrics import translator_requests
+from app.store.words.models import WordDC
+from app.web.parser import YandexTranslator
+from app.web.translation import CircuitBreaker, LocalDictionary, TranslationError, TranslatorBackend
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+BACKENDS: dict[str, type[TranslatorBackend]] = {
+    "yandex": YandexTranslator,
+    "local": LocalDictionary,
+}
+
+MIN_LATENCY_SAMPLES = 20
+
+
+class Translator(BaseAccessor):
+    """
+    Asks translator.backends in their order. The next backend is asked when the previous
+    one fails, finds nothing or does not answer within its p95 latency (hedged requests),
+    the first answer with translations wins and the rest are cancelled.
+    A backend which fails repeatedly is skipped by its circuit breaker for a while,
+    so an outage does not make every word addition wait for a timeout.
+    """
+    dependencies = (TranslatorBackend,)
+
+    def __init__(self, app: "Application", backends: list[TranslatorBackend]):
+        super().__init__(app)
+        config = app.config.translator
+        self.backends = backends
+        self.breakers = {i.name: CircuitBreaker(config.failure_threshold, config.reset_timeout) for i in backends}
+        self.latencies: dict[str, deque[float]] = {i.name: deque(maxlen=100) for i in backends}
+
+    def hedge_delay(self, backend: TranslatorBackend) -> float:
+        config = self.app.config.translator
+        latencies = self.latencies[backend.name]
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return config.hedge_after
+        p95 = sorted(latencies)[int(len(latencies) * 0.95)]
+        return max(p95, config.hedge_min)
+
+    async def ask(self, backend: TranslatorBackend, translation_code: str, original: str) -> WordDC:
+        breaker = self.breakers[backend.name]
+        start = time.monotonic()
+        try:
+            word = await asyncio.wait_for(backend.translate(translation_code, original),
+                                          self.app.config.translator.request_timeout)
+        except asyncio.CancelledError:
+            breaker.cancel()
+            translator_requests.inc(backend=backend.name, result="cancelled")
+            raise
+        except Exception as e:
+            breaker.failure()
+            translator_requests.inc(backend=backend.name, result="error")
+            if breaker.is_open:
+                logger.warning("translator %s is failing, last error: %r", backend.name, e)
+            raise
+        breaker.success()
+        self.latencies[backend.name].append(time.monotonic() - start)
+        translator_requests.inc(backend=backend.name, result="ok" if word.translations else "not_found")
+        return word
+
+    def next_backend(self, backends: list[TranslatorBackend]) -> Optional[TranslatorBackend]:
+        """
+        Pops the next backend whose circuit is not open.
+        """
+        while backends:
+            backend = backends.pop(0)
+            if self.breakers[backend.name].allow():
+                return backend
+            translator_requests.inc(backend=backend.name, result="rejected")
+        return None
+
+    async def translate(self, translation_code: str, original: str) -> WordDC:
+        """
+        Raises TranslationError when no backend answered, a word without translations means not found.
+        """
+        config = self.app.config.translator
+        deadline = time.monotonic() + config.timeout
+        backends = list(self.backends)
+        pending: dict[asyncio.Task, TranslatorBackend] = {}
+        not_found: Optional[WordDC] = None
+        errors = []
+        try:
+            while 1:
+                backend = self.next_backend(backends)
+                if backend is not None:
+                    pending[asyncio.create_task(self.ask(backend, translation_code, original))] = backend
+                if not pending:
+                    break
+                timeout = deadline - time.monotonic()
+                hedged = backend is not None and bool(backends)
+                if hedged:
+                    timeout = min(self.hedge_delay(backend), timeout)
+                if timeout <= 0:
+                    break
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done and not hedged:
+                    break
+                for task in done:
+                    backend = pending.pop(task)
+                    if task.exception() is not None:
+                        errors.append(f"{backend.name}: {task.exception()!r}")
+                        continue
+                    word = task.result()
+                    if word.translations:
+                        return word
+                    not_found = not_found or word
+        finally:
+            for task in pending:
+                task.cancel()
+            for task in pending:
+                with suppress(asyncio.CancelledError, Exception):
+                    await task
+        if not_found is not None:
+            return not_found
+        if pending:
+            errors.append(f"timed out after {config.timeout}s")
+        if not errors:
+            errors.append("all translators are unavailable")
+        raise TranslationError(f"{original!r} is not translated: {', '.join(errors)}")
+
+
+def create_translator(app: "Application") -> Translator:
+    backends = [BACKENDS[name](app) for name in app.config.translator.backends]
+    return Translator(app, backends)
@@ -0,0 +1,57 @@
+"""
+Inline query completion of WordIndex: build time of PrefixIndex for a vocabulary
+of random words and the latency of completions of their prefixes.
+
+    python -m benchmarks.autocomplete --words 500000
+
+No database or network is needed.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.spelling import random_word
+from benchmarks.utils import stopwatch, report
+from app.store.words.autocomplete import PrefixIndex, WordCard
+
+
+def random_card(word_id: int) -> WordCard:
+    return WordCard(id=word_id, translation_code="en-ru", original=random_word(), transcription=["ˈwɜːd"],
+                    translations=["слово", "высказывание"], past_indefinite=[], past_participle=[], noun_plural=[])
+
+
+def run(n_words: int, n_lookups: int, batch_size: int, limit: int):
+    cards = [random_card(i) for i in range(n_words)]
+
+    start = time.perf_counter()
+    index = PrefixIndex()
+    for i in range(0, len(cards), batch_size):
+        index.add_many(cards[i:i + batch_size])
+    print(f"words={len(index)} build={time.perf_counter() - start:.2f}s (batches of {batch_size})")
+
+    latency = []
+    for card in random.sample(cards, n_lookups):
+        with stopwatch(latency):
+            index.add(random_card(card.id))
+    print(report("add", latency))
+
+    for length in (1, 2, 4):
+        latency = []
+        for card in random.sample(cards, n_lookups):
+            with stopwatch(latency):
+                index.complete(card.original[:length], limit)
+        print(report(f"complete {length} letters", latency))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    run(args.words, args.lookups, args.batch_size, args.limit)
+
+
+if __name__ == "__main__":
+    main()
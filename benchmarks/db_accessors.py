@@ -0,0 +1,394 @@
+"""
+Times every UserAccessor and WordAccessor method on a seeded database
+and saves EXPLAIN ANALYZE plans of the queries they run, captured from the calls.
+Maintenance methods which rewrite whole tables (rebuild_reminders, replan_reviews,
+update_profiles, convert_profiles) and the reminder setters (plain redis writes) are not included.
+
+    python -m benchmarks.db_accessors --seed --users 100000 --words 500000 --user-words 500
+    python -m benchmarks.db_accessors --samples 1000 --plans-dir plans/v1.2
+    python -m benchmarks.db_accessors --seed --plain --plans-dir plans/plain
+
+--seed truncates users, words and user_words (with the archive), so use a dedicated database.
+Without it the data of the previous seeding is reused, which makes runs of
+different releases comparable. Write methods run in a rolled back transaction.
+Plans are saved as one text file per method, so two releases can be compared with diff.
+--plain seeds user_words as one table instead of hash partitions to measure the difference.
+"""
+import argparse
+import asyncio
+import pathlib
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from unittest.mock import patch
+
+import asyncpg
+from gino.dialects import asyncpg as gino_asyncpg
+
+from benchmarks.utils import CONFIG_FILE, connected_app, stopwatch, report
+from app.database.partitioning import OnlineRewrite
+from app.store.users.models import UserDC, UserLangDC, UserWordDC, UserWordModel
+from app.store.words.models import WordDC
+from app.utils import now
+from app.web.app import Application
+
+TRANSLATION_CODE = "en-ru"
+USER_WORDS_CONSTRAINTS = [
+    "UNIQUE (user_id, word_id)",
+    "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+    "FOREIGN KEY (word_id) REFERENCES words (id) ON DELETE CASCADE",
+]
+SESSION_SEED = 42  # of a random session order
+SESSION_CHUNK = 20
+BATCH = 10  # words of add_words, get_words and add_user_words
+
+SEED_PROFILE = """{"transcription": ["wɜːd"], "translations": ["слово", "речь", "обещание"],
+"past_indefinite": [], "past_participle": [], "noun_plural": ["words"],
+"examples": [["a word of advice", "совет"], ["in a word", "одним словом"]], "idioms": []}"""
+
+SEED_USERS = """
+INSERT INTO users (id, is_bot, username, first_name, last_name, language_code, joined_at)
+SELECT g, false, 'user' || g, 'first' || g, 'last' || g, 'ru', now()
+FROM generate_series($1::integer, $2::integer) g
+"""
+
+SEED_USER_LANGS = """
+INSERT INTO user_langs (user_id, translation_code)
+SELECT g, $3 FROM generate_series($1::integer, $2::integer) g
+"""
+
+SEED_WORDS = """
+INSERT INTO words (id, translation_code, original, profile, audio_id, added_at)
+SELECT g, $3, 'word' || g, $4::jsonb, 'audio' || g, now()
+FROM generate_series($1::integer, $2::integer) g
+"""
+
+# Word k of user u is word_id(u, k), see SeedLayout.
+# 30% of words are not remembered yet, the others are due to recall
+# from 5 days ago to 15 days ahead, so every query gets a realistic share of rows.
+SEED_USER_WORDS = """
+INSERT INTO user_words (user_id, translation_code, word_id, added_at, remembered_at,
+                        next_show_original, next_show_translation, n_shown_original, n_shown_translation)
+SELECT u, $3, 1 + (u::bigint * $4 + k) % $5, now() - interval '30 days',
+       CASE WHEN k % 10 >= 3 THEN now() - interval '20 days' END,
+       CASE WHEN k % 10 >= 3 THEN now() + ((k * 37) % 20 - 5) * interval '1 day' END,
+       CASE WHEN k % 10 >= 3 THEN now() + ((k * 53) % 20 - 5) * interval '1 day' END,
+       CASE WHEN k % 10 >= 3 THEN k % 4 ELSE 0 END,
+       CASE WHEN k % 10 >= 3 THEN k % 4 ELSE 0 END
+FROM generate_series($1::integer, $2::integer) u, generate_series(0, $4 - 1) k
+"""
+
+
+@dataclass
+class SeedLayout:
+    n_users: int
+    n_words: int
+    n_user_words: int
+
+    def word_id(self, user_id: int, k: int) -> int:
+        return 1 + (user_id * self.n_user_words + k) % self.n_words
+
+    def random_user(self) -> int:
+        return random.randint(1, self.n_users)
+
+    def random_user_word(self) -> tuple[int, int]:
+        user_id = self.random_user()
+        return user_id, self.word_id(user_id, random.randrange(self.n_user_words))
+
+    def random_remembered_user_word(self) -> tuple[int, int]:
+        user_id = self.random_user()
+        k = random.randrange(self.n_user_words)
+        while k % 10 < 3:
+            k = random.randrange(self.n_user_words)
+        return user_id, self.word_id(user_id, k)
+
+    def random_user_word_row(self) -> tuple[int, int]:
+        # seeded rows of a user have consecutive ids
+        user_id = self.random_user()
+        return user_id, (user_id - 1) * self.n_user_words + random.randint(1, self.n_user_words)
+
+    def random_word(self) -> int:
+        return random.randint(1, self.n_words)
+
+
+@dataclass
+class Case:
+    name: str
+    call: Callable[[Application, SeedLayout], Awaitable]
+    writes: bool = False
+    max_samples: Optional[int] = None  # for methods which read whole tables
+
+
+def user_args(layout: SeedLayout) -> tuple:
+    return layout.random_user(), TRANSLATION_CODE
+
+
+def new_user(layout: SeedLayout) -> UserDC:
+    user_id = layout.n_users + random.randint(1, layout.n_users)
+    return UserDC(id=user_id, is_bot=False, username=f"user{user_id}", first_name="first", last_name="last",
+                  language_code="ru", joined_at=now())
+
+
+def new_user_word(layout: SeedLayout) -> UserWordDC:
+    user_id, word_id = layout.random_user_word()
+    return UserWordDC(user_id=user_id, translation_code=TRANSLATION_CODE, word_id=word_id, added_at=now())
+
+
+def new_user_words(layout: SeedLayout, n: int = BATCH) -> list[UserWordDC]:
+    user_id = layout.random_user()
+    word_ids = {layout.random_word() for _ in range(n)}
+    return [UserWordDC(user_id=user_id, translation_code=TRANSLATION_CODE, word_id=i, added_at=now())
+            for i in word_ids]
+
+
+def new_word(original: str) -> WordDC:
+    return WordDC(translation_code=TRANSLATION_CODE, original=original, transcription=["wɜːd"],
+                  translations=["слово"], past_indefinite=[], past_participle=[], noun_plural=["words"],
+                  examples=[["a word of advice", "совет"]], idioms=[], audio_id=None, added_at=now())
+
+
+def new_words(n: int = BATCH) -> list[WordDC]:
+    originals = {f"new{random.randint(1, 10 ** 9)}" for _ in range(n)}
+    return [new_word(i) for i in originals]
+
+
+def originals(layout: SeedLayout, n: int = BATCH) -> list[str]:
+    return [f"word{layout.random_word()}" for _ in range(n)]
+
+
+CASES = [
+    Case("users.add_user",
+         lambda app, layout: app.store.users.add_user(new_user(layout)),
+         writes=True),
+    Case("users.get_users",
+         lambda app, layout: app.store.users.get_users(),
+         max_samples=5),
+    Case("users.add_user_lang",
+         lambda app, layout: app.store.users.add_user_lang(UserLangDC(user_id=layout.random_user(),
+                                                                      translation_code="en-de")),
+         writes=True),
+    Case("users.get_user_langs",
+         lambda app, layout: app.store.users.get_user_langs(layout.random_user())),
+    Case("users.add_user_word",
+         lambda app, layout: app.store.users.add_user_word(new_user_word(layout)),
+         writes=True),
+    Case("users.add_user_words",
+         lambda app, layout: app.store.users.add_user_words(new_user_words(layout)),
+         writes=True),
+    Case("users.count_user_words",
+         lambda app, layout: app.store.users.count_user_words(*user_args(layout))),
+    Case("users.count_to_remember_user_words",
+         lambda app, layout: app.store.users.count_to_remember_user_words(*user_args(layout))),
+    Case("users.count_to_recall_user_words",
+         lambda app, layout: app.store.users.count_to_recall_user_words(*user_args(layout))),
+    Case("users.get_user_words",
+         lambda app, layout: app.store.users.get_user_words(*user_args(layout))),
+    Case("users.set_remembered",
+         lambda app, layout: app.store.users.set_remembered(*layout.random_user_word()),
+         writes=True),
+    Case("users.set_shown_original",
+         lambda app, layout: app.store.users.set_shown_original(*layout.random_remembered_user_word()),
+         writes=True),
+    Case("users.set_shown_translation",
+         lambda app, layout: app.store.users.set_shown_translation(*layout.random_remembered_user_word()),
+         writes=True),
+    Case("users.delete_word",
+         lambda app, layout: app.store.users.delete_word(*layout.random_user_word()),
+         writes=True),
+    Case("users.get_words_to_remember",
+         lambda app, layout: app.store.users.get_words_to_remember(*user_args(layout))),
+    Case("users.get_words_to_recall",
+         lambda app, layout: app.store.users.get_words_to_recall(*user_args(layout))),
+    Case("users.get_ids_user_words",
+         lambda app, layout: app.store.users.get_ids_user_words(*user_args(layout))),
+    Case("users.get_ids_words_to_remember",
+         lambda app, layout: app.store.users.get_ids_words_to_remember(*user_args(layout))),
+    Case("users.get_ids_original_words_to_recall",
+         lambda app, layout: app.store.users.get_ids_original_words_to_recall(*user_args(layout))),
+    Case("users.get_ids_translation_words_to_recall",
+         lambda app, layout: app.store.users.get_ids_translation_words_to_recall(*user_args(layout))),
+    Case("users.get_session_to_remember",
+         lambda app, layout: app.store.users.get_session_to_remember(*user_args(layout),
+                                                                     SESSION_SEED, None, SESSION_CHUNK)),
+    Case("users.get_session_to_recall",
+         lambda app, layout: app.store.users.get_session_to_recall(*user_args(layout),
+                                                                   SESSION_SEED, None, SESSION_CHUNK, now())),
+    Case("users.get_due_reminders",
+         lambda app, layout: app.store.users.get_due_reminders(now(), 100)),
+    Case("users.get_next_due",
+         lambda app, layout: app.store.users.get_next_due(layout.random_user(), now())),
+    Case("words.add_word",
+         lambda app, layout: app.store.words.add_word(new_word(f"new{random.randint(1, 10 ** 9)}")),
+         writes=True),
+    Case("words.add_words",
+         lambda app, layout: app.store.words.add_words(new_words()),
+         writes=True),
+    Case("words.get_word",
+         lambda app, layout: app.store.words.get_word(TRANSLATION_CODE, f"word{layout.random_word()}")),
+    Case("words.get_words",
+         lambda app, layout: app.store.words.get_words(TRANSLATION_CODE, originals(layout))),
+    Case("words.get_word_by_id",
+         lambda app, layout: app.store.words.get_word_by_id(layout.random_word())),
+]
+
+
+@contextmanager
+def capture_queries() -> list[tuple[str, tuple]]:
+    """
+    (query, args) of everything the accessors run, in order: plain asyncpg queries
+    and GINO statements, which bypass Connection._execute.
+    """
+    result = []
+    connection_execute = asyncpg.Connection._execute
+    prepared_execute = gino_asyncpg.PreparedStatement._execute
+    cursor_execute = gino_asyncpg.DBAPICursor.async_execute
+
+    async def connection_wrapper(self, query, args, *rest, **kwargs):
+        result.append((query, tuple(args)))
+        return await connection_execute(self, query, args, *rest, **kwargs)
+
+    async def prepared_wrapper(self, params, one):
+        result.append((self.context.statement, tuple(params)))
+        return await prepared_execute(self, params, one)
+
+    async def cursor_wrapper(self, query, timeout, args, limit=0, many=False):
+        if not many:
+            result.append((query, tuple(args)))
+        return await cursor_execute(self, query, timeout, args, limit, many)
+
+    with patch.object(asyncpg.Connection, "_execute", connection_wrapper), \
+            patch.object(gino_asyncpg.PreparedStatement, "_execute", prepared_wrapper), \
+            patch.object(gino_asyncpg.DBAPICursor, "async_execute", cursor_wrapper):
+        yield result
+
+
+def rewrite_user_words(partitioned: bool) -> OnlineRewrite:
+    if partitioned:
+        return OnlineRewrite("user_words", "user_id", ["PRIMARY KEY (user_id, id)"] + USER_WORDS_CONSTRAINTS,
+                             partition_by="HASH (user_id)",
+                             n_partitions=UserWordModel.__table__.info["partitions"])
+    return OnlineRewrite("user_words", "user_id", ["PRIMARY KEY (id)"] + USER_WORDS_CONSTRAINTS)
+
+
+async def is_partitioned(app: Application) -> bool:
+    kind = await app.store.database.fetchval("SELECT relkind::text FROM pg_class WHERE relname = 'user_words'")
+    return kind == "p"
+
+
+async def seed(app: Application, layout: SeedLayout, partitioned: bool, batch_size: int = 1000):
+    database = app.store.database
+    await database.fetchval("TRUNCATE users, user_langs, words, user_words, user_words_archive RESTART IDENTITY")
+    if partitioned != await is_partitioned(app):
+        rewrite = rewrite_user_words(partitioned)
+        async with database.db.transaction():
+            for query in rewrite.prepare() + rewrite.swap():
+                await database.fetchval(query)
+
+    start = time.perf_counter()
+    await database.fetchval(SEED_WORDS, 1, layout.n_words, TRANSLATION_CODE, SEED_PROFILE)
+    await database.fetchval("SELECT setval('words_id_seq', $1)", layout.n_words)
+    for first in range(1, layout.n_users + 1, batch_size):
+        last = min(first + batch_size - 1, layout.n_users)
+        await database.fetchval(SEED_USERS, first, last)
+        await database.fetchval(SEED_USER_LANGS, first, last, TRANSLATION_CODE)
+        await database.fetchval(SEED_USER_WORDS, first, last, TRANSLATION_CODE,
+                                layout.n_user_words, layout.n_words)
+        print(f"\rseeded {last}/{layout.n_users} users in {time.perf_counter() - start:.0f}s", end="")
+    print()
+    await database.fetchval("VACUUM ANALYZE users")
+    await database.fetchval("VACUUM ANALYZE user_langs")
+    await database.fetchval("VACUUM ANALYZE words")
+    await database.fetchval("VACUUM ANALYZE user_words")
+
+
+async def load_layout(app: Application) -> SeedLayout:
+    database = app.store.database
+    n_users = await database.fetchval("SELECT count(*) FROM users")
+    n_words = await database.fetchval("SELECT count(*) FROM words")
+    n_user_words = await database.fetchval("SELECT count(*) FROM user_words WHERE user_id = 1")
+    if not n_users or not n_words or not n_user_words:
+        raise RuntimeError("database is not seeded, run with --seed")
+    return SeedLayout(n_users, n_words, n_user_words)
+
+
+async def measure(app: Application, layout: SeedLayout, case: Case, n_samples: int) -> list[float]:
+    db = app.store.database.db
+    latency = []
+    for _ in range(n_samples):
+        if case.writes:
+            async with db.transaction() as tx:
+                with stopwatch(latency):
+                    await case.call(app, layout)
+                tx.raise_rollback()
+        else:
+            with stopwatch(latency):
+                await case.call(app, layout)
+    return latency
+
+
+async def explain(app: Application, layout: SeedLayout, case: Case) -> str:
+    """
+    Plans of the queries which the method really runs, captured from one call
+    and replayed with EXPLAIN in the same order, both in rolled back transactions.
+    """
+    db = app.store.database.db
+    async with db.transaction() as tx:
+        with capture_queries() as queries:
+            await case.call(app, layout)
+        tx.raise_rollback()
+
+    result = []
+    async with db.transaction() as tx:
+        for query, args in queries:
+            rows = await tx.connection.raw_connection.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query}", *args)
+            result.append(query.strip() + "\n\n" + "\n".join(i[0] for i in rows) + "\n")
+        tx.raise_rollback()
+    return "\n".join(result)
+
+
+async def run(config_file: pathlib.Path, layout: SeedLayout, do_seed: bool, partitioned: bool, n_samples: int,
+              plans_dir: pathlib.Path, only: list[str]):
+    async with connected_app(config_file) as app:
+        if do_seed:
+            await seed(app, layout, partitioned)
+        layout = await load_layout(app)
+        print(f"users={layout.n_users} words={layout.n_words} user_words per user={layout.n_user_words} "
+              f"user_words layout={'partitioned' if await is_partitioned(app) else 'plain'}")
+
+        plans_dir.mkdir(parents=True, exist_ok=True)
+        for case in CASES:
+            if only and not any(i in case.name for i in only):
+                continue
+            await measure(app, layout, case, max(1, n_samples // 10))  # warm up caches
+            latency = await measure(app, layout, case, min(n_samples, case.max_samples or n_samples))
+            print(report(case.name, latency))
+            plan = await explain(app, layout, case)
+            if plan:  # redis-only methods have no queries
+                (plans_dir / f"{case.name}.txt").write_text(plan)
+        print(f"plans saved to {plans_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--seed", action="store_true", help="truncate tables and seed them anew")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--user-words", type=int, default=500, help="words of every user")
+    parser.add_argument("--plain", action="store_true", help="seed user_words without partitions to compare")
+    parser.add_argument("--samples", type=int, default=500, help="calls of every method")
+    parser.add_argument("--plans-dir", type=pathlib.Path, default=pathlib.Path("plans"))
+    parser.add_argument("--only", nargs="*", default=[], help="run methods whose names contain any of these")
+    args = parser.parse_args()
+    if args.user_words > args.words:
+        parser.error("--user-words must not exceed --words")
+    if args.plain and not args.seed:
+        parser.error("--plain needs --seed")
+    asyncio.run(run(args.config, SeedLayout(args.users, args.words, args.user_words),
+                    args.seed, not args.plain, args.samples, args.plans_dir, args.only))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Local stand-in for the Telegram Bot API, enough for the handlers of the bot.
+Bot(..., server=FakeTelegram.server) sends requests here.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from typing import Optional
+
+from aiogram.bot.api import TelegramAPIServer
+from aiohttp import web
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "bot", "username": "words_fan_bot"}
+
+# methods which show something to the user, synthetic users wait for them
+CONTENT_METHODS = {"sendmessage", "editmessagetext", "editmessagecaption",
+                   "sendaudio", "senddocument"}
+
+
+class FakeTelegram:
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8081, latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.server = TelegramAPIServer.from_base(f"http://{host}:{port}")
+        self.runner: Optional[web.AppRunner] = None
+        self.calls: dict[str, int] = defaultdict(int)
+        self.last_message_id: dict[int, int] = defaultdict(int)
+        self.n_content: dict[int, int] = defaultdict(int)
+        self.condition = asyncio.Condition()
+
+    async def start(self):
+        web_app = web.Application()
+        web_app.router.add_post("/bot{token}/{method}", self.handle)
+        self.runner = web.AppRunner(web_app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def wait_content(self, chat_id: int, n: int, timeout: float):
+        """
+        Waits until chat_id has received n messages (sent or edited) in total.
+        """
+        async with self.condition:
+            await asyncio.wait_for(self.condition.wait_for(lambda: self.n_content[chat_id] >= n), timeout)
+
+    def message(self, chat_id: int, **kwargs) -> dict:
+        self.last_message_id[chat_id] += 1
+        return dict(message_id=self.last_message_id[chat_id],
+                    date=int(time.time()),
+                    chat={"id": chat_id, "type": "private"},
+                    **{"from": BOT_USER},
+                    **kwargs)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        data = await request.post()
+        self.calls[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        chat_id = int(data["chat_id"]) if "chat_id" in data else None
+        if method in ("sendmessage", "editmessagetext"):
+            result = self.message(chat_id, text=data.get("text", ""))
+        elif method == "editmessagecaption":
+            result = self.message(chat_id, caption=data.get("caption", ""))
+        elif method == "sendaudio":
+            n = self.calls[method]
+            result = self.message(chat_id,
+                                  caption=data.get("caption", ""),
+                                  audio={"file_id": f"audio{n}", "file_unique_id": f"audio{n}", "duration": 1})
+        elif method == "senddocument":
+            n = self.calls[method]
+            result = self.message(chat_id, document={"file_id": f"doc{n}", "file_unique_id": f"doc{n}"})
+        elif method == "sendsticker":
+            result = self.message(chat_id, sticker={"file_id": data.get("sticker", ""), "file_unique_id": "s",
+                                                    "width": 1, "height": 1, "is_animated": False,
+                                                    "is_video": False})
+        elif method in ("deletemessage", "answercallbackquery"):
+            result = True
+        elif method == "getme":
+            result = BOT_USER
+        else:
+            return web.json_response({"ok": False, "error_code": 400, "description": f"unknown method {method}"})
+
+        if method in CONTENT_METHODS and chat_id is not None:
+            async with self.condition:
+                self.n_content[chat_id] += 1
+                self.condition.notify_all()
+        return web.json_response({"ok": True, "result": result})
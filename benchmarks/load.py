@@ -0,0 +1,215 @@
+"""
+Load test of the whole handlers pipeline against local Postgres and Redis.
+Telegram is replaced with FakeTelegram, Yandex with StubTranslator and gTTS with StubMediaGenerator.
+
+    python -m benchmarks.load --users 50 --words 10
+
+Every synthetic user runs /start, adds words, then a remember session and a recall session,
+waiting for the reply of the bot before the next update. Rows of synthetic users are removed
+before and after the run.
+"""
+import argparse
+import asyncio
+import itertools
+import pathlib
+import random
+import string
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from aiogram import Bot, Dispatcher, types
+from aiogram.contrib.fsm_storage.memory import MemoryStorage
+from aiogram.types import ParseMode
+
+from benchmarks.fake_telegram import FakeTelegram, BOT_USER
+from benchmarks.utils import CONFIG_FILE, percentile
+from app.bot import callback_data as cb
+from app.bot.base import MeteredBot, register_handlers
+from app.store.words.models import WordDC
+from app.utils import now
+from app.web.app import Application, setup_app
+from app.web.parser import YandexTranslator
+
+FIRST_USER_ID = 900_000_000
+TRANSLATION_CODE = "en-ru"
+
+
+class StubTranslator(YandexTranslator):
+    latency = 0.05
+
+    async def translate(self, translation_code: str, original: str) -> WordDC:
+        await asyncio.sleep(self.latency)
+        return WordDC(translation_code=translation_code,
+                      original=original,
+                      transcription=[original],
+                      translations=[f"{original}-перевод{i}" for i in range(3)],
+                      past_indefinite=[],
+                      past_participle=[],
+                      noun_plural=[f"{original}s"],
+                      examples=[[f"{original} example {i}", f"{original} пример {i}"] for i in range(10)],
+                      idioms=[],
+                      audio_id=None,
+                      added_at=now())
+
+
+class StubMediaGenerator:
+    filename = pathlib.Path(tempfile.gettempdir()) / "words_load_test.mp3"
+
+    @classmethod
+    @asynccontextmanager
+    async def generate_audio(cls, foreign_lang_code: str, original: str) -> pathlib.Path:
+        if not cls.filename.exists():
+            cls.filename.write_bytes(b"\x00" * 1024)
+        yield cls.filename
+
+
+class SyntheticUser:
+    update_ids = itertools.count(1)
+
+    def __init__(self, user_id: int, app: Application, dp: Dispatcher, telegram: FakeTelegram,
+                 words: list[str], timeout: float):
+        self.user_id = user_id
+        self.app = app
+        self.dp = dp
+        self.telegram = telegram
+        self.words = words
+        self.timeout = timeout
+        self.user = {"id": user_id, "is_bot": False, "first_name": f"user{user_id}",
+                     "last_name": "load", "username": f"user{user_id}", "language_code": "ru"}
+        self.chat = {"id": user_id, "type": "private"}
+        self.latency: dict[str, list[float]] = defaultdict(list)
+        self.n_errors = 0
+
+    async def send(self, action: str, update: dict, n_replies: int = 1):
+        expected = self.telegram.n_content[self.user_id] + n_replies
+        start = time.perf_counter()
+        await self.dp.process_update(types.Update.to_object(update))
+        try:
+            await self.telegram.wait_content(self.user_id, expected, self.timeout)
+            self.latency[action].append(time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            self.n_errors += 1
+
+    async def message(self, action: str, text: str, n_replies: int = 1):
+        update_id = next(self.update_ids)
+        await self.send(action, {
+            "update_id": update_id,
+            "message": {"message_id": update_id, "date": int(time.time()),
+                        "chat": self.chat, "from": self.user, "text": text},
+        }, n_replies)
+
+    async def press(self, action: str, data: cb.BaseCallbackData):
+        update_id = next(self.update_ids)
+        await self.send(action, {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id), "from": self.user, "chat_instance": str(self.user_id),
+                "data": data.dump(),
+                "message": {"message_id": self.telegram.last_message_id[self.user_id], "date": int(time.time()),
+                            "chat": self.chat, "from": BOT_USER, "text": "..."},
+            },
+        })
+
+    async def run(self):
+        await self.message("start", "/start", n_replies=2)
+        for word in self.words:
+            await self.message("add_word", word)
+
+        await self.press("main_menu", cb.MainMenu())
+        await self.press("remember_menu", cb.RememberWordsMenu())
+        await self.press("remember_question", cb.RememberWordsQuestion())
+        for i in range(len(self.words)):
+            await self.press("remember_answer", cb.RememberWordsAnswer(i=i))
+            await self.press("remember_question", cb.RememberWordsQuestion(i=i + 1, mem=True))
+
+        # as if the time to recall has come
+        await self.app.store.database.fetchval(
+            "UPDATE user_words SET next_show_original = now(), next_show_translation = now() "
+            "WHERE user_id = $1 AND remembered_at IS NOT NULL", self.user_id)
+
+        await self.press("recall_question", cb.RecallWordsQuestion())
+        for i in range(2 * len(self.words)):
+            await self.press("recall_answer", cb.RecallWordsAnswer(i=i))
+            await self.press("recall_question", cb.RecallWordsQuestion(i=i + 1, mem=True))
+
+
+def random_word() -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 10)))
+
+
+async def delete_users(app: Application, n_users: int):
+    await app.store.database.fetchval("DELETE FROM users WHERE id >= $1 AND id < $2",
+                                      FIRST_USER_ID, FIRST_USER_ID + n_users)
+
+
+async def run(config_file: pathlib.Path, port: int, n_users: int, n_words: int, vocabulary_size: int,
+              translator_latency: float, telegram_latency: float, timeout: float):
+    telegram = FakeTelegram(port=port, latency=telegram_latency)
+    await telegram.start()
+
+    application = setup_app(config_file)
+    bot = MeteredBot("123456:load-test", parse_mode=ParseMode.HTML, server=telegram.server)
+    dp = Dispatcher(bot, storage=MemoryStorage(), throttling_rate_limit=0)
+    Bot.set_current(bot)
+    Dispatcher.set_current(dp)
+
+    application.store.translator.backends = [StubTranslator(application)]  # in place of yandex
+    StubTranslator.latency = translator_latency
+    register_handlers(application, dp)
+    import app.bot.handlers
+    app.bot.handlers.MediaGenerator = StubMediaGenerator
+
+    await application.connect()
+    await delete_users(application, n_users)
+
+    vocabulary = [random_word() for _ in range(vocabulary_size)]
+    users = [SyntheticUser(FIRST_USER_ID + i, application, dp, telegram,
+                           random.sample(vocabulary, n_words), timeout)
+             for i in range(n_users)]
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*[i.run() for i in users])
+        wall_time = time.perf_counter() - start
+    finally:
+        await delete_users(application, n_users)
+        await application.disconnect()
+        await (await bot.get_session()).close()
+        await telegram.stop()
+
+    latency: dict[str, list[float]] = defaultdict(list)
+    for user in users:
+        for action, values in user.latency.items():
+            latency[action].extend(i * 1000 for i in values)
+    n_updates = sum(len(i) for i in latency.values())
+    n_errors = sum(i.n_errors for i in users)
+
+    print(f"users={n_users} words per user={n_words} vocabulary={vocabulary_size}")
+    print(f"updates={n_updates} timeouts={n_errors} wall={wall_time:.2f}s "
+          f"throughput={n_updates / wall_time:.1f} updates/s")
+    all_latency = list(itertools.chain(*latency.values()))
+    for action, values in sorted(latency.items()) + [("all", all_latency)]:
+        if values:
+            print(f"{action:>18}: n={len(values):<6} p50={percentile(values, 50):8.1f}ms "
+                  f"p99={percentile(values, 99):8.1f}ms")
+    print("bot api calls: " + ", ".join(f"{k}={v}" for k, v in sorted(telegram.calls.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--port", type=int, default=8081, help="port of the fake Bot API")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--words", type=int, default=10, help="words added by every user")
+    parser.add_argument("--vocabulary", type=int, default=200, help="distinct words of all users")
+    parser.add_argument("--translator-latency", type=float, default=0.05)
+    parser.add_argument("--telegram-latency", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for a reply")
+    args = parser.parse_args()
+    asyncio.run(run(args.config, args.port, args.users, args.words, args.vocabulary,
+                    args.translator_latency, args.telegram_latency, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Decoding and parsing of Yandex dictionary responses, on the payloads of tests/app/web/test_parser.py:
+stdlib json against orjson, field-by-field getters against the single-pass parse_lookup/parse_corpus.
+
+    python -m benchmarks.parser --repeat 2000
+
+No database or network is needed.
+"""
+import argparse
+import json
+
+import orjson
+
+from benchmarks.utils import stopwatch, report
+from app.web import parser
+from tests.app.web.test_parser import translation_namespace, examples_namespace
+
+PAYLOADS = {
+    "lookup": orjson.dumps({"head": {}, "en-ru": translation_namespace}),
+    "corpus": orjson.dumps(examples_namespace),
+}
+
+
+def parse_by_fields(lookup: dict, corpus: dict) -> tuple:
+    return (parser.get_correct_original(lookup),
+            parser.get_translations(lookup),
+            parser.get_transcriptions(lookup),
+            parser.get_verb_forms(lookup),
+            parser.get_noun_plural(lookup),
+            parser.get_examples(corpus)[:30],
+            parser.get_idioms(corpus)[:30])
+
+
+def parse_single_pass(lookup: dict, corpus: dict) -> tuple:
+    return parser.parse_lookup(lookup), parser.parse_corpus(corpus, limit=30)
+
+
+def run(n_repeat: int):
+    for name, payload in PAYLOADS.items():
+        for decoder, loads in (("json", json.loads), ("orjson", orjson.loads)):
+            latency = []
+            for _ in range(n_repeat):
+                with stopwatch(latency):
+                    loads(payload)
+            print(report(f"decode {name} ({len(payload)} bytes) {decoder}", latency))
+
+    lookup = orjson.loads(PAYLOADS["lookup"])["en-ru"]
+    corpus = orjson.loads(PAYLOADS["corpus"])
+    for title, func in (("by fields", parse_by_fields), ("single pass", parse_single_pass)):
+        latency = []
+        for _ in range(n_repeat):
+            with stopwatch(latency):
+                func(lookup, corpus)
+        print(report(f"parse {title}", latency))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=2000)
+    args = arg_parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
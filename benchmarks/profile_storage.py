@@ -0,0 +1,86 @@
+"""
+Compares JSONB and binary word profiles: table size, read latency and decode CPU.
+
+    python -m benchmarks.profile_storage --words 50000 --reads 2000
+
+Works on scratch tables, the real `words` table is not touched.
+"""
+import argparse
+import asyncio
+import pathlib
+import random
+import time
+
+import orjson
+
+from benchmarks.utils import CONFIG_FILE, connected_app, stopwatch, report
+from app.store.words.codec import encode_profile, decode_profile
+
+TABLES = {
+    "jsonb": "bench_words_jsonb",
+    "binary": "bench_words_binary",
+}
+
+
+def fake_profile(i: int) -> dict:
+    return dict(transcription=[f"ˈwɜːd{i}"],
+                translations=[f"перевод {i}-{j}" for j in range(random.randint(1, 10))],
+                past_indefinite=[f"word{i}ed"] if i % 5 == 0 else [],
+                past_participle=[f"word{i}ed"] if i % 5 == 0 else [],
+                noun_plural=[f"word{i}s"] if i % 3 == 0 else [],
+                examples=[[f"This is an example number {j} for word{i}.",
+                           f"Это пример номер {j} для слова{i}."] for j in range(random.randint(0, 30))],
+                idioms=[[f"idiom {j} with word{i}", f"идиома {j} со словом{i}"] for j in range(random.randint(0, 5))])
+
+
+async def run(config_file: pathlib.Path, n_words: int, n_reads: int):
+    profiles = [fake_profile(i) for i in range(n_words)]
+
+    async with connected_app(config_file) as app:
+        async with app.store.database.db.acquire() as conn:
+            raw = conn.raw_connection
+            await raw.execute(f"DROP TABLE IF EXISTS {TABLES['jsonb']}, {TABLES['binary']}")
+            await raw.execute(f"CREATE TABLE {TABLES['jsonb']} (id integer PRIMARY KEY, profile jsonb NOT NULL)")
+            await raw.execute(f"CREATE TABLE {TABLES['binary']} (id integer PRIMARY KEY, profile bytea NOT NULL)")
+            try:
+                await raw.copy_records_to_table(
+                    TABLES["jsonb"], records=[(i, orjson.dumps(p).decode()) for i, p in enumerate(profiles)])
+                await raw.copy_records_to_table(
+                    TABLES["binary"], records=[(i, encode_profile(p)) for i, p in enumerate(profiles)])
+                await raw.execute(f"VACUUM ANALYZE {TABLES['jsonb']}")
+                await raw.execute(f"VACUUM ANALYZE {TABLES['binary']}")
+
+                ids = [random.randrange(n_words) for _ in range(n_reads)]
+                for storage, table in TABLES.items():
+                    decode = orjson.loads if storage == "jsonb" else decode_profile
+                    size = await raw.fetchval(f"SELECT pg_total_relation_size('{table}')")
+
+                    latency = []
+                    rows = []
+                    for word_id in ids:
+                        with stopwatch(latency):
+                            rows.append(await raw.fetchval(f"SELECT profile FROM {table} WHERE id = $1", word_id))
+
+                    cpu_start = time.process_time()
+                    for row in rows:
+                        decode(row)
+                    cpu = time.process_time() - cpu_start
+
+                    print(f"[{storage}] table size: {size / 1024 ** 2:.2f} MB")
+                    print(f"[{storage}] {report('read', latency)}")
+                    print(f"[{storage}] decode cpu: {cpu / n_reads * 10 ** 6:.2f}us per row")
+            finally:
+                await raw.execute(f"DROP TABLE IF EXISTS {TABLES['jsonb']}, {TABLES['binary']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--reads", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.config, args.words, args.reads))
+
+
+if __name__ == "__main__":
+    main()
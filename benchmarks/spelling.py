@@ -0,0 +1,62 @@
+"""
+Spelling suggestions of WordIndex: build time and memory of SpellingIndex
+for a vocabulary of random words and the latency of lookups of their misspellings.
+
+    python -m benchmarks.spelling --words 50000 --prefix-length 5
+
+No database or network is needed.
+"""
+import argparse
+import random
+import string
+import time
+import tracemalloc
+
+from benchmarks.utils import stopwatch, report
+from app.store.words.spelling import SpellingIndex, allowed_distance
+
+
+def random_word() -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 12)))
+
+
+def misspell(word: str) -> str:
+    i = random.randrange(len(word))
+    return word[:i] + random.choice(string.ascii_lowercase) + word[i + 1:]
+
+
+def run(n_words: int, n_lookups: int, max_distance: int, prefix_length: int):
+    words = list({random_word() for _ in range(n_words)})
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = SpellingIndex(max_distance, prefix_length)
+    for word in words:
+        index.add(word)
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"words={len(index)} deletes={len(index.deletes)} "
+          f"build={elapsed:.2f}s memory={memory / 1024 ** 2:.0f}MB")
+
+    for title, terms in (("misspelled", [misspell(i) for i in random.sample(words, n_lookups)]),
+                         ("unknown", [random_word() for _ in range(n_lookups)])):
+        latency = []
+        for term in terms:
+            with stopwatch(latency):
+                index.lookup(term, allowed_distance(term, max_distance))
+        print(report(f"lookup {title}", latency))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--max-distance", type=int, default=2)
+    parser.add_argument("--prefix-length", type=int, default=5)
+    args = parser.parse_args()
+    run(args.words, args.lookups, args.max_distance, args.prefix_length)
+
+
+if __name__ == "__main__":
+    main()
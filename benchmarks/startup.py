@@ -0,0 +1,76 @@
+"""
+Measures cold startup: imports, setup_app and app.connect/disconnect,
+every run in a fresh interpreter.
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --runs 10 --mode check_migrations
+"""
+import argparse
+import asyncio
+import pathlib
+import subprocess
+import sys
+import time
+
+import orjson
+
+from benchmarks.utils import CONFIG_FILE, percentile
+
+
+def child(config_file: pathlib.Path, mode: str):
+    timings = {}
+
+    start = time.perf_counter()
+    from aiogram import Bot, Dispatcher
+    from app.bot.base import register_handlers
+    from app.web.app import setup_app
+    timings["import"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app = setup_app(config_file)
+    app.config.database.startup_mode = mode
+    dp = Dispatcher(Bot("123456:fake", validate_token=False))
+    register_handlers(app, dp)
+    timings["setup"] = time.perf_counter() - start
+
+    async def run():
+        start_ = time.perf_counter()
+        await app.connect()
+        timings["connect"] = time.perf_counter() - start_
+
+        start_ = time.perf_counter()
+        await app.disconnect()
+        timings["disconnect"] = time.perf_counter() - start_
+
+    asyncio.run(run())
+    print(orjson.dumps(timings).decode())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--mode", default="create_all")
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.config, args.mode)
+
+    results: dict[str, list[float]] = {}
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--child",
+                                 "--config", str(args.config), "--mode", args.mode],
+                                check=True, capture_output=True).stdout
+        for key, value in orjson.loads(output.splitlines()[-1]).items():
+            results.setdefault(key, []).append(value * 1000)
+
+    print(f"startup mode: {args.mode}, runs: {args.runs}")
+    for key, values in results.items():
+        print(f"{key:>10}: p50={percentile(values, 50):.1f}ms max={max(values):.1f}ms")
+    total = [sum(i) for i in zip(*results.values())]
+    print(f"{'total':>10}: p50={percentile(total, 50):.1f}ms max={max(total):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import pathlib
+import statistics
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from app.web.app import Application, setup_app
+
+CONFIG_FILE = pathlib.Path(__file__).resolve().parent.parent / "config.yml"
+
+
+@asynccontextmanager
+async def connected_app(config_file: pathlib.Path) -> Application:
+    app = setup_app(config_file)
+    await app.connect()
+    try:
+        yield app
+    finally:
+        await app.disconnect()
+
+
+@contextmanager
+def stopwatch(result: list[float]):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        result.append(time.perf_counter() - start)
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def report(title: str, values: list[float]) -> str:
+    values_ms = [i * 1000 for i in values]
+    return f"{title}: n={len(values_ms)} " \
+           f"p50={percentile(values_ms, 50):.3f}ms " \
+           f"p99={percentile(values_ms, 99):.3f}ms " \
+           f"max={max(values_ms):.3f}ms"
@@ -1,10 +1,10 @@
 import pathlib
 
-from aiogram import Bot, Dispatcher, executor
+from aiogram import Dispatcher, executor
 from aiogram.contrib.fsm_storage.memory import MemoryStorage
 from aiogram.types import ParseMode
 
-from app.bot.base import register_handlers
+from app.bot.base import MeteredBot, register_handlers
 
 from app.web.app import setup_app
 
@@ -13,7 +13,7 @@ def main():
     config_file = pathlib.Path(__file__).resolve().parent / "config.yml"
     app = setup_app(config_file)
 
-    bot = Bot(app.config.bot.token, parse_mode=ParseMode.HTML)
+    bot = MeteredBot(app.config.bot.token, parse_mode=ParseMode.HTML)
     dp = Dispatcher(bot, storage=MemoryStorage(), throttling_rate_limit=0.5)
     register_handlers(app, dp)
     executor.start_polling(dp, skip_updates=True,
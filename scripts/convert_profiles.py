@@ -0,0 +1,41 @@
+"""
+Converts word profiles between JSONB and binary storage.
+
+    python -m scripts.convert_profiles binary
+    python -m scripts.convert_profiles jsonb --batch-size 5000
+
+Set database.profile_storage in config.yml to the same value,
+otherwise new words will be written in the old format.
+"""
+import argparse
+import asyncio
+import pathlib
+
+from app.logger import logger
+from app.store.words.codec import ProfileStorage
+from app.web.app import setup_app
+
+CONFIG_FILE = pathlib.Path(__file__).resolve().parent.parent / "config.yml"
+
+
+async def convert(config_file: pathlib.Path, storage: str, batch_size: int):
+    app = setup_app(config_file, background=False)
+    await app.connect()
+    try:
+        n_converted = await app.store.words.convert_profiles(storage, batch_size=batch_size)
+        logger.info(f"converted {n_converted} words to {storage}")
+    finally:
+        await app.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("storage", choices=[ProfileStorage.jsonb, ProfileStorage.binary])
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(convert(args.config, args.storage, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Imports a word list: plain text, CSV or an Anki export (the first column is the word).
+
+    python -m scripts.import_words words.txt
+    python -m scripts.import_words deck.txt --user-id 123456 --concurrency 10
+
+Without --user-id words are only translated and added to the dictionary.
+"""
+import argparse
+import asyncio
+import pathlib
+from typing import Optional
+
+from app.logger import logger
+from app.store.words.importer import read_words
+from app.web.app import setup_app
+
+CONFIG_FILE = pathlib.Path(__file__).resolve().parent.parent / "config.yml"
+
+
+async def import_file(config_file: pathlib.Path, filename: pathlib.Path, translation_code: str,
+                      user_id: Optional[int], concurrency: Optional[int]):
+    app = setup_app(config_file, background=False)
+    if concurrency is not None:
+        app.config.importer.concurrency = concurrency
+    with open(filename, encoding="utf-8-sig", errors="replace") as f:
+        originals = read_words(f)
+    logger.info(f"read {len(originals)} words from {filename}")
+
+    await app.connect()
+    try:
+        result = await app.store.importer.import_words(translation_code, originals, user_id=user_id)
+        logger.info(f"translated {result.n_translated} new words, not found {len(result.not_found)}")
+        if user_id is not None:
+            logger.info(f"added {result.n_added} words to user {user_id}, {result.n_existed} were added before")
+    finally:
+        await app.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename", type=pathlib.Path)
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--translation-code", default="en-ru")
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--concurrency", type=int, help="overrides importer.concurrency")
+    args = parser.parse_args()
+    asyncio.run(import_file(args.config, args.filename, args.translation_code, args.user_id, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
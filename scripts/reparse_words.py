@@ -0,0 +1,47 @@
+"""
+Rebuilds word profiles from the archive of raw translator responses (translator.archive_file),
+e.g. after a change of the parser. Nothing is requested from the translator.
+
+    python -m scripts.reparse_words
+    python -m scripts.reparse_words --processes 8 --chunk-size 20000
+
+Words which are not in the archive are kept as they are.
+"""
+import argparse
+import asyncio
+import os
+import pathlib
+from typing import Optional
+
+from app.logger import logger
+from app.web.app import setup_app
+from app.web.reparse import reparse_archive
+
+CONFIG_FILE = pathlib.Path(__file__).resolve().parent.parent / "config.yml"
+
+
+async def reparse(config_file: pathlib.Path, archive_file: Optional[pathlib.Path], processes: int, chunk_size: int):
+    app = setup_app(config_file, background=False)
+    archive_file = archive_file or app.config.translator.archive_file
+    if archive_file is None:
+        raise SystemExit("translator.archive_file is not set")
+    await app.connect()
+    try:
+        n_updated = await reparse_archive(app, pathlib.Path(archive_file), processes, chunk_size)
+        logger.info(f"updated {n_updated} words")
+    finally:
+        await app.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--archive", type=pathlib.Path, help="overrides translator.archive_file")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(reparse(args.config, args.archive, args.processes, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
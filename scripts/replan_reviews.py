@@ -0,0 +1,52 @@
+"""
+Recomputes due dates of remembered words, archived ones included, after scheduler settings in config.yml are changed.
+
+    python -m scripts.replan_reviews --from ladder
+    python -m scripts.replan_reviews --from fsrs --from-retention 0.85 --batch-size 200000
+
+Options --from* describe the previous settings, the rest is taken from config.yml.
+"""
+import argparse
+import asyncio
+import dataclasses
+import pathlib
+from typing import Optional
+
+from app.logger import logger
+from app.store.users.scheduler import SCHEDULERS, create_scheduler
+from app.web.app import setup_app
+
+CONFIG_FILE = pathlib.Path(__file__).resolve().parent.parent / "config.yml"
+
+
+async def replan(config_file: pathlib.Path, kind: str, ladder: Optional[list[float]],
+                 retention: Optional[float], batch_size: int):
+    app = setup_app(config_file, background=False)
+    changes = {"kind": kind}
+    if ladder is not None:
+        changes["ladder"] = ladder
+    if retention is not None:
+        changes["desired_retention"] = retention
+    old = create_scheduler(dataclasses.replace(app.config.scheduler, **changes))
+
+    await app.connect()
+    try:
+        n_replanned = await app.store.users.replan_reviews(old, batch_size=batch_size)
+        logger.info(f"replanned {n_replanned} words from {kind} to {app.config.scheduler.kind}")
+    finally:
+        await app.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--from", dest="kind", choices=list(SCHEDULERS), required=True)
+    parser.add_argument("--from-ladder", type=float, nargs="+")
+    parser.add_argument("--from-retention", type=float)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(replan(args.config, args.kind, args.from_ladder, args.from_retention, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
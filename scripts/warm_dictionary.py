@@ -0,0 +1,69 @@
+"""
+Translates the most frequent words and uploads their audio in advance.
+
+    python -m scripts.warm_dictionary en_50k.txt --top 5000
+    python -m scripts.warm_dictionary en_50k.txt --top 5000 --max-duration 3600 --checkpoint warm.json
+
+The list is sorted by frequency, the word is the first column ("the 23135851162").
+With --checkpoint the next run continues where the previous one stopped,
+e.g. a cron job in off-peak hours with --max-duration.
+"""
+import argparse
+import asyncio
+import pathlib
+import time
+from typing import Optional
+
+from aiogram.types import ParseMode
+
+from app.bot.base import MeteredBot
+from app.bot.warmer import Checkpoint, DictionaryWarmer, read_frequency_list
+from app.logger import logger
+from app.web.app import setup_app
+
+CONFIG_FILE = pathlib.Path(__file__).resolve().parent.parent / "config.yml"
+
+
+async def warm(config_file: pathlib.Path, filename: pathlib.Path, translation_codes: list[str], top: int,
+               checkpoint_file: Optional[pathlib.Path], max_duration: Optional[float],
+               translate_interval: float, upload_interval: float, with_audio: bool):
+    deadline = None if max_duration is None else time.monotonic() + max_duration
+    with open(filename, encoding="utf-8-sig", errors="replace") as f:
+        originals = read_frequency_list(f, top=top)
+    logger.info(f"read {len(originals)} words from {filename}")
+
+    app = setup_app(config_file, background=False)
+    bot = MeteredBot(app.config.bot.token, parse_mode=ParseMode.HTML)
+    warmer = DictionaryWarmer(app, bot,
+                              translate_interval=translate_interval,
+                              upload_interval=upload_interval,
+                              with_audio=with_audio)
+    checkpoint = Checkpoint(checkpoint_file)
+    await app.connect()
+    try:
+        for translation_code in translation_codes:
+            await warmer.warm(translation_code, originals, checkpoint, deadline=deadline)
+        logger.info(f"done: {warmer.stats}")
+    finally:
+        await app.disconnect()
+        await (await bot.get_session()).close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filename", type=pathlib.Path)
+    parser.add_argument("--config", type=pathlib.Path, default=CONFIG_FILE)
+    parser.add_argument("--translation-code", nargs="+", default=["en-ru"])
+    parser.add_argument("--top", type=int, default=5000)
+    parser.add_argument("--checkpoint", type=pathlib.Path)
+    parser.add_argument("--max-duration", type=float, help="seconds, stop and keep the checkpoint after")
+    parser.add_argument("--translate-interval", type=float, default=1.0, help="seconds between translator requests")
+    parser.add_argument("--upload-interval", type=float, default=3.0, help="seconds between audio uploads")
+    parser.add_argument("--no-audio", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(warm(args.config, args.filename, args.translation_code, args.top, args.checkpoint,
+                     args.max_duration, args.translate_interval, args.upload_interval, not args.no_audio))
+
+
+if __name__ == "__main__":
+    main()
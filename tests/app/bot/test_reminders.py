@@ -0,0 +1,63 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from freezegun import freeze_time
+
+from app.bot.messenger import Messenger
+from app.bot.reminders import ReminderSender
+from app.bot.states import StateAccessor
+from app.store.users.models import UserLangDC, UserWordDC
+from app.utils import now
+from tests.helpers import USER, WORD
+
+
+async def run_now(user_id: int, coro):
+    await coro
+
+
+@pytest.mark.asyncio
+class TestReminderSender:
+
+    @pytest.fixture
+    async def sender(self, application) -> ReminderSender:
+        states = StateAccessor(application)
+        await states.connect()
+        bot = Mock(send_message=AsyncMock(return_value=Mock(message_id=2)))
+        sender = ReminderSender(application, Messenger(application, bot, states), Mock(add=run_now))
+        application.config.reminders.enabled = True
+        application.config.reminders.messages_per_second = 1000.0
+        store = application.store
+        await store.users.add_user(USER)
+        await store.users.add_user_lang(UserLangDC(user_id=USER.id, translation_code="en-ru"))
+        word = await store.words.add_word(WORD)
+        await store.users.add_user_word(UserWordDC(user_id=USER.id,
+                                                   translation_code="en-ru",
+                                                   word_id=word.id,
+                                                   added_at=now()))
+        with freeze_time(now() - timedelta(days=5)):
+            await store.users.set_remembered(USER.id, word.id)
+        return sender
+
+    async def test_send_due(self, application, sender):
+        assert (await sender.send_due()) == 1
+        sender.messenger.bot.send_message.assert_awaited_once()
+        assert sender.messenger.bot.send_message.await_args.args[1] == "🔔 Пора повторить слова: 2."
+
+        # not repeated until reminders.repeat_after
+        assert (await sender.send_due()) == 0
+        due = await application.store.users.get_due_reminders(now() + timedelta(days=1, minutes=1), limit=10)
+        assert due == [USER.id]
+
+    async def test_outdated(self, application, sender):
+        await application.store.users.delete_word(USER.id, (await application.store.words.get_word("en-ru", "catch")).id)
+        assert (await sender.send_due()) == 1
+        sender.messenger.bot.send_message.assert_not_awaited()
+        assert (await application.store.users.get_due_reminders(now() + timedelta(days=365), limit=10)) == []
+
+    async def test_previous_message_kept(self, sender):
+        await sender.messenger.set_previous_msg_info(USER.id, message_id=1, audio_id="telegram_id1")
+        assert (await sender.send_due()) == 1
+        info = await sender.messenger.states.get_previous_msg_info(USER.id)
+        assert (info.message_id, info.audio_id) == (1, "telegram_id1")
+        sender.messenger.bot.delete_message.assert_not_called()
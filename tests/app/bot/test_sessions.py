@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from freezegun import freeze_time
+
+from app.bot.sessions import SessionAccessor, SessionKind
+from app.bot.states import StateAccessor
+from app.store.users.models import UserWordDC
+from app.utils import now
+from tests.helpers import USER, fake_word
+
+
+async def read_all(sessions: SessionAccessor, kind: str, shuffle: bool = True) -> list[tuple[int, bool]]:
+    session = await sessions.start(USER.id, kind, "en-ru", shuffle=shuffle)
+    result = []
+    while 1:
+        session = await sessions.get(USER.id, kind)
+        item = await sessions.get_item(USER.id, kind, session, len(result))
+        if item is None:
+            return result
+        result.append(item)
+
+
+@pytest.mark.asyncio
+class TestSessionAccessor:
+
+    @pytest.fixture
+    async def sessions(self, application) -> SessionAccessor:
+        states = StateAccessor(application)
+        await states.connect()
+        application.config.sessions.chunk_size = 4
+        return SessionAccessor(application, states)
+
+    @pytest.fixture
+    async def word_ids(self, application) -> list[int]:
+        store = application.store
+        await store.users.add_user(USER)
+        words = await store.words.add_words([fake_word("en-ru", f"word{i}") for i in range(10)])
+        word_ids = sorted(i.id for i in words)
+        await store.users.add_user_words([UserWordDC(user_id=USER.id,
+                                                     translation_code="en-ru",
+                                                     word_id=i,
+                                                     added_at=now())
+                                          for i in word_ids])
+        return word_ids
+
+    async def test_remember(self, sessions, word_ids):
+        assert await read_all(sessions, SessionKind.remember, shuffle=False) == [(i, False) for i in word_ids]
+
+        items = await read_all(sessions, SessionKind.remember)
+        assert sorted(items) == [(i, False) for i in word_ids]
+        assert len((await sessions.get(USER.id, SessionKind.remember)).items) <= 5
+
+    async def test_max_words(self, application, sessions, word_ids):
+        application.config.sessions.max_words = 6
+        assert len(await read_all(sessions, SessionKind.remember)) == 6
+
+    async def test_recall(self, application, sessions, word_ids):
+        with freeze_time(now() - timedelta(days=5)):
+            for i in word_ids[:3]:
+                await application.store.users.set_remembered(USER.id, i)
+        items = await read_all(sessions, SessionKind.recall)
+        assert sorted(items) == sorted([(i, False) for i in word_ids[:3]] + [(i, True) for i in word_ids[:3]])
+
+    async def test_remove_word(self, application, sessions, word_ids):
+        with freeze_time(now() - timedelta(days=5)):
+            for i in word_ids:
+                await application.store.users.set_remembered(USER.id, i)
+        session = await sessions.start(USER.id, SessionKind.recall, "en-ru")
+        first = await sessions.get_item(USER.id, SessionKind.recall, session, 0)
+        second = await sessions.get_item(USER.id, SessionKind.recall, session, 1)
+
+        # the first question is answered with "delete"
+        await application.store.users.delete_word(USER.id, first[0])
+        i = await sessions.remove_word(USER.id, SessionKind.recall, session, first[0], 1)
+        assert i == 0
+        assert await sessions.get_item(USER.id, SessionKind.recall, session, i) == second
+
+        items = []
+        while (item := await sessions.get_item(USER.id, SessionKind.recall, session, i)) is not None:
+            items.append(item)
+            i += 1
+        assert len(items) == 2 * 9
+        assert all(word_id != first[0] for word_id, _ in items)
@@ -0,0 +1,60 @@
+import dataclasses
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.bot.warmer import Checkpoint, DictionaryWarmer, read_frequency_list
+from tests.helpers import fake_word
+
+
+def test_read_frequency_list():
+    lines = ["# words", "the 23135851162", "of,13151942776", "And\t12997637966", "a 1", "the 5", "to"]
+    assert read_frequency_list(lines) == ["the", "of", "and", "to"]
+    assert read_frequency_list(lines, top=2) == ["the", "of"]
+
+
+def test_checkpoint(tmp_path):
+    filename = tmp_path / "warm.json"
+    checkpoint = Checkpoint(filename)
+    assert checkpoint.get("en-ru") == 0
+    checkpoint.set("en-ru", 10)
+    assert Checkpoint(filename).get("en-ru") == 10
+    assert Checkpoint(None).get("en-ru") == 0
+
+
+@pytest.mark.asyncio
+class TestDictionaryWarmer:
+
+    @pytest.fixture
+    def warmer(self, application) -> DictionaryWarmer:
+        application.store.translator.translate = AsyncMock(side_effect=fake_word)
+        warmer = DictionaryWarmer(application, Mock(), translate_interval=0.0, upload_interval=0.0)
+        warmer.upload_audio = AsyncMock(side_effect=lambda code, original: f"audio-{original}")
+        return warmer
+
+    async def test_warm(self, application, warmer, tmp_path):
+        await application.store.words.add_word(fake_word("en-ru", "the"))  # without audio
+        await application.store.words.add_word(dataclasses.replace(fake_word("en-ru", "of"), audio_id="audio-of"))
+
+        checkpoint = Checkpoint(tmp_path / "warm.json")
+        stats = await warmer.warm("en-ru", ["the", "of", "qwerty", "and"], checkpoint, batch_size=3)
+        assert stats.n_skipped == 1
+        assert stats.n_translated == 1
+        assert stats.n_not_found == 1
+        assert stats.n_audio == 2
+        assert checkpoint.get("en-ru") == 4
+        assert (await application.store.words.get_word("en-ru", "the")).audio_id == "audio-the"
+        assert (await application.store.words.get_word("en-ru", "and")).audio_id == "audio-and"
+
+    async def test_resume(self, application, warmer, tmp_path):
+        checkpoint = Checkpoint(tmp_path / "warm.json")
+        stats = await warmer.warm("en-ru", ["the", "of"], checkpoint, deadline=time.monotonic() - 1)
+        assert stats.n_translated == 0
+        assert checkpoint.get("en-ru") == 0
+
+        checkpoint.set("en-ru", 1)
+        stats = await warmer.warm("en-ru", ["the", "of"], checkpoint)
+        assert stats.n_translated == 1
+        assert await application.store.words.get_word("en-ru", "the") is None
+        assert checkpoint.get("en-ru") == 2
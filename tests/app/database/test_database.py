@@ -0,0 +1,44 @@
+import pytest
+
+from app.database.database import get_head_revision
+
+
+@pytest.mark.asyncio
+class TestDatabase:
+
+    async def test_pool_stats(self, application):
+        await application.store.word_index.disconnect()  # its background load acquires connections
+        database = application.store.database
+        before = database.pool_stats()
+        assert before.acquired == 0
+        assert before.size >= application.config.database.min_pool_size
+
+        async with database.db.acquire():
+            assert database.pool_stats().acquired == 1
+
+        after = database.pool_stats()
+        assert after.acquired == 0
+        assert after.n_acquisitions == before.n_acquisitions + 1
+        assert after.wait_time_max >= 0.0
+
+    async def test_fetch(self, application):
+        database = application.store.database
+        assert (await database.fetchval("SELECT $1::int + 1", 1)) == 2
+        assert (await database.fetchrow("SELECT 1 AS a"))["a"] == 1
+        assert [i[0] for i in await database.fetch("SELECT generate_series(1, 3)")] == [1, 2, 3]
+
+    async def test_check_migrations(self, application):
+        database = application.store.database
+        with pytest.raises(RuntimeError, match="alembic stamp head"):
+            await database.check_migrations()
+
+        await database.fetchval("CREATE TABLE alembic_version (version_num varchar(32) NOT NULL)")
+        try:
+            await database.fetchval("INSERT INTO alembic_version VALUES ('outdated')")
+            with pytest.raises(RuntimeError):
+                await database.check_migrations()
+
+            await database.fetchval("UPDATE alembic_version SET version_num = $1", get_head_revision())
+            await database.check_migrations()
+        finally:
+            await database.fetchval("DROP TABLE alembic_version")
@@ -0,0 +1,59 @@
+import pytest
+
+from app.database.partitioning import OnlineRewrite
+
+
+@pytest.mark.asyncio
+class TestPartitioning:
+
+    async def test_create_partitions(self, application):
+        database = application.store.database
+        assert (await database.fetchval("SELECT relkind::text FROM pg_class WHERE relname = 'user_words'")) == "p"
+        n_partitions = await database.fetchval("SELECT count(*) FROM pg_inherits "
+                                               "WHERE inhparent = 'user_words'::regclass")
+        assert n_partitions == 16
+
+        # idempotent, e.g. for a restart
+        await database.create_partitions()
+
+    async def test_online_rewrite(self, application):
+        database = application.store.database
+        rewrite = OnlineRewrite("rewrite_test", "user_id", ["PRIMARY KEY (user_id, id)", "UNIQUE (user_id, value)"],
+                                partition_by="HASH (user_id)", n_partitions=4, batch_size=10)
+        await database.fetchval("CREATE TABLE rewrite_test (id serial PRIMARY KEY, user_id integer NOT NULL, "
+                                "value text NOT NULL, UNIQUE (user_id, value))")
+        try:
+            await database.fetchval("INSERT INTO rewrite_test (user_id, value) "
+                                    "SELECT i % 5, 'value' || i FROM generate_series(1, 25) i")
+            for query in rewrite.prepare():
+                await database.fetchval(query)
+            assert (await database.fetchval(rewrite.copy_batch(0))) == 10
+
+            # changes while rows are copied
+            await database.fetchval("UPDATE rewrite_test SET value = 'updated' WHERE id IN (1, 20)")
+            await database.fetchval("DELETE FROM rewrite_test WHERE id IN (2, 21)")
+            await database.fetchval("INSERT INTO rewrite_test (user_id, value) VALUES (7, 'inserted')")
+
+            last_id = 10
+            while last_id is not None:
+                last_id = await database.fetchval(rewrite.copy_batch(last_id))
+            expected = await database.fetch("SELECT * FROM rewrite_test ORDER BY id")
+
+            async with database.db.transaction():
+                for query in rewrite.swap():
+                    await database.fetchval(query)
+
+            assert (await database.fetch("SELECT * FROM rewrite_test ORDER BY id")) == expected
+            assert len(expected) == 24
+            kind = await database.fetchval("SELECT relkind::text FROM pg_class WHERE relname = 'rewrite_test'")
+            assert kind == "p"
+            constraints = await database.fetch("SELECT conname FROM pg_constraint "
+                                               "WHERE conrelid = 'rewrite_test'::regclass ORDER BY conname")
+            assert [i[0] for i in constraints] == ["rewrite_test_pkey", "rewrite_test_user_id_value_key"]
+            assert (await database.fetchval("INSERT INTO rewrite_test (user_id, value) "
+                                            "VALUES (1, 'new') RETURNING id")) == 27
+            assert (await database.fetchval("SELECT to_regclass('rewrite_test_p3') IS NOT NULL"))
+        finally:
+            await database.fetchval("DROP TABLE IF EXISTS rewrite_test_new")
+            await database.fetchval("DROP TABLE IF EXISTS rewrite_test")
+            await database.fetchval("DROP FUNCTION IF EXISTS rewrite_test_mirror()")
@@ -0,0 +1,71 @@
+import pytest
+
+from app.database.replicas import current_user, reading
+from tests.helpers import USER
+
+
+async def connect_replicas(application, urls: list[str]):
+    database = application.store.database
+    await database.disconnect_replicas()
+    application.config.database.replicas = urls
+    await database.connect_replicas()
+    return database
+
+
+def replica_url(application) -> str:
+    # the test database plays the replica
+    config = application.config.database
+    return f"postgresql://{config.username}:{config.password}@{config.host}:{config.port}/{config.database}"
+
+
+@pytest.mark.asyncio
+class TestReplicas:
+
+    async def test_reads(self, application):
+        database = await connect_replicas(application, [replica_url(application)])
+        replica = database.replicas[0]
+        assert replica.healthy
+        assert replica.lag == 0
+
+        primary = database.db.bind
+        assert primary is not replica.engine
+        token = reading.set(True)
+        try:
+            assert database.db.bind is replica.engine
+        finally:
+            reading.reset(token)
+        async with database.db.transaction():
+            token = reading.set(True)
+            try:
+                assert database.db.bind is primary
+            finally:
+                reading.reset(token)
+
+        await application.store.users.add_user(USER)
+        assert await application.store.users.get_user_langs(USER.id) == []
+
+    async def test_read_your_writes(self, application):
+        database = await connect_replicas(application, [replica_url(application)])
+        token = current_user.set(USER.id)
+        try:
+            await application.store.users.add_user(USER)
+            reading_token = reading.set(True)
+            assert database.reader() is None
+
+            application.config.database.read_your_writes = 0
+            assert database.reader() is database.replicas[0].engine
+            reading.reset(reading_token)
+        finally:
+            current_user.reset(token)
+
+    async def test_unavailable(self, application):
+        config = application.config.database
+        database = await connect_replicas(application, [f"postgresql://{config.username}:{config.password}"
+                                                        f"@{config.host}:1/{config.database}"])
+        assert not database.replicas[0].healthy
+        token = reading.set(True)
+        try:
+            assert database.reader() is None
+            assert (await database.fetchval("SELECT 1")) == 1
+        finally:
+            reading.reset(token)
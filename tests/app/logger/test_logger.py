@@ -0,0 +1,61 @@
+import logging
+import threading
+
+import pytest
+
+from app import logger as log
+from app.web.config import LoggingConfig
+
+
+class Collector(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.threads: set[str] = set()
+        self.event = threading.Event()
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+        self.threads.add(threading.current_thread().name)
+        self.event.set()
+
+
+@pytest.fixture
+def collector():
+    handler = Collector()
+    log.listener.handlers += (handler,)
+    yield handler
+    log.listener.handlers = tuple(i for i in log.listener.handlers if i is not handler)
+    log.setup_logging(LoggingConfig())
+
+
+def test_listener_thread(collector):
+    log.logger.info("hello %s", "world")
+    assert collector.event.wait(5.0)
+    assert collector.records[0].getMessage() == "hello world"
+    assert threading.current_thread().name not in collector.threads
+
+
+def test_module_levels(collector):
+    log.setup_logging(LoggingConfig(modules={"test_logger": "WARNING"}))
+    log.logger.info("skipped")
+    log.logger.warning("passed")
+    assert collector.event.wait(5.0)
+    assert [i.getMessage() for i in collector.records] == ["passed"]
+
+
+def test_levels():
+    log.setup_logging(LoggingConfig(level="info", modules={"test_logger": "warning"}))
+    assert log.logger.level == logging.INFO
+    assert log.module_filter.levels == {"test_logger": logging.WARNING}
+    with pytest.raises(ValueError, match="unknown logging level"):
+        log.setup_logging(LoggingConfig(modules={"test_logger": "loud"}))
+    log.setup_logging(LoggingConfig())
+
+
+def test_sampled():
+    log.setup_logging(LoggingConfig(update_sample_rate=0.0))
+    assert not any(log.sampled() for _ in range(100))
+    log.setup_logging(LoggingConfig(update_sample_rate=1.0))
+    assert all(log.sampled() for _ in range(100))
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from app.metrics.loop import slow_callbacks, loop_lag_seconds
+
+
+def blocking_call():
+    time.sleep(0.4)
+
+
+@pytest.fixture
+async def monitor(application, tmp_path):
+    config = application.config.monitoring
+    config.enabled = True
+    config.lag_interval = 0.01
+    config.slow_callback = 0.1
+    config.profiler_interval = 0.001
+    config.profile_dir = str(tmp_path)
+    await application.monitor.connect()
+    yield application.monitor
+    await application.monitor.disconnect()
+
+
+@pytest.mark.asyncio
+class TestLoopMonitor:
+
+    async def test_lag(self, monitor):
+        before = loop_lag_seconds.count()
+        await asyncio.sleep(0.1)
+        assert loop_lag_seconds.count() > before
+
+    async def test_slow_callback(self, monitor):
+        await asyncio.sleep(0.05)
+        before = slow_callbacks.get()
+        blocking_call()
+        await asyncio.sleep(0.05)
+        assert slow_callbacks.get() == before + 1
+
+    async def test_profiler(self, monitor):
+        assert monitor.start_profiler()
+        assert not monitor.start_profiler()
+        blocking_call()
+        filename = monitor.stop_profiler()
+        assert monitor.stop_profiler() is None
+
+        lines = filename.read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert "blocking_call" in stack
+        assert int(count) > 0
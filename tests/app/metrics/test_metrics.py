@@ -0,0 +1,82 @@
+import pytest
+from aiohttp import ClientSession
+
+from app.base.accessor import BaseAccessor
+from app.metrics import Registry, accessor_seconds
+
+
+@pytest.fixture
+def registry() -> Registry:
+    return Registry()
+
+
+def test_counter(registry):
+    counter = registry.counter("requests_total", "Requests.", ("result",))
+    counter.inc(result="hit")
+    counter.inc(2, result="hit")
+    counter.inc(result='"miss"')
+    assert counter.get(result="hit") == 3
+    assert registry.expose() == '# HELP requests_total Requests.\n' \
+                                '# TYPE requests_total counter\n' \
+                                'requests_total{result="hit"} 3\n' \
+                                'requests_total{result="\\"miss\\""} 1\n'
+
+
+def test_wrong_labels(registry):
+    counter = registry.counter("requests_total", "Requests.", ("result",))
+    with pytest.raises(ValueError):
+        counter.inc(status="hit")
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Requests.")
+
+
+def test_histogram(registry):
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+    assert histogram.count() == 4
+    assert registry.expose().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 5.65',
+        'latency_seconds_count 4',
+    ]
+
+
+def test_collector(registry):
+    gauge = registry.gauge("connections", "Connections.")
+    registry.add_collector(lambda: gauge.set(7))
+    assert "connections 7" in registry.expose()
+
+
+class Instrumented(BaseAccessor):
+
+    async def get(self):
+        return 1
+
+
+@pytest.mark.asyncio
+async def test_accessor_instrumented(application):
+    before = accessor_seconds.count(accessor="Instrumented", method="get")
+    assert (await Instrumented(application).get()) == 1
+    assert accessor_seconds.count(accessor="Instrumented", method="get") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_server(application):
+    application.config.metrics.enabled = True
+    application.config.metrics.host = "127.0.0.1"
+    application.config.metrics.port = 18080
+    await application.metrics.connect()
+    try:
+        async with ClientSession() as session:
+            async with session.get("http://127.0.0.1:18080/metrics") as response:
+                assert response.status == 200
+                text = await response.text()
+    finally:
+        await application.metrics.disconnect()
+    assert "# TYPE words_handler_seconds histogram" in text
+    assert 'words_db_pool_connections{state="acquired"}' in text
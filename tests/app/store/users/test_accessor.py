@@ -134,6 +134,17 @@ class TestUserAccessor:
         words = await store.users.get_user_words(user_word1.user_id, user_word1.translation_code)
         assert len(words) == 1
 
+    async def test_add_user_words(self, store, user_word1, word2):
+        user_words = [
+            UserWordDC(user_id=user_word1.user_id, word_id=i, translation_code="en-ru", added_at=now())
+            for i in [word2.id, user_word1.word_id]
+        ]
+        assert (await store.users.add_user_words(user_words)) == [word2.id]
+        assert (await store.users.add_user_words(user_words)) == []
+        assert (await store.users.add_user_words([])) == []
+        ids = await store.users.get_ids_user_words(user_word1.user_id, "en-ru")
+        assert sorted(ids) == sorted([user_word1.word_id, word2.id])
+
     async def test_count_user_words(self, store, user_word1, user_word2):
         assert (await store.users.count_user_words(
             user_word1.user_id, user_word1.translation_code)) == 2
@@ -189,6 +200,38 @@ class TestUserAccessor:
         assert t <= words[0].remembered_at <= now()
         assert words[1] == user_word2
 
+    async def test_reminders(self, application, store, user_word1, user_word2):
+        application.config.reminders.enabled = True
+        user_id = user_word1.user_id
+        assert (await store.users.get_due_reminders(now(), limit=10)) == []
+
+        with freeze_time(now() - timedelta(days=5)):
+            first = await store.users.set_remembered(user_id, user_word1.word_id)
+        with freeze_time(now() - timedelta(days=3)):
+            await store.users.set_remembered(user_id, user_word2.word_id)
+            # a later time does not move the reminder
+            await store.users.set_shown_original(user_id, user_word1.word_id)
+        assert (await store.users.get_due_reminders(first.next_show_original - timedelta(seconds=1), 10)) == []
+        assert (await store.users.get_due_reminders(first.next_show_original, limit=10)) == [user_id]
+
+        assert (await store.users.get_next_due(user_id, now())) is None
+        next_due = await store.users.get_next_due(user_id, now() - timedelta(days=3, hours=1))
+        assert next_due == first.next_show_translation
+
+        later = now() + timedelta(days=1)
+        await store.users.set_reminder(user_id, later)
+        assert (await store.users.get_due_reminders(now(), limit=10)) == []
+        assert (await store.users.get_due_reminders(later, limit=10)) == [user_id]
+
+        await store.users.set_reminder(user_id, None)
+        assert (await store.users.rebuild_reminders()) == 1
+        assert (await store.users.get_due_reminders(now(), limit=10)) == [user_id]
+
+    async def test_reminders_disabled(self, application, store, user_word1):
+        application.config.reminders.enabled = False
+        await store.users.set_remembered(user_word1.user_id, user_word1.word_id)
+        assert (await store.users.get_due_reminders(now() + timedelta(days=365), limit=10)) == []
+
     async def test_delete_word(self, store, user_word1, user_word2):
         await store.users.delete_word(user_word1.user_id, user_word1.word_id)
         words = await store.users.get_user_words(user_word1.user_id, user_word1.translation_code)
@@ -254,6 +297,39 @@ class TestUserAccessor:
         assert len(words) == 1
         assert words[0].id == user_word1.id
 
+    async def test_set_shown_many_times(self, store, user_word1):
+        await store.users.set_remembered(user_word1.user_id, user_word1.word_id)
+        for _ in range(7):
+            same = await store.users.set_shown_original(user_word1.user_id, user_word1.word_id)
+        assert same.n_shown_original == 7
+        assert timedelta(days=89) < same.next_show_original - now() <= timedelta(days=90)
+
+    async def test_replan_reviews(self, application, store, user_word1):
+        from app.store.users.scheduler import SchedulerKind, create_scheduler
+        from app.web.config import SchedulerConfig
+
+        await store.users.set_remembered(user_word1.user_id, user_word1.word_id)
+        same = await store.users.set_shown_original(user_word1.user_id, user_word1.word_id)
+        assert timedelta(days=2) < same.next_show_original - now() <= timedelta(days=3)
+
+        old = create_scheduler(SchedulerConfig())
+        application.config.scheduler.ladder = [2, 6, 14, 60, 180]
+        store.users.scheduler = create_scheduler(application.config.scheduler)
+        assert (await store.users.replan_reviews(old, batch_size=1)) == 1
+
+        [replanned] = await store.users.get_user_words(user_word1.user_id, user_word1.translation_code)
+        shift_original = replanned.next_show_original - same.next_show_original
+        shift_translation = replanned.next_show_translation - same.next_show_translation
+        assert abs(shift_original - timedelta(days=3)) < timedelta(milliseconds=1)
+        assert abs(shift_translation - timedelta(days=1)) < timedelta(milliseconds=1)
+
+        application.config.scheduler.kind = SchedulerKind.sm2
+        store.users.scheduler = create_scheduler(application.config.scheduler)
+        assert (await store.users.replan_reviews(create_scheduler(SchedulerConfig(ladder=[2, 6, 14, 60, 180])))) == 1
+        [replanned] = await store.users.get_user_words(user_word1.user_id, user_word1.translation_code)
+        assert replanned.stability_original == 6.0
+        assert replanned.stability_translation == 2.0
+
     async def test_get_ids_user_words(self, store, user_word1):
         idx = await store.users.get_ids_user_words(user_word1.user_id,
                                                    user_word1.translation_code)
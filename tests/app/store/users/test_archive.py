@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from freezegun import freeze_time
+
+from app.store.users.archive import UserWordArchiver
+from app.store.users.models import UserWordDC
+from app.utils import now
+from tests.helpers import USER, fake_word
+
+
+@pytest.mark.asyncio
+class TestUserWordArchiver:
+
+    @pytest.fixture
+    async def word_ids(self, application) -> list[int]:
+        """
+        The first 3 of 5 words are mastered.
+        """
+        store = application.store
+        await store.users.add_user(USER)
+        words = await store.words.add_words([fake_word("en-ru", f"word{i}") for i in range(5)])
+        word_ids = sorted(i.id for i in words)
+        await store.users.add_user_words([UserWordDC(user_id=USER.id,
+                                                     translation_code="en-ru",
+                                                     word_id=i,
+                                                     added_at=now())
+                                          for i in word_ids])
+        for i in word_ids:
+            await store.users.set_remembered(USER.id, i)
+        await store.database.fetchval("UPDATE user_words SET n_shown_original = 6, n_shown_translation = 6, "
+                                      "next_show_original = now() + interval '100 days', "
+                                      "next_show_translation = now() + interval '101 days' "
+                                      "WHERE word_id = ANY($1::integer[])", word_ids[:3])
+        return word_ids
+
+    async def test_archive(self, application, word_ids):
+        application.config.archive.batch_size = 2
+        archiver: UserWordArchiver = application.store.archiver
+        users = application.store.users
+        assert await archiver.archive() == 3
+        assert await archiver.archive() == 0
+
+        assert sorted(i.word_id for i in await users.get_user_words(USER.id, "en-ru")) == word_ids[3:]
+        assert await users.count_user_words(USER.id, "en-ru") == 5
+        assert sorted(await users.get_ids_user_words(USER.id, "en-ru")) == word_ids
+
+        await users.delete_word(USER.id, word_ids[0])
+        assert await users.count_user_words(USER.id, "en-ru") == 4
+
+    async def test_add_again(self, application, word_ids):
+        users = application.store.users
+        await application.store.archiver.archive()
+        user_word = await users.add_user_word(UserWordDC(user_id=USER.id,
+                                                         translation_code="en-ru",
+                                                         word_id=word_ids[0],
+                                                         added_at=now()))
+        assert user_word.added_at < now()
+        assert user_word.n_shown_original == 6
+        assert await users.count_user_words(USER.id, "en-ru") == 5
+        assert await users.add_user_words([UserWordDC(user_id=USER.id,
+                                                      translation_code="en-ru",
+                                                      word_id=word_ids[1],
+                                                      added_at=now())]) == []
+        assert len(await users.get_user_words(USER.id, "en-ru")) == 4
+
+    async def test_restore_due(self, application, word_ids):
+        archiver: UserWordArchiver = application.store.archiver
+        await archiver.archive()
+        assert await archiver.restore_due() == 0
+        with freeze_time(now() + timedelta(days=95)):
+            assert await archiver.restore_due() == 3
+            next_due = await application.store.users.get_next_due(USER.id, now())
+        assert len(await application.store.users.get_user_words(USER.id, "en-ru")) == 5
+        assert next_due > now() + timedelta(days=99)
+
+    async def test_replan_reviews(self, application, word_ids):
+        from app.store.users.scheduler import SchedulerKind, create_scheduler
+        from app.web.config import SchedulerConfig
+
+        await application.store.archiver.archive()
+        old = create_scheduler(SchedulerConfig())
+        application.config.scheduler.kind = SchedulerKind.fsrs
+        application.store.users.scheduler = create_scheduler(application.config.scheduler)
+        assert await application.store.users.replan_reviews(old, batch_size=2) == 5
+        stability = await application.store.database.fetch("SELECT stability_original FROM user_words_archive")
+        assert [i[0] for i in stability] == [90.0] * 3
@@ -0,0 +1,68 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.store.users.events import ReviewDirection, ReviewLog, ReviewOutcome
+from app.store.users.models import ReviewEventModel
+from tests.helpers import USER, WORD
+
+
+async def get_events() -> list:
+    models: list[ReviewEventModel] = await ReviewEventModel.query.order_by(ReviewEventModel.id).gino.all()
+    return [i.as_dataclass() for i in models]
+
+
+@pytest.mark.asyncio
+class TestReviewLog:
+
+    @pytest.fixture
+    async def word_id(self, application) -> int:
+        await application.store.users.add_user(USER)
+        return (await application.store.words.add_word(WORD)).id
+
+    async def test_flush(self, application, word_id):
+        review_log: ReviewLog = application.store.review_log
+        review_log.show(USER.id)
+        review_log.add(USER.id, word_id, ReviewDirection.original, ReviewOutcome.recalled)
+        review_log.add(USER.id, word_id, ReviewDirection.translation, ReviewOutcome.forgotten)
+        assert await get_events() == []
+
+        assert (await review_log.flush()) == 2
+        events = await get_events()
+        assert [(i.direction, i.outcome) for i in events] == [("original", "recalled"), ("translation", "forgotten")]
+        assert events[0].latency >= 0
+        assert events[1].latency is None
+        assert (await review_log.flush()) == 0
+
+    async def test_flush_size(self, application, word_id):
+        application.config.review_log.flush_size = 3
+        review_log: ReviewLog = application.store.review_log
+        for _ in range(3):
+            review_log.add(USER.id, word_id, ReviewDirection.original, ReviewOutcome.recalled)
+        await asyncio.sleep(0.1)  # flush_interval is 1 second
+        assert len(await get_events()) == 3
+
+    async def test_disconnect(self, application, word_id):
+        review_log: ReviewLog = application.store.review_log
+        review_log.add(USER.id, word_id, ReviewDirection.original, ReviewOutcome.deleted)
+        await review_log.disconnect()
+        assert len(await get_events()) == 1
+        assert review_log.buffer == []
+
+    async def test_failed_flush(self, application, word_id):
+        application.config.review_log.max_buffer = 2
+        review_log: ReviewLog = application.store.review_log
+        for _ in range(3):
+            review_log.add(USER.id, word_id, ReviewDirection.original, ReviewOutcome.recalled)
+        with patch.object(application.store.database, "copy_records", AsyncMock(side_effect=ConnectionError)):
+            with pytest.raises(ConnectionError):
+                await review_log.flush()
+        assert len(review_log.buffer) == 2
+        assert (await review_log.flush()) == 2
+
+    async def test_deleted_user(self, application, word_id):
+        review_log: ReviewLog = application.store.review_log
+        review_log.add(USER.id, word_id, ReviewDirection.original, ReviewOutcome.deleted)
+        await application.store.database.db.status("DELETE FROM users")
+        assert (await review_log.flush()) == 1
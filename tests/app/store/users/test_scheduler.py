@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.store.users.scheduler import DAY, ReviewState, SchedulerKind, create_scheduler, replan_batch
+from app.web.config import SchedulerConfig
+
+
+def review_intervals(kind: str, n: int) -> list[float]:
+    scheduler = create_scheduler(SchedulerConfig(kind=kind))
+    state = scheduler.initial_state()
+    result = [scheduler.interval(state)]
+    for _ in range(n):
+        state = scheduler.review(state, elapsed=result[-1])
+        result.append(scheduler.interval(state))
+    return result
+
+
+def test_ladder():
+    assert review_intervals(SchedulerKind.ladder, 6) == [1, 3, 7, 30, 90, 90, 90]
+
+
+def test_sm2():
+    assert review_intervals(SchedulerKind.sm2, 3) == [1.0, 6.0, 15.0, 37.5]
+
+    scheduler = create_scheduler(SchedulerConfig(kind=SchedulerKind.sm2))
+    forgotten = scheduler.review(ReviewState(n_shown=3, ease=2.5, stability=37.5), elapsed=40, remembered=False)
+    assert forgotten.n_shown == 0
+    assert forgotten.stability == 1.0
+    assert forgotten.ease < 2.5
+
+
+def test_fsrs():
+    intervals = review_intervals(SchedulerKind.fsrs, 5)
+    assert intervals[0] == pytest.approx(1.0, rel=0.01)
+    assert all(a < b for a, b in zip(intervals, intervals[1:]))
+    assert intervals[-1] <= 365.0
+
+    scheduler = create_scheduler(SchedulerConfig(kind=SchedulerKind.fsrs, desired_retention=0.8))
+    assert scheduler.interval(ReviewState(stability=10.0)) > 10.0
+
+
+def test_unknown():
+    with pytest.raises(ValueError):
+        create_scheduler(SchedulerConfig(kind="leitner"))
+
+
+@pytest.mark.parametrize("kind", [SchedulerKind.ladder, SchedulerKind.sm2, SchedulerKind.fsrs])
+def test_intervals_vectorized(kind):
+    scheduler = create_scheduler(SchedulerConfig(kind=kind))
+    states = [ReviewState(n_shown=n, ease=2.5, stability=s) for n, s in [(0, 1.0), (2, 15.0), (9, 100.0)]]
+    intervals = scheduler.intervals(np.array([i.n_shown for i in states]),
+                                    np.array([i.ease for i in states]),
+                                    np.array([i.stability for i in states]))
+    assert intervals.tolist() == pytest.approx([scheduler.interval(i) for i in states])
+
+
+def test_replan_batch():
+    ladder = create_scheduler(SchedulerConfig(kind=SchedulerKind.ladder))
+    longer = create_scheduler(SchedulerConfig(kind=SchedulerKind.ladder, ladder=[2, 6, 14, 60, 180]))
+    sm2 = create_scheduler(SchedulerConfig(kind=SchedulerKind.sm2))
+    due = np.array([10 * DAY, 100 * DAY])
+    n_shown = np.array([0, 3])
+    ease = np.array([2.5, 2.5])
+    stability = np.array([1.0, 1.0])
+
+    new_due, new_stability = replan_batch(ladder, longer, due, n_shown, ease, stability)
+    assert (new_due / DAY).tolist() == [11, 130]
+    assert new_stability.tolist() == [1.0, 1.0]
+
+    new_due, new_stability = replan_batch(ladder, sm2, due, n_shown, ease, stability)
+    assert (new_due / DAY).tolist() == [10, 100]
+    assert new_stability.tolist() == [1.0, 30.0]
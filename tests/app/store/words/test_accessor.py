@@ -1,5 +1,8 @@
+import dataclasses
+
 import pytest
 
+from app.store.words.codec import ProfileStorage
 from app.store.words.models import WordDC
 from app.utils import now
 
@@ -34,3 +37,35 @@ class TestWordsAccessor:
         word.id = 1
         assert word == same_word1 == same_word2
 
+    async def test_add_words(self, application):
+        other = dataclasses.replace(word, original="throw", audio_id=None)
+        assert (await application.store.words.add_words([])) == []
+        assert (await application.store.words.get_words(word.translation_code, [])) == []
+
+        added = await application.store.words.add_words([word, other])
+        assert [i.original for i in added] == ["catch", "throw"]
+
+        # audio is kept on conflict
+        added = await application.store.words.add_words([dataclasses.replace(word, audio_id=None)])
+        assert added[0].audio_id == word.audio_id
+
+        found = await application.store.words.get_words(word.translation_code, ["throw", "catch", "unknown"])
+        assert sorted(i.original for i in found) == ["catch", "throw"]
+
+    async def test_binary_storage(self, application):
+        application.config.database.profile_storage = ProfileStorage.binary
+        same_word = await application.store.words.add_word(word)
+        word.id = 1
+        assert same_word == word
+        assert (await application.store.words.get_word(word.translation_code, word.original)) == word
+
+    async def test_convert_profiles(self, application):
+        await application.store.words.add_word(word)
+        word.id = 1
+
+        assert (await application.store.words.convert_profiles(ProfileStorage.binary, batch_size=1)) == 1
+        assert (await application.store.words.convert_profiles(ProfileStorage.binary)) == 0
+        assert (await application.store.words.get_word_by_id(word.id)) == word
+
+        assert (await application.store.words.convert_profiles(ProfileStorage.jsonb)) == 1
+        assert (await application.store.words.get_word_by_id(word.id)) == word
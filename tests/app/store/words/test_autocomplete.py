@@ -0,0 +1,23 @@
+import dataclasses
+
+from app.store.words.autocomplete import PrefixIndex, WordCard
+from tests.helpers import WORD
+
+
+def card(original: str, word_id: int = 1) -> WordCard:
+    return WordCard.from_word(dataclasses.replace(WORD, original=original, id=word_id))
+
+
+def test_complete():
+    index = PrefixIndex()
+    index.add(card("apply"))
+    index.add_many([card("apple"), card("banana"), card("applause"), card("apple", word_id=2)])
+    index.add(card("ape"))
+    assert index.originals == ["ape", "applause", "apple", "apply", "banana"]
+    assert index.cards["apple"].id == 2
+
+    assert [i.original for i in index.complete("appl")] == ["applause", "apple", "apply"]
+    assert [i.original for i in index.complete("ap", limit=2)] == ["ape", "applause"]
+    assert [i.original for i in index.complete("apple")] == ["apple"]
+    assert index.complete("c") == []
+    assert index.complete("bananas") == []
@@ -0,0 +1,30 @@
+import pytest
+
+from app.store.words.codec import encode_profile, decode_profile, decode_plain_profile
+
+profile = dict(transcription=["kætʃ"],
+               translations=["поймать", "схватить"],
+               past_indefinite=["caught"],
+               past_participle=["caught"],
+               noun_plural=[],
+               examples=[["We caught!", "Мы поймали!"]] * 30,
+               idioms=[["catch fire", "загореться"]])
+
+
+def test_roundtrip():
+    assert decode_profile(encode_profile(profile)) == profile
+
+
+def test_plain():
+    plain = decode_plain_profile(encode_profile(profile))
+    assert plain == {k: v for k, v in profile.items() if k not in ("examples", "idioms")}
+
+
+def test_compressed():
+    assert len(encode_profile(profile)) < len(str(profile).encode())
+
+
+def test_unknown_version():
+    blob = encode_profile(profile)
+    with pytest.raises(ValueError):
+        decode_profile(b"\x00" + blob[1:])
@@ -0,0 +1,90 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.store.words.importer import read_words, split_words
+from app.store.words.models import WordDC
+from tests.helpers import USER, fake_word
+
+
+def test_read_plain():
+    assert read_words(["Apple\n", "\n", "banana ", "apple", "a", "c3po", "cherry"]) == ["apple", "banana", "cherry"]
+
+
+def test_read_csv():
+    assert read_words(["word,translation", '"catch",поймать', "throw;бросить"]) == ["word", "catch", "throw"]
+
+
+def test_read_anki():
+    lines = ["#separator:tab", "#html:true", "<b>catch</b>\tпоймать", "run&nbsp;\tбежать"]
+    assert read_words(lines) == ["catch", "run"]
+
+
+def test_read_limit():
+    assert read_words(["one", "two", "three"], limit=2) == ["one", "two"]
+
+
+def test_split_words():
+    assert split_words("catch") == ["catch"]
+    assert split_words("apple,") == split_words("apple; ") == ["apple"]
+    assert split_words("Apple, banana,cherry, apple") == ["apple", "banana", "cherry"]
+    assert split_words("look after\nrun;\n\n") == ["look after", "run"]
+
+
+@pytest.mark.asyncio
+class TestWordImporter:
+
+    @pytest.fixture(autouse=True)
+    def translator(self, application):
+        application.store.translator.translate = AsyncMock(side_effect=fake_word)
+        return application.store.translator.translate
+
+    async def test_import(self, application, translator):
+        await application.store.users.add_user(USER)
+        await application.store.words.add_word(fake_word("en-ru", "catch"))
+        application.config.importer.batch_size = 2
+
+        result = await application.store.importer.import_words("en-ru", ["catch", "throw", "qwerty", "run"],
+                                                               user_id=USER.id)
+        assert result.n_added == 3
+        assert result.n_existed == 0
+        assert result.n_translated == 2
+        assert result.not_found == ["qwerty"]
+        assert sorted(i.args[1] for i in translator.await_args_list) == ["qwerty", "run", "throw"]
+        assert await application.store.users.count_user_words(USER.id, "en-ru") == 3
+
+        translator.reset_mock()
+        result = await application.store.importer.import_words("en-ru", ["catch", "run"], user_id=USER.id)
+        assert result.n_added == 0
+        assert result.n_existed == 2
+        translator.assert_not_awaited()
+
+    async def test_translator_error(self, application, translator):
+        translator.side_effect = TypeError("'NoneType' object is not subscriptable")
+        result = await application.store.importer.import_words("en-ru", ["catch"])
+        assert result.not_found == ["catch"]
+        assert await application.store.words.get_word("en-ru", "catch") is None
+
+    async def test_concurrency(self, application, translator):
+        running = 0
+        max_running = 0
+
+        async def translate(translation_code: str, original: str) -> WordDC:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return fake_word(translation_code, original)
+
+        translator.side_effect = translate
+        originals = [f"word{i}" for i in "abcdefgh"]
+        result = await application.store.importer.import_words("en-ru", originals, concurrency=2)
+        assert result.n_translated == len(originals)
+        assert max_running == 2
+
+    async def test_not_waiting_for_bulk_imports(self, application, translator):
+        application.store.importer.semaphore = asyncio.Semaphore(0)  # taken by bulk imports
+        result = await asyncio.wait_for(application.store.importer.import_words("en-ru", ["catch"], concurrency=1), 1)
+        assert result.n_translated == 1
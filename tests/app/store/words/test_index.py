@@ -0,0 +1,78 @@
+import dataclasses
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.store.words.codec import ProfileStorage
+from tests.helpers import WORD
+
+
+@pytest.mark.asyncio
+class TestWordIndex:
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, application):
+        application.config.word_index.enabled = True
+
+    async def test_add_word(self, application):
+        await application.store.words.add_word(WORD)
+        await application.store.words.add_words([dataclasses.replace(WORD, original="match")])
+        assert application.store.word_index.suggest("en-ru", "cacth") == ["catch"]
+        assert application.store.word_index.suggest("en-ru", "mach") == ["match"]
+        assert application.store.word_index.suggest("en-ru", "catch") == []
+        assert application.store.word_index.suggest("en-de", "cacth") == []
+
+    async def test_load(self, application):
+        await application.store.word_index.disconnect()
+        await application.store.words.add_words([dataclasses.replace(WORD, original=i)
+                                                 for i in ["catch", "match", "batch"]])
+        application.config.word_index.batch_size = 2
+        index = application.store.word_index
+        index.spelling.clear()
+        index.last_id = 0
+        index.n_words = 0
+        assert await index.load() == 3
+        assert await index.load() == 0
+        assert index.suggest("en-ru", "bacth") == ["batch"]
+
+    @pytest.mark.parametrize("storage", [ProfileStorage.jsonb, ProfileStorage.binary])
+    async def test_complete(self, application, storage):
+        await application.store.word_index.disconnect()
+        application.config.database.profile_storage = storage
+        await application.store.words.add_words([dataclasses.replace(WORD, original=i)
+                                                 for i in ["catch", "cat", "cat_fish", "match"]])
+        index = application.store.word_index
+
+        index.loaded = False  # from the database
+        from_database = await index.complete("en-ru", "cat")
+        assert [i.original for i in from_database] == ["cat", "cat_fish", "catch"]
+        assert [i.original for i in await index.complete("en-ru", "cat_")] == ["cat_fish"]
+        assert await index.complete("en-ru", "%") == []
+
+        index.loaded = True  # from memory
+        assert await index.complete("en-ru", "cat") == from_database
+        assert from_database[0].translations == WORD.translations
+        assert await index.complete("en-de", "cat") == []
+
+    async def test_max_words(self, application):
+        await application.store.word_index.disconnect()
+        await application.store.words.add_words([dataclasses.replace(WORD, original=i)
+                                                 for i in ["catch", "match", "batch"]])
+        application.config.word_index.max_words = 2
+        index = application.store.word_index
+        index.spelling.clear()
+        index.prefixes.clear()
+        index.last_id = 0
+        index.n_words = 0
+        assert await index.load() == 2
+        assert await index.load() == 0
+        assert index.full
+
+        await application.store.words.add_word(dataclasses.replace(WORD, original="cat"))
+        assert len(index.spelling["en-ru"]) == 2
+        index.loaded = True  # not all words are in memory
+        assert [i.original for i in await index.complete("en-ru", "cat")] == ["cat", "catch"]
+
+        application.config.word_index.max_completions = 1  # enough words in memory
+        with patch.object(application.store.database, "fetch", AsyncMock(side_effect=AssertionError)):
+            assert [i.original for i in await index.complete("en-ru", "cat")] == ["catch"]
@@ -0,0 +1,30 @@
+from app.store.words.spelling import SpellingIndex, allowed_distance, edit_distance
+
+
+def test_edit_distance():
+    assert edit_distance("apple", "apple", 2) == 0
+    assert edit_distance("aple", "apple", 2) == 1
+    assert edit_distance("appel", "apple", 2) == 1  # transposition
+    assert edit_distance("apricot", "apple", 2) == 3
+    assert edit_distance("a", "abcd", 2) == 3
+
+
+def test_allowed_distance():
+    assert allowed_distance("at", 2) == 0
+    assert allowed_distance("cat", 2) == 1
+    assert allowed_distance("languge", 2) == 2
+    assert allowed_distance("languge", 1) == 1
+
+
+def test_lookup():
+    index = SpellingIndex(max_distance=2, prefix_length=5)
+    for word in ["language", "languages", "luggage", "apple", "apply", "maple"]:
+        index.add(word)
+    assert not index.add("apple")
+    assert len(index) == 6
+
+    assert index.lookup("language") == [(0, "language")]
+    assert index.lookup("languge") == [(1, "language"), (2, "languages")]
+    assert index.lookup("lnaguage", limit=1) == [(1, "language")]  # a typo in the prefix
+    assert index.lookup("appl", max_distance=1) == [(1, "apple"), (1, "apply")]
+    assert index.lookup("qwerty") == []
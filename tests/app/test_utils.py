@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from app import utils
+from app.utils import MediaGenerator, run_blocking, file_size, remove_file, now
+
+
+def fake_generate_audio(foreign_lang_code: str, original: str, filename: str):
+    time.sleep(0.3)
+    with open(filename, "wb") as f:
+        f.write(original.encode())
+
+
+@pytest.mark.asyncio
+class TestUtils:
+
+    async def test_run_blocking(self):
+        assert (await run_blocking(threading.get_ident)) != threading.get_ident()
+
+    async def test_files(self, tmp_path):
+        filename = tmp_path / "file.txt"
+        assert file_size(filename) == 0
+        filename.write_text("abc")
+        assert file_size(filename) == 3
+        remove_file(filename)
+        remove_file(filename)
+        assert not filename.exists()
+
+    async def test_generate_audio_does_not_block(self, monkeypatch):
+        monkeypatch.setattr(utils, "proc_generate_audio", fake_generate_audio)
+        monkeypatch.setattr(MediaGenerator, "last_activity", now() - timedelta(minutes=1))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while 1:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        try:
+            async with MediaGenerator.generate_audio("en", "catch") as filename:
+                assert filename.read_bytes() == b"catch"
+        finally:
+            task.cancel()
+        assert not filename.exists()
+        assert ticks > 10
+
+    async def test_generate_audio_throttled(self, monkeypatch):
+        monkeypatch.setattr(utils, "proc_generate_audio", fake_generate_audio)
+        monkeypatch.setattr(MediaGenerator, "last_activity", now() - timedelta(minutes=1))
+        monkeypatch.setattr(MediaGenerator, "lock", asyncio.Lock())
+
+        async def generate(original: str) -> float:
+            async with MediaGenerator.generate_audio("en", original):
+                return time.monotonic()
+
+        start = time.monotonic()
+        first, second = sorted(await asyncio.gather(generate("catch"), generate("match")))
+        assert first - start < 2.0
+        assert second - first >= 3.0
@@ -0,0 +1,109 @@
+import asyncio
+import pathlib
+
+import pytest
+
+from app.base.accessor import BaseAccessor
+from app.metrics.loop import LoopMonitor
+from app.metrics.server import MetricsServer
+from app.web.app import Application, setup_app
+
+events = []
+
+
+class Slow(BaseAccessor):
+    delay = 0.2
+
+    async def connect(self):
+        events.append(f"{type(self).__name__}.connect.start")
+        await asyncio.sleep(self.delay)
+        events.append(f"{type(self).__name__}.connect.end")
+
+    async def disconnect(self):
+        events.append(f"{type(self).__name__}.disconnect.start")
+        await asyncio.sleep(self.delay)
+        events.append(f"{type(self).__name__}.disconnect.end")
+
+
+class First(Slow):
+    pass
+
+
+class Second(Slow):
+    pass
+
+
+class NeedsFirst(Slow):
+    dependencies = (First,)
+
+
+class Hanging(Slow):
+    delay = 10.0
+    connect_timeout = 0.05
+
+
+class Cycled(Slow):
+    dependencies = (NeedsFirst,)
+
+
+@pytest.fixture
+def app(application) -> Application:
+    events.clear()
+    app = Application()
+    app.config = application.config
+    return app
+
+
+@pytest.mark.asyncio
+class TestApplication:
+
+    async def test_concurrent(self, app):
+        First(app), Second(app), NeedsFirst(app)
+        await app.connect()
+        assert events.index("NeedsFirst.connect.start") > events.index("First.connect.end")
+        assert events.index("Second.connect.start") < events.index("First.connect.end")
+        assert app.timings["connect"].keys() == {"First", "Second", "NeedsFirst"}
+
+        events.clear()
+        await app.disconnect()
+        assert events.index("First.disconnect.start") > events.index("NeedsFirst.disconnect.end")
+        assert events.index("Second.disconnect.start") < events.index("NeedsFirst.disconnect.end")
+
+    async def test_unregistered_dependency(self, app):
+        NeedsFirst(app)
+        await app.connect()
+        assert events == ["NeedsFirst.connect.start", "NeedsFirst.connect.end"]
+
+    async def test_timeout(self, app):
+        Hanging(app)
+        with pytest.raises(TimeoutError):
+            await app.connect()
+
+    async def test_failed_dependency(self, app):
+        first = First(app)
+        NeedsFirst(app)
+        first.connect_timeout = 0.05
+        with pytest.raises(TimeoutError):
+            await app.connect()
+        assert "NeedsFirst.connect.start" not in events
+
+    async def test_cycle(self, app):
+        First(app), Second(app), NeedsFirst(app), Cycled(app)
+        First.dependencies = (Cycled,)
+        try:
+            with pytest.raises(ValueError):
+                await app.connect()
+        finally:
+            First.dependencies = ()
+        assert events == []
+
+
+@pytest.mark.asyncio
+async def test_without_background():
+    app = setup_app(pathlib.Path(__file__).resolve().parent.parent.parent / "test_config.yml", background=False)
+    assert not any(isinstance(i, (MetricsServer, LoopMonitor)) for i in app.accessors)
+    app.config.word_index.enabled = True
+    await app.store.archiver.connect()
+    await app.store.word_index.connect()
+    assert app.store.archiver.task is None
+    assert app.store.word_index.task is None
@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+
+from app.web.archive import ResponseArchive, ResponseKind
+from app.web.parser import YandexTranslator, parse_corpus, parse_word
+from app.web.reparse import reparse_archive
+from tests.app.web.responses import translation_namespace, examples_namespace
+from tests.helpers import fake_word
+
+RESPONSES = {
+    ResponseKind.lookup: orjson.dumps({"head": {}, "en-ru": translation_namespace}),
+    ResponseKind.corpus: orjson.dumps(examples_namespace),
+}
+
+
+def test_archive(tmp_path):
+    archive = ResponseArchive(tmp_path / "responses.sqlite3")
+    archive.put("en-ru", "dunk", RESPONSES)
+    archive.put("en-ru", "dunk", RESPONSES)
+    archive.put("en-ru", "other", {**RESPONSES, ResponseKind.exclusive: b"{}"})
+    assert archive.get("en-ru", "dunk") == RESPONSES
+    assert archive.get("en-ru", "none") is None
+
+    first, last = archive.rowid_bounds()
+    rows = archive.read(first, last)
+    assert [i[1] for i in rows] == ["dunk", "other"]
+    assert rows[1][2][ResponseKind.exclusive] == b"{}"
+    archive.close()
+
+
+def test_parse_word():
+    word = parse_word("en-ru", "Dunk", RESPONSES)
+    assert word.original == "dunk"
+    assert word.past_indefinite == ["dunked"]
+    assert (word.examples, word.idioms) == parse_corpus(examples_namespace, limit=30)
+
+
+@pytest.mark.asyncio
+async def test_archived_before_parsing(application, tmp_path):
+    application.config.translator.archive_file = str(tmp_path / "responses.sqlite3")
+    translator = YandexTranslator(application)
+    await translator.connect()
+    try:
+        translator.get = AsyncMock(side_effect=[RESPONSES[ResponseKind.lookup], b"{}"])
+        with pytest.raises(KeyError):
+            await translator.translate("en-ru", "dunk")
+        assert translator.archive.get("en-ru", "dunk") == {**RESPONSES, ResponseKind.corpus: b"{}"}
+    finally:
+        await translator.disconnect()
+        application.accessors.remove(translator)
+
+
+@pytest.mark.asyncio
+async def test_reparse_archive(application, tmp_path):
+    filename = tmp_path / "responses.sqlite3"
+    archive = ResponseArchive(filename)
+    archive.put("en-ru", "dunk", RESPONSES)
+    archive.put("en-ru", "dunked", RESPONSES)  # corrected to the same word
+    archive.close()
+
+    words = application.store.words
+    await words.add_word(fake_word("en-ru", "dunk"))
+    assert await reparse_archive(application, filename, processes=1, chunk_size=1) == 2
+    word = await words.get_word("en-ru", "dunk")
+    assert word.translations == parse_word("en-ru", "dunk", RESPONSES).translations
+    assert word.noun_plural == ["dunks"]
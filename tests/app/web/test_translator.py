@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import orjson
+import pytest
+
+from app.web.parser import YandexTranslator
+from app.web.translation import CircuitBreaker, LocalDictionary, TranslationError, TranslatorBackend
+from app.web.translator import Translator
+from tests.helpers import fake_word
+
+
+class FakeBackend(TranslatorBackend):
+
+    def __init__(self, app, name: str, latency: float = 0.0, fails: bool = False):
+        super().__init__(app)
+        self.name = name
+        self.latency = latency
+        self.fails = fails
+        self.n_requests = 0
+
+    async def translate(self, translation_code: str, original: str):
+        self.n_requests += 1
+        await asyncio.sleep(self.latency)
+        if self.fails:
+            raise ConnectionError(self.name)
+        word = fake_word(translation_code, original)
+        word.transcription = [self.name]
+        return word
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.failure()
+    assert breaker.allow()
+    breaker.failure()
+    assert not breaker.allow()
+
+    time.sleep(0.05)
+    assert breaker.allow()  # the trial request
+    assert not breaker.allow()
+    breaker.failure()
+    assert not breaker.allow()
+
+    time.sleep(0.05)
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.allow() and breaker.allow()
+
+
+@pytest.mark.asyncio
+class TestTranslator:
+
+    async def test_hedged(self, application):
+        application.config.translator.hedge_after = 0.05
+        slow, fast = FakeBackend(application, "slow", latency=1.0), FakeBackend(application, "fast")
+        translator = Translator(application, [slow, fast])
+        start = time.monotonic()
+        word = await translator.translate("en-ru", "word")
+        assert word.transcription == ["fast"]
+        assert time.monotonic() - start < 0.5
+        assert slow.n_requests == 1
+
+    async def test_fallback(self, application):
+        failing, fallback = FakeBackend(application, "failing", fails=True), FakeBackend(application, "fallback")
+        translator = Translator(application, [failing, fallback])
+        assert (await translator.translate("en-ru", "word")).transcription == ["fallback"]
+        assert (await translator.translate("en-ru", "qwerty")).translations == []
+
+        translator = Translator(application, [failing])
+        with pytest.raises(TranslationError):
+            await translator.translate("en-ru", "word")
+
+    async def test_timeout(self, application):
+        application.config.translator.timeout = 0.1
+        translator = Translator(application, [FakeBackend(application, "slow", latency=1.0)])
+        with pytest.raises(TranslationError, match="timed out"):
+            await translator.translate("en-ru", "word")
+
+    async def test_circuit_open(self, application):
+        application.config.translator.failure_threshold = 2
+        failing, fallback = FakeBackend(application, "failing", fails=True), FakeBackend(application, "fallback")
+        translator = Translator(application, [failing, fallback])
+        for _ in range(3):
+            await translator.translate("en-ru", "word")
+        assert failing.n_requests == 2
+        assert fallback.n_requests == 3
+
+
+@pytest.mark.asyncio
+async def test_local_dictionary(application, tmp_path):
+    filename = tmp_path / "words.jsonl"
+    filename.write_bytes(orjson.dumps(dict(translation_code="en-ru", original="word", translations=["слово"])) + b"\n")
+    application.config.translator.dictionary_file = str(filename)
+    dictionary = LocalDictionary(application)
+    await dictionary.connect()
+    assert (await dictionary.translate("en-ru", "word")).translations == ["слово"]
+    assert (await dictionary.translate("en-ru", "other")).translations == []
+
+
+@pytest.mark.asyncio
+async def test_no_network(application):
+    assert not any(isinstance(i, YandexTranslator) for i in application.store.translator.backends)
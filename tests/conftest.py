@@ -10,8 +10,9 @@ if typing.TYPE_CHECKING:
 
 @pytest.fixture(scope="session", autouse=True)
 def browser():
+    # create_translator takes backend classes from BACKENDS, which holds the real class since import
     from app.web.parser import YandexTranslator
-    with patch("app.web.parser.YandexTranslator", Mock(spec=YandexTranslator)):
+    with patch.dict("app.web.translator.BACKENDS", yandex=Mock(spec=YandexTranslator)):
         yield
 
 
@@ -30,5 +31,6 @@ async def clear_db(application: "Application"):
     yield
     db = application.store.database.db
     await db.gino.drop_all()
+    await application.store.database.redis.flushdb()
     # for table in db.sorted_tables:
     #     await db.status(db.text(f"TRUNCATE {table.name} RESTART IDENTITY"))
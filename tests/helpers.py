@@ -0,0 +1,43 @@
+"""
+Data shared by tests of several modules.
+"""
+from app.store.users.models import UserDC
+from app.store.words.models import WordDC
+from app.utils import now
+
+USER = UserDC(id=123,
+              is_bot=False,
+              username="username",
+              first_name="Ivan",
+              last_name="Ivanov",
+              language_code="ru",
+              joined_at=now())
+
+WORD = WordDC(translation_code="en-ru",
+              original="catch",
+              transcription=["caetsh"],
+              translations=[["поймать", "схватить"]],
+              past_indefinite=["caught"],
+              past_participle=["caught"],
+              noun_plural=[],
+              examples=[["We caught!", "Мы поймали!"]],
+              idioms=[],
+              audio_id="telegram_id1",
+              added_at=now())
+
+
+def fake_word(translation_code: str, original: str) -> WordDC:
+    """
+    Not found for "qwerty", like the translator.
+    """
+    return WordDC(translation_code=translation_code,
+                  original=original,
+                  transcription=[],
+                  translations=[] if original == "qwerty" else [f"{original}-ru"],
+                  past_indefinite=[],
+                  past_participle=[],
+                  noun_plural=[],
+                  examples=[],
+                  idioms=[],
+                  audio_id=None,
+                  added_at=now())